@@ -1,6 +1,9 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker 
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+import threading
+from typing import Optional
 
 from ..core.config import Setting
 
@@ -9,7 +12,45 @@ Base = declarative_base()
 
 db_url = Setting.DATABASE_URL
 
-engine = create_engine(db_url)
+# SQLite connections are used from FastAPI's worker threads, not only the one that opened them
+connect_args = {"check_same_thread": False} if db_url.startswith("sqlite") else {}
 
+engine = create_engine(db_url, connect_args=connect_args)
 
-session = sessionmaker(autoflush= False, autocommit= False, bind=engine)
\ No newline at end of file
+
+session = sessionmaker(autoflush= False, autocommit= False, bind=engine)
+
+
+# ==================== Async engine (auth path) ====================
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    """url with its sync driver swapped for the async one (asyncpg / aiosqlite)"""
+    scheme, sep, rest = url.partition("://")
+    return _ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    AsyncSession factory bound to the async engine, created on first use so
+    the async driver is only imported by processes that need it
+    """
+    global _async_engine, _async_session
+    if _async_session is None:
+        with _async_lock:
+            if _async_session is None:
+                _async_engine = create_async_engine(Setting.ASYNC_DATABASE_URL or async_url(db_url))
+                _async_session = async_sessionmaker(
+                    _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                )
+    return _async_session
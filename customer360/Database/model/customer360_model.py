@@ -0,0 +1,181 @@
+"""
+Customer360 tables: customers, loans, payments and communications.
+
+Rows mirror the records of data/*.json (see services/Customer360_services/
+database_loader.py). position is the record's index in its file, so
+ORDER BY position gives file order. Raw values are stored as-is, and the
+*_key columns hold the normalized values that the lookups are indexed on.
+to_record() returns the record as the JSON store would serve it,
+timestamp fields included. Null and missing fields are not told apart.
+
+On PostgreSQL the lowercased customer search columns also get pg_trgm GIN
+indexes, which serve the LIKE '%...%' substring searches (3+ characters);
+SQLite has no such index and scans the table for them.
+"""
+
+from sqlalchemy import DDL, BigInteger, Boolean, Column, Float, Index, Integer, String, Text, event
+from typing import Any, Dict
+
+from customer360.Database.config import Base
+from customer360.utils.timestamps import timestamp_fields
+
+
+def _record(row: Base, fields: Dict[str, str]) -> Dict[str, Any]:
+    """{json field: value} for the non-null columns of row"""
+    record = {}
+    for field, column in fields.items():
+        value = getattr(row, column)
+        if value is not None:
+            record[field] = value
+    return record
+
+
+# GIN trigram indexes for the customer substring searches, created on PostgreSQL only
+TRIGRAM_INDEXES = tuple(
+    Index(
+        f"ix_customers_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+    for column in ("name_lower", "email_lower", "search_text")
+)
+
+
+class Customer(Base):
+    __tablename__ = "customers"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    customer_id = Column(String(255))
+    ucic_id = Column(String(255))
+    name = Column(String(255))
+    mobile = Column(String(255))
+    email = Column(String(255))
+    pan = Column(String(255))
+    branch = Column(String(255))
+    risk = Column(String(255))
+
+    customer_key = Column(String(255), nullable=False, index=True)
+    pan_key = Column(String(255), nullable=False, index=True)
+    mobile_key = Column(String(255), nullable=False, index=True)
+    # Lowercased search fields (customer-list / name and email lookups)
+    name_lower = Column(String(255), nullable=False)
+    email_lower = Column(String(255), nullable=False)
+    search_text = Column(Text, nullable=False)
+
+    __table_args__ = (
+        Index("ix_customers_customer_id_position", "customer_id", "position"),
+        *TRIGRAM_INDEXES,
+    )
+
+    FIELDS = {field: field for field in ("customer_id", "ucic_id", "name", "mobile", "email", "pan", "branch", "risk")}
+
+    def to_record(self) -> Dict[str, Any]:
+        return _record(self, self.FIELDS)
+
+
+# The trigram indexes above need the extension (CREATE EXTENSION needs the right privilege)
+PG_TRGM = DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+event.listen(Customer.__table__, "before_create", PG_TRGM)
+
+
+class Loan(Base):
+    __tablename__ = "loans"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    customer_id = Column(String(255))
+    lan = Column(String(255))
+    type = Column(String(255))
+    zone = Column(String(255))
+    status = Column(String(255))
+    outstanding = Column(Float)
+    emi = Column(Float)
+    active = Column(Boolean)
+
+    customer_key = Column(String(255), nullable=False)
+    lan_key = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        Index("ix_loans_customer_key_lan_key", "customer_key", "lan_key"),
+    )
+
+    FIELDS = {field: field for field in ("customer_id", "type", "lan", "zone", "status", "outstanding", "emi", "active")}
+
+    def to_record(self) -> Dict[str, Any]:
+        return _record(self, self.FIELDS)
+
+
+class Payment(Base):
+    __tablename__ = "payments"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    payment_id = Column(String(255))
+    customer_id = Column(String(255))
+    lan = Column(String(255))
+    payment_date = Column(String(255))
+    due_date = Column(String(255))
+    amount_due = Column(Float)
+    amount_paid = Column(Float)
+    status = Column(String(255))
+    payment_method = Column(String(255))
+
+    due_month = Column(String(7))   # "YYYY-MM" of due_date
+
+    __table_args__ = (
+        # Exact (customer_id, lan) lookups, and per loan by due month
+        Index("ix_payments_customer_id_lan_due_month", "customer_id", "lan", "due_month"),
+    )
+
+    FIELDS = {
+        field: field for field in (
+            "payment_id", "customer_id", "lan", "payment_date", "due_date",
+            "amount_due", "amount_paid", "status", "payment_method"
+        )
+    }
+
+    def to_record(self) -> Dict[str, Any]:
+        record = _record(self, self.FIELDS)
+        record.update(timestamp_fields("due", self.due_date))
+        record.update(timestamp_fields("payment", self.payment_date))
+        record["due_month"] = self.due_month
+        return record
+
+
+class Communication(Base):
+    __tablename__ = "communications"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    comm_id = Column(String(255))
+    customer_id = Column(String(255))
+    lan = Column(String(255))
+    type = Column(String(255))
+    channel = Column(String(255))
+    status = Column(String(255))
+    message = Column(Text)
+    sent_time = Column(String(255))
+    delivered_time = Column(String(255))
+    template = Column(String(255))
+    issue_type = Column(String(255))
+
+    customer_key = Column(String(255), nullable=False)
+    lan_key = Column(String(255), nullable=False)
+    # Timeline order: sent_epoch_us (repository.NO_SENT_TIME if missing), then normalized id
+    sent_key = Column(BigInteger, nullable=False)
+    id_key = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        Index("ix_communications_customer_key_position", "customer_key", "position"),
+        Index("ix_communications_timeline", "customer_key", "lan_key", "sent_key", "id_key"),
+    )
+
+    FIELDS = {
+        "id": "comm_id", "customer_id": "customer_id", "lan": "lan", "type": "type",
+        "channel": "channel", "status": "status", "message": "message", "sent_time": "sent_time",
+        "delivered_time": "delivered_time", "template": "template", "issue_type": "issue_type"
+    }
+
+    def to_record(self) -> Dict[str, Any]:
+        record = _record(self, self.FIELDS)
+        record.update(timestamp_fields("sent", self.sent_time))
+        record.update(timestamp_fields("delivered", self.delivered_time))
+        return record
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, Integer, ForeignKey
+from sqlalchemy import Boolean, Column, DateTime, String, Integer, ForeignKey
 from sqlalchemy.orm import relationship
 
 from customer360.Database.config import Base
@@ -36,3 +36,14 @@ class EmployeeDetailes(Base):
         "EmployeeCreate",
         back_populates="details"
     )
+
+
+class RevokedToken(Base):
+    """
+    Logged-out access token, rejected by every worker until it expires.
+    Keyed by the token's SHA-256 digest (hex): the raw token is never stored.
+    """
+    __tablename__ = "revoked_tokens"
+
+    token_digest = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, index=True)  # the token's exp (UTC); NULL: the token has none
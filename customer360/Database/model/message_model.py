@@ -0,0 +1,46 @@
+"""
+message_events: one row per message of message.json, for the dashboard
+aggregates computed in SQL (services/dashboard_services/message_sql.py).
+
+Values are extracted the way MessageColumns does (same timestamp parsing,
+numeric coercion and employee id fallback). day / hour are stored rather
+than derived per query, so GROUP BY day / hour is portable between
+PostgreSQL and SQLite and every metric filters on an index range over day.
+position is the message's index in the file: MIN(position) gives the
+first-appearance order the in-memory services use to break ties.
+
+Index design (leading column is the range every dashboard query filters on):
+- (day, status, channel):      delivery rate, CSAT, daily volume by channel
+- (day, hour):                 hourly peak
+- (day, issue_type, channel):  top issues and their primary channel
+- (channel, status):           all-time channel performance
+"""
+
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Float, Index, Integer, SmallInteger, String
+
+from customer360.Database.config import Base
+
+
+class MessageEvent(Base):
+    __tablename__ = "message_events"
+
+    position = Column(Integer, primary_key=True, autoincrement=False)
+    message_id = Column(String(255))
+    employee_id = Column(BigInteger)
+    sent_at = Column(DateTime)
+    day = Column(Date)
+    hour = Column(SmallInteger)
+    channel = Column(String(255))
+    status = Column(String(255))
+    issue_type = Column(String(255))
+    resolution_time = Column(Float)
+    csat_score = Column(Float)
+    escalated = Column(Boolean, nullable=False, default=False)
+    resolved = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_message_events_day_status_channel", "day", "status", "channel"),
+        Index("ix_message_events_day_hour", "day", "hour"),
+        Index("ix_message_events_day_issue_channel", "day", "issue_type", "channel"),
+        Index("ix_message_events_channel_status", "channel", "status"),
+    )
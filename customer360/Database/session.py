@@ -1,4 +1,4 @@
-from customer360.Database.config import session 
+from customer360.Database.config import session, get_async_session_factory
 
 def get_db():
 
@@ -7,4 +7,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+
+    async with get_async_session_factory()() as db:
+        yield db
@@ -2,8 +2,10 @@ from typing import Annotated , Dict , Any
 from fastapi import Depends , HTTPException , status
 from ..utils.logger import logger
 from sqlalchemy.orm import Session
-from ..Database.session import get_db
+from ..Database.session import get_db, get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..services import AuthenticationService , TokenService 
+from ..services import MessageStore , get_message_store
 from ..utils.exceptions import TokenError
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from ..services.auth_service import get_auth_service
@@ -12,8 +14,10 @@ from ..services.auth_service import get_auth_service
 
 
 db_dependency = Annotated[Session, Depends(get_db)]
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
 req_form = Annotated[OAuth2PasswordRequestForm, Depends()]
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl='api/v1/auth/token')
+message_store_dependency = Annotated[MessageStore, Depends(get_message_store)]
 
 
 
@@ -25,7 +29,7 @@ async def get_current_employee(
     Dependency to get current authenticated employee from Bearer token
     """
     try:
-        return TokenService.decode_token(token)
+        return await TokenService.verify_token(token)
         
     except TokenError as e:
         logger.warning(f"Token validation failed: {str(e)}")
@@ -0,0 +1,200 @@
+"""
+Response cache for the dashboard and Customer360 GET endpoints.
+
+Polling clients ask for the same payloads over and over while the data
+files haven't changed. Serialized bodies are cached under
+
+    (path, sorted query params, data version, today's date, vary)
+
+so a repeat request costs a dictionary lookup instead of a recomputation.
+The data version is the stat of the message store's inputs (message.json or
+its partition manifest, the binary copy, the message log) for the dashboard
+and the (mtime, size) of the Customer360 JSON files; today's date is in the key
+because "today" / "last 7 days" widgets move at midnight without any file
+changing. Results over a rolling window ending at datetime.now() (the
+resolution time trend, and the snapshot that embeds it) are keyed on the
+current hour instead (hourly=True), so they are at most an hour behind.
+The database backends have no cheap version, so their responses are never
+cached (version None).
+
+Every cached response carries an ETag (hash of the body) and Last-Modified
+(when the body was built), with Cache-Control: private, no-cache so
+clients revalidate. If-None-Match (or, without it, If-Modified-Since) that
+still matches gets 304 Not Modified with no body.
+
+Bodies are serialized with the route's response_model, as FastAPI does, so
+cached and uncached responses are byte-identical.
+"""
+
+from ..core.config import Setting
+from ..services import get_message_store
+from ..services.Customer360_services.customer_data import get_customer_data_store
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+
+_CUSTOMER360_FILES = ("customers.json", "loans.json", "payments.json", "communications.json")
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: datetime   # UTC, whole seconds (HTTP dates have no fractions)
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(self.last_modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+
+
+class ResponseCache:
+    """Least recently used serialized bodies, at most max_entries of them"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, CachedBody]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._not_modified = 0
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes) -> CachedBody:
+        """Cache body under key; an identical body already cached keeps its Last-Modified"""
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous.etag == etag:
+                entry = previous
+            else:
+                entry = CachedBody(body, etag, datetime.now(timezone.utc).replace(microsecond=0))
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry
+
+    def count_not_modified(self) -> None:
+        with self._lock:
+            self._not_modified += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "not_modified": self._not_modified,
+            }
+
+
+response_cache = ResponseCache(Setting.RESPONSE_CACHE_SIZE)
+
+
+# ── Data versions ────────────────────────────────────────────────────────────
+
+async def dashboard_version() -> Optional[Hashable]:
+    """Version of the dashboard data, None in SQL-pushdown mode"""
+    if Setting.DASHBOARD_BACKEND == "database":
+        return None
+    # A few stat() calls: no need to load the store or take a dashboard executor slot
+    return get_message_store().source_version()
+
+
+async def customer360_version() -> Optional[Hashable]:
+    """Version of the Customer360 JSON files, None on the database backend"""
+    if Setting.CUSTOMER360_BACKEND == "database":
+        return None
+    return get_customer_data_store().version(*_CUSTOMER360_FILES)
+
+
+# ── Responses ────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _serialize(request: Request, content: Any) -> bytes:
+    """JSON body the route would have sent for content (validated against its response_model)"""
+    response_model = getattr(request.scope.get("route"), "response_model", None)
+    if response_model is None:
+        return _adapter(Any).dump_json(jsonable_encoder(content))
+    adapter = _adapter(response_model)
+    return adapter.dump_json(adapter.validate_python(content))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored"""
+    if if_none_match.strip() == "*":
+        return True
+    plain = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == plain for tag in if_none_match.split(","))
+
+
+def _not_modified(request: Request, entry: CachedBody) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, entry.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return entry.last_modified <= since
+    return False
+
+
+async def cached_response(
+    request: Request,
+    version: Optional[Hashable],
+    compute: Callable[[], Awaitable[Any]],
+    vary: Hashable = None,
+    hourly: bool = False,
+) -> Any:
+    """
+    Response for the current request: the cached body if one exists for
+    this route, query, data version and day, otherwise await compute() and
+    cache its serialized result. 304 when the client's copy is current.
+    version None bypasses the cache (compute()'s result is returned as is).
+    vary: anything else the result depends on (e.g. the employee).
+    hourly: key on the current hour rather than the day, for results over a
+    window that ends now (e.g. the last 24 hours).
+    """
+    if version is None:
+        return await compute()
+
+    query = tuple(sorted(request.query_params.multi_items()))
+    period = datetime.now().replace(minute=0, second=0, microsecond=0) if hourly else date.today()
+    key = (request.url.path, query, version, period, vary)
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = response_cache.put(key, _serialize(request, await compute()))
+
+    if _not_modified(request, entry):
+        response_cache.count_not_modified()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=entry.headers())
+    return Response(content=entry.body, media_type="application/json", headers=entry.headers())
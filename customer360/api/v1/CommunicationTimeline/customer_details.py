@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import Annotated, Dict, Any, Optional
 
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import timeline_executor
 from ....utils.exceptions import CalculationError
+from ....schemas.model import CustomerDetailsBatchRequest
 from customer360.services import CustomerDetailsService
 
 router = APIRouter(prefix="/CommunicationTimeline", tags=["CommunicationTimeline"])
@@ -33,7 +36,8 @@ async def customer_details(
 
     try:
         service = CustomerDetailsService()
-        return service.get_customer_details(
+        return await timeline_executor.run(
+            service.get_customer_details,
             customer_id=customer_id,
             name=name,
             mobile=mobile,
@@ -46,4 +50,87 @@ async def customer_details(
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception as e:
         logger.error(f"Error in customer-details: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch customer details")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch customer details")
+
+
+@router.post("/customer-details/batch", response_model=Dict[str, Any])
+async def customer_details_batch(
+    emp: emp_dependency,
+    db: db_dependency,
+    request: CustomerDetailsBatchRequest
+):
+    """
+    customer-details for up to 500 customer_ids in one call.
+    Returns {"results": {customer_id: details or null}, "requested", "found"}.
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info(f"customer-details batch endpoint called ({len(request.customer_ids)} ids)")
+
+    try:
+        service = CustomerDetailsService()
+        return await timeline_executor.run(
+            service.get_customer_details_batch,
+            customer_ids=request.customer_ids,
+            filter_type=request.filter_type
+        )
+    except CalculationError as ce:
+        raise HTTPException(status_code=500, detail=str(ce))
+    except Exception as e:
+        logger.error(f"Error in customer-details batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch customer details")
+
+
+@router.get("/timeline", response_model=Dict[str, Any])
+async def communication_timeline(
+    emp: emp_dependency,
+    db: db_dependency,
+    customer_id: Annotated[str, Query()],
+    lan: Annotated[str, Query()],
+    filter_type: Annotated[str, Query(enum=["ALL", "Email", "SMS", "WhatsApp", "Post", "IVR", "Failed", "Delivered"])] = "ALL",
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    cursor: Annotated[Optional[str], Query()] = None,
+    stream: Annotated[bool, Query()] = False
+):
+    """
+    Communications of one loan, newest first, paged by cursor:
+    pass next_cursor from the previous page to get the next one.
+    stream=true returns the rest of the timeline (from cursor on) as
+    NDJSON, one communication per line, ignoring limit.
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info("communication timeline endpoint called")
+
+    try:
+        service = CustomerDetailsService()
+        if stream:
+            # Opening the stream validates the cursor and loads the timeline; Starlette iterates it on its threadpool
+            lines = await timeline_executor.run(
+                service.stream_communication_timeline,
+                customer_id=customer_id,
+                lan=lan,
+                filter_type=filter_type,
+                cursor=cursor
+            )
+            return StreamingResponse(
+                lines,
+                media_type="application/x-ndjson"
+            )
+        return await timeline_executor.run(
+            service.get_communication_timeline,
+            customer_id=customer_id,
+            lan=lan,
+            filter_type=filter_type,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+    except CalculationError as ce:
+        raise HTTPException(status_code=500, detail=str(ce))
+    except Exception as e:
+        logger.error(f"Error in communication timeline: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch communication timeline")
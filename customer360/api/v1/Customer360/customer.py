@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from typing import Annotated, Dict, Any, Optional
+from functools import partial
 
 from ....utils.exceptions import CalculationError
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import customer360_executor
+from ...response_cache import cached_response, customer360_version
 from customer360.services import CustomerListService
 
 router = APIRouter(prefix="/Customer360", tags=["Customer360"])
@@ -11,27 +14,47 @@ router = APIRouter(prefix="/Customer360", tags=["Customer360"])
 
 @router.get("/customer-list", response_model=Dict[str, Any])
 async def customer_list(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     search: Annotated[Optional[str], Query(max_length=100, description="Search by name, ID, mobile, email, PAN")] = None,
     limit: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 20,
-    offset: Annotated[int, Query(ge=0, description="Skip this many items")] = 0
+    offset: Annotated[int, Query(ge=0, description="Skip this many items")] = 0,
+    pagination: Annotated[str, Query(enum=["offset", "cursor"], description="offset: file order + offset; cursor: customer_id order + next_cursor")] = "offset",
+    cursor: Annotated[Optional[str], Query(max_length=512, description="next_cursor of the previous page (cursor pagination)")] = None,
+    include_total: Annotated[bool, Query(description="Exact total instead of an estimate (cursor pagination)")] = False
 ):
     """
     Paginated list of all customers (basic details only)
     - search: partial match on name/customer_id/mobile/email/PAN
     - limit: max 100
     - offset: for pagination
+    - pagination=cursor: pages in customer_id order; pass next_cursor back as
+      cursor for the next page. total is estimated unless include_total=true
+      (total_exact tells which)
     Returns customers list + total count
     """
     if emp is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
-    logger.info(f"customer-list endpoint called (search: '{search}', limit: {limit}, offset: {offset})")
+    logger.info(
+        f"customer-list endpoint called (search: '{search}', limit: {limit}, "
+        f"offset: {offset}, pagination: {pagination})"
+    )
 
     try:
         service = CustomerListService()
-        return service.get_customers(search=search, limit=limit, offset=offset)
+        if pagination == "cursor":
+            page = partial(
+                customer360_executor.run,
+                service.get_customers_page,
+                search=search, limit=limit, cursor=cursor, include_total=include_total
+            )
+        else:
+            page = partial(customer360_executor.run, service.get_customers, search=search, limit=limit, offset=offset)
+        return await cached_response(request, await customer360_version(), page)
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception as e:
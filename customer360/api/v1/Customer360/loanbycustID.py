@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from typing import Annotated, Dict, Any
 
 from ....utils.exceptions import CalculationError
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import customer360_executor
+from ...response_cache import cached_response, customer360_version
 from customer360.services import CustomerByIdService
 
 router = APIRouter(prefix="/Customer360", tags=["Customer360"])
@@ -11,6 +13,7 @@ router = APIRouter(prefix="/Customer360", tags=["Customer360"])
 
 @router.get("/customer-by-id", response_model=Dict[str, Any])
 async def customer_by_id(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     customer_id: Annotated[str, Query(min_length=1, description="Required: Customer ID")]
@@ -30,17 +33,21 @@ async def customer_by_id(
 
     try:
         service = CustomerByIdService()
-        result = service.get_customer_by_id(customer_id=customer_id.strip())
-        
-        if result["customer"] is None:
-            return {
-                "customer": None,
-                "loans": [],
-                "total_loans": 0,
-                "message": f"No customer found with ID: {customer_id}"
-            }
-            
-        return result
+
+        async def lookup() -> Dict[str, Any]:
+            result = await customer360_executor.run(service.get_customer_by_id, customer_id=customer_id.strip())
+
+            if result["customer"] is None:
+                return {
+                    "customer": None,
+                    "loans": [],
+                    "total_loans": 0,
+                    "message": f"No customer found with ID: {customer_id}"
+                }
+
+            return result
+
+        return await cached_response(request, await customer360_version(), lookup)
     
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
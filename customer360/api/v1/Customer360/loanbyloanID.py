@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import Annotated, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import Annotated, Dict, Any, Optional
+from datetime import date
 
 from ....utils.exceptions import CalculationError
+from ....schemas.model import PaymentBehaviourBatchRequest
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import customer360_executor
+from ...response_cache import cached_response, customer360_version
 from customer360.services import PaymentBehaviourService
 
 router = APIRouter(prefix="/Customer360", tags=["Customer360"])
@@ -11,15 +15,21 @@ router = APIRouter(prefix="/Customer360", tags=["Customer360"])
 
 @router.get("/loan_detailsbyloanID", response_model=Dict[str, Any])
 async def payment_behaviour(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     customer_id: Annotated[str, Query(min_length=1, description="Required: Customer ID")],
-    lan: Annotated[str, Query(min_length=1, description="Required: Loan Account Number (LAN)")]
+    lan: Annotated[str, Query(min_length=1, description="Required: Loan Account Number (LAN)")],
+    months: Annotated[int, Query(ge=1, le=360, description="EMIs to return, up to the current month (or to_date)")] = 6,
+    from_date: Annotated[Optional[date], Query(description="First month of the history (overrides months)")] = None,
+    to_date: Annotated[Optional[date], Query(description="Last month of the history (default: current month)")] = None
 ):
     """
-    Fetch customer info + **one specific loan** summary + payment behaviour (last 6 EMIs)
+    Fetch customer info + **one specific loan** summary + payment behaviour
     - Required: customer_id and lan
     - Only returns data for that exact loan
+    - months: look-back window (default 6, up to 360), or from_date / to_date
+      for an explicit range; each month is an O(1) lookup
     """
     if emp is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
@@ -34,20 +44,67 @@ async def payment_behaviour(
 
     try:
         service = PaymentBehaviourService()
-        result = service.get_payment_behaviour(customer_id=customer_id_clean, lan=lan_clean)
-        
-        if result["customer"] is None or result["loan"] is None:
-            return {
-                "customer": None,
-                "loan": None,
-                "payment_behaviour": {},
-                "message": f"No data found for customer {customer_id_clean} and loan {lan_clean}"
-            }
-            
-        return result
-    
+
+        async def lookup() -> Dict[str, Any]:
+            result = await customer360_executor.run(
+                service.get_payment_behaviour,
+                customer_id=customer_id_clean,
+                lan=lan_clean,
+                months=months,
+                from_date=from_date,
+                to_date=to_date
+            )
+
+            if result["customer"] is None or result["loan"] is None:
+                return {
+                    "customer": None,
+                    "loan": None,
+                    "payment_behaviour": {},
+                    "message": f"No data found for customer {customer_id_clean} and loan {lan_clean}"
+                }
+
+            return result
+
+        return await cached_response(request, await customer360_version(), lookup)
+
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception as e:
         logger.error(f"Error in payment-behaviour: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to fetch payment behaviour")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to fetch payment behaviour")
+
+
+@router.post("/loan_detailsbyloanID/batch", response_model=Dict[str, Any])
+async def payment_behaviour_batch(
+    emp: emp_dependency,
+    db: db_dependency,
+    request: PaymentBehaviourBatchRequest
+):
+    """
+    loan_detailsbyloanID for up to 500 (customer_id, lan) pairs in one call,
+    all with the same months / from_date / to_date window.
+    Returns {"results": {customer_id: {lan: behaviour or null}}, "requested", "found"}.
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info(f"payment-behaviour batch called ({len(request.loans)} loans)")
+
+    try:
+        service = PaymentBehaviourService()
+        return await customer360_executor.run(
+            service.get_payment_behaviour_batch,
+            loans=[(loan.customer_id, loan.lan) for loan in request.loans],
+            months=request.months,
+            from_date=request.from_date,
+            to_date=request.to_date
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(ve))
+    except CalculationError as ce:
+        raise HTTPException(status_code=500, detail=str(ce))
+    except Exception as e:
+        logger.error(f"Error in payment-behaviour batch: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch payment behaviour")
@@ -1,6 +1,8 @@
-from ...dependencies import db_dependency , emp_dependency
-from fastapi import APIRouter, Depends, HTTPException, status
+from ...dependencies import db_dependency , emp_dependency , message_store_dependency
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
 
 from customer360.services import (MessageService,
            AverageResolutionTime,
@@ -16,6 +18,7 @@ router = APIRouter(prefix="/dashboard/kpi", tags=["Dashboard KPI"])
 
 @router.get("/active-escalations", response_model=int)
 async def active_escalations(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -23,11 +26,16 @@ async def active_escalations(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("active-escalations endpoint called")
-    return ActiveEscalation.get_active_escalations()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(ActiveEscalation, "get_active_escalations"),
+    )
 
 
 @router.get("/average-resoltion", response_model=float)
 async def average_reslotion(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -35,12 +43,17 @@ async def average_reslotion(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("average-resoltion endpoint called")
-    return AverageResolutionTime.get_avg_resolution_time()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(AverageResolutionTime, "get_avg_resolution_time"),
+    )
 
 
 
 @router.get("/delivery-rate", response_model=float)
 async def delivery_rate(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -48,12 +61,17 @@ async def delivery_rate(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("delivery-rate endpoint called")
-    return DeliveryRate.get_delivery_rate()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(DeliveryRate, "get_delivery_rate"),
+    )
 
 
 
 @router.get("/failed-message", response_model=int)
 async def failed_message(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -61,12 +79,17 @@ async def failed_message(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("failed-message endpoint called")
-    return FailedMessage.get_failed_messages()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(FailedMessage, "get_failed_messages"),
+    )
 
 
 
 @router.get("/csat-score", response_model=float)
 async def csat_score(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -74,17 +97,28 @@ async def csat_score(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("/csat-score endpoint called")
-    return CSAT_Score.get_csat_score()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(CSAT_Score, "get_csat_score"),
+    )
 
 
 
 @router.get("/msg-sent-today", response_model=float)
 async def csat_score(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
+    store: message_store_dependency,
 ):
     if emp is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("/csat-score endpoint called")
-    return MessageService.count_messages_sent_today_by_employee()
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run(MessageService.count_sent_today_from_store, store, emp["Emp_id"]),
+        vary=emp["Emp_id"],
+    )
@@ -5,6 +5,7 @@ from .delivery_status import router as delivery_status_router
 from .message_volume_trends import router as message_volume_trends_router
 from .resolution_time_trend import router as resolution_time_trend_router
 from .top_issue import router as top_issue_router
+from .snapshot import router as snapshot_router
 
 
 __all__ = ["kpi_router",
@@ -12,4 +13,5 @@ __all__ = ["kpi_router",
            "delivery_status_router",
            "message_volume_trends_router",
            "resolution_time_trend_router",
-           "top_issue_router"]
\ No newline at end of file
+           "top_issue_router",
+           "snapshot_router"]
\ No newline at end of file
@@ -1,8 +1,10 @@
 from typing import Dict , List , Annotated
 from ....utils.exceptions import CalculationError
 from ...dependencies import db_dependency , emp_dependency
-from fastapi import APIRouter, Depends, HTTPException, status , Query
+from fastapi import APIRouter, Depends, HTTPException, status , Query, Request
 from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
 from customer360.services import ChannelPerformanceService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -11,6 +13,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/channel-performance", response_model=List[Dict[str, float | int | str]])
 async def channel_performance(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     sort_by: Annotated[str, Query(enum=["volume", "delivery_rate"])] = "volume"
@@ -28,7 +31,13 @@ async def channel_performance(
         )
 
     try:
-        return ChannelPerformanceService.get_channel_performance(sort_by=sort_by)
+        return await cached_response(
+            request,
+            await dashboard_version(),
+            lambda: dashboard_executor.run_service(
+                ChannelPerformanceService, "get_channel_performance", sort_by=sort_by
+            ),
+        )
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception:
@@ -1,9 +1,11 @@
 from typing import Dict
 from ....utils.exceptions import CalculationError
 from ...dependencies import db_dependency , emp_dependency
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from ....utils.logger import logger
-from customer360.services import DeliveryRate
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
+from customer360.services import DeliveryStatusService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -12,6 +14,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/delivery-status", response_model=Dict[str, Dict[str, float | int]])
 async def delivery_status(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency
     ):
@@ -27,7 +30,11 @@ async def delivery_status(
         )
 
     try:
-        return DeliveryRate.get_delivery_status()
+        return await cached_response(
+            request,
+            await dashboard_version(),
+            lambda: dashboard_executor.run_service(DeliveryStatusService, "get_delivery_status"),
+        )
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception:
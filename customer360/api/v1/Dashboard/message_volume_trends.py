@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from typing import Annotated, List, Dict, Optional ,Any
 
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
 from customer360.services import VolumeTrendsService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -10,6 +12,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/volume-trends", response_model=Dict[str, Any])
 async def volume_trends(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     period: Annotated[str, Query(enum=["today", "7days", "30days", "90days"])] = "7days",
@@ -26,8 +29,13 @@ async def volume_trends(
     logger.info("volume-trends endpoint called")
 
     try:
-        service = VolumeTrendsService()
-        return service.get_volume_trends(period=period, channels=channels)
+        return await cached_response(
+            request,
+            await dashboard_version(),
+            lambda: dashboard_executor.run_service(
+                VolumeTrendsService, "get_volume_trends", period=period, channels=channels
+            ),
+        )
     except Exception as e:
         logger.error(f"Error in volume-trends: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch volume trends")
\ No newline at end of file
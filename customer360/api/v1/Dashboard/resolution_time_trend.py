@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from typing import Annotated, Dict, Any, Optional
 
 from ....utils.exceptions import CalculationError
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
 from customer360.services import ResolutionTimeTrendService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -11,6 +13,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/resolution-time-trend", response_model=Dict[str, Any])
 async def resolution_time_trend(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
     timeline: Annotated[str, Query(enum=["24h", "7days", "30days"])] = "7days",
@@ -27,8 +30,14 @@ async def resolution_time_trend(
     logger.info("resolution-time-trend endpoint called")
 
     try:
-        service = ResolutionTimeTrendService()
-        return service.get_resolution_trend(timeline=timeline, channel=channel)
+        return await cached_response(
+            request,
+            await dashboard_version(),
+            lambda: dashboard_executor.run_service(
+                ResolutionTimeTrendService, "get_resolution_trend", timeline=timeline, channel=channel
+            ),
+            hourly=True,
+        )
     except CalculationError as ce:
         raise HTTPException(status_code=500, detail=str(ce))
     except Exception as e:
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import Annotated, List, Dict, Optional, Any
+
+from ....utils.exceptions import CalculationError
+from ...dependencies import db_dependency, emp_dependency
+from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
+from customer360.services import DashboardSnapshotService
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@router.get("/snapshot", response_model=Dict[str, Any])
+async def dashboard_snapshot(
+    request: Request,
+    emp: emp_dependency,
+    db: db_dependency,
+    period: Annotated[str, Query(enum=["today", "7days", "30days", "90days"])] = "7days",
+    channels: Annotated[Optional[List[str]], Query()] = None,
+    timeline: Annotated[str, Query(enum=["24h", "7days", "30days"])] = "7days",
+    channel: Annotated[Optional[str], Query()] = None,
+    sort_by: Annotated[str, Query(enum=["volume", "delivery_rate"])] = "volume"
+):
+    """
+    Every dashboard widget in one response (KPIs, delivery status, volume trends,
+    top issues, resolution time trend, channel performance).
+    - period / channels: as for /dashboard/volume-trends
+    - timeline / channel: as for /dashboard/resolution-time-trend
+    - sort_by: as for /dashboard/channel-performance
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info("dashboard snapshot endpoint called")
+
+    try:
+        return await cached_response(
+            request,
+            await dashboard_version(),
+            lambda: dashboard_executor.run_service(
+                DashboardSnapshotService,
+                "get_snapshot",
+                period=period,
+                channels=channels,
+                timeline=timeline,
+                channel=channel,
+                sort_by=sort_by
+            ),
+            hourly=True,
+        )
+    except CalculationError as ce:
+        raise HTTPException(status_code=500, detail=str(ce))
+    except Exception as e:
+        logger.error(f"Error in dashboard snapshot: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to build dashboard snapshot")
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from typing import Annotated, List, Dict, Any
 
 from ...dependencies import db_dependency, emp_dependency
 from ....utils.logger import logger
+from ....core.executors import dashboard_executor
+from ...response_cache import cached_response, dashboard_version
 from customer360.services import TopIssuesService
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
@@ -10,6 +12,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/top-issues", response_model=List[Dict[str, Any]])
 async def top_issues(
+    request: Request,
     emp: emp_dependency,
     db: db_dependency,
 ):
@@ -17,5 +20,8 @@ async def top_issues(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
 
     logger.info("top-issues endpoint called")
-    service = TopIssuesService()
-    return service.get_top_issues()
\ No newline at end of file
+    return await cached_response(
+        request,
+        await dashboard_version(),
+        lambda: dashboard_executor.run_service(TopIssuesService, "get_top_issues"),
+    )
\ No newline at end of file
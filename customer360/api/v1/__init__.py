@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from . import auth
+from . import metrics
 
 from .Dashboard import kpi_router
 from .Dashboard import delivery_status_router
@@ -7,6 +8,7 @@ from .Dashboard import message_volume_trends_router
 from .Dashboard import resolution_time_trend_router
 from .Dashboard import top_issue_router
 from .Dashboard import channel_router
+from .Dashboard import snapshot_router
 
 from .Customer360 import customer_router
 from .Customer360 import loanbycustID_router
@@ -25,9 +27,12 @@ router.include_router(message_volume_trends_router)
 router.include_router(top_issue_router)
 router.include_router(resolution_time_trend_router)
 router.include_router(channel_router)
+router.include_router(snapshot_router)
 
 router.include_router(customer_router)
 router.include_router(loanbycustID_router)
 router.include_router(loanbyloanID_router)
 
-router.include_router(customer_details_router)
\ No newline at end of file
+router.include_router(customer_details_router)
+
+router.include_router(metrics.router)
\ No newline at end of file
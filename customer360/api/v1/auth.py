@@ -8,12 +8,10 @@ from datetime import timedelta
 from typing import Annotated, Dict, Any
 from ...utils.exceptions import TokenError
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from ...utils.exceptions import DatabaseError , EmployeeNotFoundError , InvalidCredentialsError ,TokenError , AuthenticationError
-from ...Database.session import get_db
+from ...utils.exceptions import DatabaseError , EmployeeNotFoundError , InvalidCredentialsError ,TokenError , AuthenticationError , ExecutorBusyError
 from ...schemas.model import CreateUserRequest, Token
 from ...services import AuthenticationService , TokenService
-from ..dependencies import get_auth_service , req_form , get_current_employee 
+from ..dependencies import get_auth_service , req_form , get_current_employee , oauth2_bearer
 
 
 
@@ -32,6 +30,16 @@ router = APIRouter(
 )
 
 
+def _busy(error: ExecutorBusyError) -> HTTPException:
+    """503 for a login / registration refused because the password hashing queue is full"""
+    logger.warning(f"Password hashing queue full, retry after {error.retry_after}s")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, retry shortly",
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
 # ==================== API Endpoints ====================
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_employee(
@@ -39,9 +47,11 @@ async def create_employee(
     auth_service: Annotated[AuthenticationService, Depends(get_auth_service)]
 ) -> Dict[str, str]:
     try:
-        auth_service.create_employee(create_emp_req)
+        await auth_service.create_employee(create_emp_req)
         return {"message": "Employee created successfully"}
 
+    except ExecutorBusyError as e:
+        raise _busy(e)
     except DatabaseError as e:
         if "already exists" in str(e):
             raise HTTPException(
@@ -70,7 +80,7 @@ async def login_for_access_token(
     Client should store it in sessionStorage.
     """
     try:
-        employee = auth_service.authenticate(
+        employee = await auth_service.authenticate(
             form_data.username,
             form_data.password
         )
@@ -86,6 +96,8 @@ async def login_for_access_token(
             "token_type": "bearer"
         }
 
+    except ExecutorBusyError as e:
+        raise _busy(e)
     except (EmployeeNotFoundError, InvalidCredentialsError) as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -108,13 +120,17 @@ async def login_for_access_token(
 
 @router.post("/logout")
 async def logout(
-    current_emp: Annotated[Dict[str, Any], Depends(get_current_employee)]
+    current_emp: Annotated[Dict[str, Any], Depends(get_current_employee)],
+    token: Annotated[str, Depends(oauth2_bearer)]
 ) -> Dict[str, str]:
     """
-    Logical logout endpoint.
+    Logout endpoint: the token is revoked (rejected until it expires).
+    The revocation is stored in the database: this worker rejects the token
+    at once, the others within TOKEN_CACHE_TTL_SECONDS, and it survives restarts.
     Client should remove token from sessionStorage.
     """
     try:
+        await TokenService.revoke_token(token)
         logger.info(f"Employee logged out: {current_emp['Emp_email']}")
         return {"message": "Successfully logged out"}
 
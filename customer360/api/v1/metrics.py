@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, status
+from typing import Dict, Any
+
+from ..dependencies import emp_dependency
+from ...utils.logger import logger
+from ...core.executors import executor_stats
+from ..response_cache import response_cache
+from ...services.token_service import token_cache
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/executors", response_model=Dict[str, Any])
+async def executors(emp: emp_dependency):
+    """
+    Queue depth of the executors behind the dashboard, Customer360 and
+    CommunicationTimeline endpoints: per family the concurrency limit,
+    requests waiting / running now, peak waiting, completed / failed
+    counts and average wait / run time in ms; for the dashboard also
+    executed vs coalesced calls (identical concurrent calls served by one
+    computation)
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info("executor metrics endpoint called")
+    return executor_stats()
+
+
+@router.get("/response-cache", response_model=Dict[str, Any])
+async def response_cache_stats(emp: emp_dependency):
+    """
+    Response cache of the dashboard and Customer360 GET endpoints: cached
+    bodies, hits / misses and 304 Not Modified responses sent
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info("response cache metrics endpoint called")
+    return response_cache.stats()
+
+
+@router.get("/token-cache", response_model=Dict[str, Any])
+async def token_cache_stats(emp: emp_dependency):
+    """
+    Verified-token cache of get_current_employee: entries, hits / misses,
+    hit rate, revoked tokens remembered and requests rejected as revoked
+    """
+    if emp is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Failed")
+
+    logger.info("token cache metrics endpoint called")
+    return token_cache.stats()
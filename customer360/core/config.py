@@ -8,15 +8,45 @@ class Setting:
 
     SECRET_KEY = os.getenv('SECRET_KEY')
     ALGORITHM = os.getenv('ALGORITHM')
+    # Verified-token cache of get_current_employee: entries live until the token's exp, at most this long
+    # (so also the longest a logout on another worker takes to reach this one)
+    TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", 300))
+    # bcrypt cost for new password hashes: BCRYPT_ROUNDS if set, else calibrated to ~BCRYPT_TARGET_MS per hash (core/security.py)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS")) if os.getenv("BCRYPT_ROUNDS") else None
+    BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", 100))
 
     DATABASE_USERNAME = os.getenv("DATABASE_USERNAME",'postgres')
     DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD",'password')
     DATABASE_SERVER = os.getenv("DATABASE_SERVER",'localhost')
     DATABASE_PORT = os.getenv("DATABASE_PORT",5432)
     DATABASE_NAME = os.getenv("DATABASE_NAME",'Customer360')
-    DATABASE_URL = f"postgresql://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_SERVER}:{DATABASE_PORT}/{DATABASE_NAME}"
+    # DATABASE_URL overrides the parts above, e.g. sqlite:///./customer360.db for local runs / tests
+    DATABASE_URL = os.getenv(
+        "DATABASE_URL",
+        f"postgresql://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_SERVER}:{DATABASE_PORT}/{DATABASE_NAME}"
+    )
+    # Async driver URL for the auth path; derived from DATABASE_URL (asyncpg / aiosqlite) unless set
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # Where Customer360 / CommunicationTimeline data is read from: "json" (data/*.json) or "database"
+    CUSTOMER360_BACKEND = os.getenv("CUSTOMER360_BACKEND", "json")
     MESSAGES_JSON_PATH = Path(__file__).parent.parent.parent / "data" / "message.json"
-    BASE_DATA_PATH = Path(__file__).parent.parent.parent / "data" 
+    MESSAGES_LOG_PATH = Path(os.getenv("MESSAGES_LOG_PATH", Path(__file__).parent.parent.parent / "data" / "message_log.ndjson"))
+    MESSAGES_BINARY_PATH = Path(os.getenv("MESSAGES_BINARY_PATH", Path(__file__).parent.parent.parent / "data" / "message.bin"))
+    MESSAGES_PARTITION_DIR = Path(os.getenv("MESSAGES_PARTITION_DIR", Path(__file__).parent.parent.parent / "data" / "messages"))
+    MESSAGES_STREAM_THRESHOLD_MB = int(os.getenv("MESSAGES_STREAM_THRESHOLD_MB", 256))  # stream-parse files at least this big
+    # Where dashboard aggregates are computed: "memory" (message store) or "database" (message_events, see message_sql.py)
+    DASHBOARD_BACKEND = os.getenv("DASHBOARD_BACKEND", "memory")
+    # Blocking service calls run on bounded executors (core/executors.py): at most this many at once per endpoint family
+    DASHBOARD_CONCURRENCY = int(os.getenv("DASHBOARD_CONCURRENCY", 4))
+    CUSTOMER360_CONCURRENCY = int(os.getenv("CUSTOMER360_CONCURRENCY", 8))
+    TIMELINE_CONCURRENCY = int(os.getenv("TIMELINE_CONCURRENCY", 4))
+    EXECUTOR_PROCESSES = int(os.getenv("EXECUTOR_PROCESSES", 0))  # > 0: dashboard aggregations on a process pool (new messages via the log only)
+    # bcrypt hash / verify threads, and how many more logins may queue before a 503
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", 32))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))  # serialized GET responses kept for ETag / 304 (api/response_cache.py)
+    BASE_DATA_PATH = Path(__file__).parent.parent.parent / "data"
     STATUS_DELIVERED = "DELIVERED"  # Changed from "SENT" to "DELIVERED" as per request
     STATUS_FAILED = "FAILED"
 
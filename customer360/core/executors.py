@@ -0,0 +1,244 @@
+"""
+Bounded executors for the blocking work behind async endpoints.
+
+Services read files and run aggregation loops synchronously; called
+directly from an `async def` route they block the event loop, so one slow
+request stalls every other request on the worker. Each endpoint family
+gets its own thread pool instead, sized to its concurrency limit:
+
+- dashboard:     DASHBOARD_CONCURRENCY threads, plus the optional process
+                 pool (EXECUTOR_PROCESSES > 0) for CPU-heavy aggregations
+- customer360:   CUSTOMER360_CONCURRENCY threads
+- timeline:      TIMELINE_CONCURRENCY threads
+- password:      PASSWORD_HASH_WORKERS threads for bcrypt (bcrypt releases
+                 the GIL), at most PASSWORD_HASH_QUEUE waiting: a login
+                 storm beyond that is refused with ExecutorBusyError
+                 (503 + Retry-After) instead of queueing without bound
+
+Requests beyond a family's limit wait on the event loop, not in a pool
+queue, so waiting is visible: every family counts waiting / running
+requests, the peak queue depth and wait / run times (stats()).
+
+The dashboard family also coalesces identical concurrent calls (same
+function / service method and arguments) into one computation
+(core/single_flight.py): at the start of a shift hundreds of agents ask
+for the same aggregates at once, and only one of each runs. Coalesced
+callers never take an executor slot.
+
+Process pool workers run services with their own per-process data: each
+builds its own message store on first use, so only picklable service
+classes, arguments and results cross the process boundary. With an
+up-to-date binary copy the workers memory-map its columns and time index
+and so share those pages; each still aggregates its own rollup cube.
+
+Workers see what is on disk: message.json, the binary copy and the message
+log, which each worker's store follows on refresh. Messages added in the
+API process with MessageStore.append() would never reach them, so append()
+is refused while EXECUTOR_PROCESSES > 0; producers write to the message
+log instead.
+"""
+
+from .config import Setting
+from .single_flight import SingleFlight, freeze
+from ..utils.exceptions import ExecutorBusyError
+from ..utils.logger import logger
+import asyncio
+import functools
+import math
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+def _call_service(service: type, method: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """getattr(service(), method)(*args, **kwargs) - module level so process pools can pickle it"""
+    return getattr(service(), method)(*args, **kwargs)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool, None unless Setting.EXECUTOR_PROCESSES > 0"""
+    global _process_pool
+    if Setting.EXECUTOR_PROCESSES <= 0:
+        return None
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # spawn: forking a threaded server can copy held locks into the child
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=Setting.EXECUTOR_PROCESSES,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"Started process pool with {Setting.EXECUTOR_PROCESSES} workers")
+    return _process_pool
+
+
+class ExecutorFamily:
+    """
+    Runs one endpoint family's blocking calls off the event loop, at most
+    `limit` at a time, and keeps queue-depth metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        cpu_bound: bool = False,
+        coalesce: bool = False,
+        max_waiting: Optional[int] = None,
+    ):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_waiting = max(0, max_waiting) if max_waiting is not None else None
+        self.cpu_bound = cpu_bound
+        self._single_flight: Optional[SingleFlight] = SingleFlight() if coalesce else None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # One semaphore per event loop (asyncio primitives are bound to the loop that uses them)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._peak_waiting = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix=f"{self.name}-worker")
+        return self._pool
+
+    def _semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._semaphores.setdefault(loop, asyncio.Semaphore(self.limit))
+        return semaphore
+
+    async def _submit(self, pool: Executor, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(loop)
+
+        queued_at = time.perf_counter()
+        with self._lock:
+            if self.max_waiting is not None and semaphore.locked() and self._waiting >= self.max_waiting:
+                self._rejected += 1
+                raise ExecutorBusyError(f"{self.name} executor is busy", self._retry_after())
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        started_at = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started_at - queued_at
+        failed = False
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            semaphore.release()
+            with self._lock:
+                self._running -= 1
+                self._run_seconds += time.perf_counter() - started_at
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+
+    def _retry_after(self) -> int:
+        """Seconds until the queue ahead of a new request has likely drained (lock held)"""
+        finished = self._completed + self._failed
+        run_seconds = self._run_seconds / finished if finished else 1.0
+        return max(1, math.ceil(run_seconds * (self._waiting + self.limit) / self.limit))
+
+    async def _coalesced(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        if self._single_flight is None:
+            return await compute()
+        return await self._single_flight.do(key, compute)
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """fn(*args, **kwargs) on this family's thread pool"""
+        return await self._coalesced(
+            (fn, freeze(args), freeze(kwargs)),
+            lambda: self._submit(self._get_pool(), functools.partial(fn, *args, **kwargs)),
+        )
+
+    async def run_service(self, service: type, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        service().method(*args, **kwargs) on the process pool for CPU-bound
+        families when one is configured, otherwise on the thread pool
+        """
+        process_pool = _get_process_pool() if self.cpu_bound else None
+        pool = process_pool if process_pool is not None else self._get_pool()
+        return await self._coalesced(
+            (service, method, freeze(args), freeze(kwargs)),
+            lambda: self._submit(pool, _call_service, service, method, args, kwargs),
+        )
+
+    def busy(self) -> bool:
+        """
+        Whether a call submitted now would have to wait: requests are already
+        queued, or every slot on the running event loop is taken. Lets
+        optional work (e.g. a password rehash) stand aside under load.
+        """
+        with self._lock:
+            if self._waiting:
+                return True
+        return self._semaphore(asyncio.get_running_loop()).locked()
+
+    def stats(self) -> Dict[str, Any]:
+        coalescing = self._single_flight.stats() if self._single_flight is not None else {}
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "limit": self.limit,
+                "waiting": self._waiting,
+                "running": self._running,
+                "peak_waiting": self._peak_waiting,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / finished * 1000, 2) if finished else 0.0,
+                "avg_run_ms": round(self._run_seconds / finished * 1000, 2) if finished else 0.0,
+                **coalescing,
+            }
+
+
+dashboard_executor = ExecutorFamily("dashboard", Setting.DASHBOARD_CONCURRENCY, cpu_bound=True, coalesce=True)
+customer360_executor = ExecutorFamily("customer360", Setting.CUSTOMER360_CONCURRENCY)
+timeline_executor = ExecutorFamily("timeline", Setting.TIMELINE_CONCURRENCY)
+password_executor = ExecutorFamily(
+    "password", Setting.PASSWORD_HASH_WORKERS, max_waiting=Setting.PASSWORD_HASH_QUEUE
+)
+
+_FAMILIES = (dashboard_executor, customer360_executor, timeline_executor, password_executor)
+
+
+def executor_stats() -> Dict[str, Any]:
+    """Queue-depth metrics of every executor family"""
+    return {
+        "families": {family.name: family.stats() for family in _FAMILIES},
+        "process_pool_workers": max(0, Setting.EXECUTOR_PROCESSES),
+    }
@@ -1,15 +1,117 @@
+"""
+Password hashing (bcrypt) with a cost chosen for this machine.
+
+The bcrypt cost (log2 of the work factor) is Setting.BCRYPT_ROUNDS when
+set, otherwise calibrated once per process: the largest cost whose hash
+takes at most Setting.BCRYPT_TARGET_MS, never below MIN_ROUNDS. Each extra
+round doubles the time, so one timed hash at a low cost is enough to
+extrapolate.
+
+Hashes made at another cost still verify; needs_rehash() tells the login
+path to re-hash them at the current cost.
+
+Benchmark (hashes/sec per cost on this machine):
+    python -m customer360.core.security --min-cost 8 --max-cost 14
+"""
+
+from .config import Setting
+from ..utils.logger import logger
+import argparse
+import threading
+import time
+from typing import List, Optional, Tuple
 import bcrypt
 
+
+MIN_ROUNDS = 10   # floor regardless of hardware: cheaper hashes make offline guessing too easy
+MAX_ROUNDS = 20
+_PROBE_ROUNDS = 8
+_PROBE_SAMPLES = 3
+
+
+def _time_hash(rounds: int, samples: int = 1) -> float:
+    """Fastest of samples hashes at cost rounds, in seconds"""
+    password = b"calibration-password"
+    best = float("inf")
+    for _ in range(samples):
+        started = time.perf_counter()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """Largest cost (within MIN_ROUNDS..MAX_ROUNDS) whose hash takes at most target_ms here"""
+    seconds = _time_hash(_PROBE_ROUNDS, _PROBE_SAMPLES)
+    rounds = _PROBE_ROUNDS
+    while rounds < MAX_ROUNDS and seconds * 2 * 1000 <= target_ms:
+        seconds *= 2
+        rounds += 1
+    return max(MIN_ROUNDS, rounds)
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """Cost of a bcrypt hash ("$2b$12$..." -> 12), None if it isn't one"""
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
 class Hashing:
 
+    _rounds: Optional[int] = None
+    _rounds_lock = threading.Lock()
+
+    @staticmethod
+    def rounds() -> int:
+        """bcrypt cost for new hashes: Setting.BCRYPT_ROUNDS, or calibrated on first use"""
+        if Hashing._rounds is None:
+            with Hashing._rounds_lock:
+                if Hashing._rounds is None:
+                    if Setting.BCRYPT_ROUNDS is not None:
+                        Hashing._rounds = Setting.BCRYPT_ROUNDS
+                    else:
+                        Hashing._rounds = calibrate_rounds(Setting.BCRYPT_TARGET_MS)
+                    logger.info(f"bcrypt cost: {Hashing._rounds}")
+        return Hashing._rounds
+
     @staticmethod
     def hash_password(password: str) -> str:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=Hashing.rounds())
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
-    
+
     @staticmethod
     def verify_password(plain_password , hash_password):
 
-        return  bcrypt.checkpw(plain_password.encode('utf-8'), 
-                               hash_password.encode('utf-8'))
\ No newline at end of file
+        return  bcrypt.checkpw(plain_password.encode('utf-8'),
+                               hash_password.encode('utf-8'))
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """Whether a stored hash was made at a cost other than the current one"""
+        return hash_rounds(hashed) != Hashing.rounds()
+
+
+def benchmark(min_cost: int, max_cost: int, samples: int) -> List[Tuple[int, float]]:
+    """(cost, ms per hash) for each cost in [min_cost, max_cost]"""
+    return [(rounds, _time_hash(rounds, samples) * 1000) for rounds in range(min_cost, max_cost + 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="bcrypt hashes/sec per cost on this machine")
+    parser.add_argument("--min-cost", type=int, default=8)
+    parser.add_argument("--max-cost", type=int, default=14)
+    parser.add_argument("--samples", type=int, default=3, help="hashes per cost (the fastest is reported)")
+    parser.add_argument("--target-ms", type=float, default=Setting.BCRYPT_TARGET_MS)
+    args = parser.parse_args()
+
+    print(f"{'cost':>4}  {'ms/hash':>9}  {'hashes/sec':>10}")
+    for rounds, ms in benchmark(args.min_cost, args.max_cost, args.samples):
+        print(f"{rounds:>4}  {ms:>9.1f}  {1000 / ms:>10.1f}")
+    print(f"calibrated cost for {args.target_ms:g} ms: {calibrate_rounds(args.target_ms)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing for async callers.
+
+When identical calls overlap (hundreds of agents opening the dashboard at
+the start of a shift), only the first one computes; the others await its
+result. Nothing is cached: once the call finishes, the next identical call
+computes again.
+
+The computation runs as its own task and callers await it shielded, so a
+caller that disconnects doesn't cancel it for the callers still waiting.
+Every caller gets the same result object, which must therefore not be
+mutated.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+def freeze(value: Any) -> Hashable:
+    """Hashable form of call arguments: lists / tuples -> tuples, dicts -> sorted item tuples, sets -> frozensets"""
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+class SingleFlight:
+    """Shares one in-flight computation between concurrent calls with the same key"""
+
+    def __init__(self):
+        # In-flight tasks per event loop (a task can only be awaited on its own loop)
+        self._in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    async def do(self, key: Optional[Hashable], compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Result of compute(), shared with every call made with the same key
+        while it runs. key None (or unhashable) always computes.
+        """
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        if key is None:
+            with self._lock:
+                self._executed += 1
+            return await compute()
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            in_flight = self._in_flight.setdefault(loop, {})
+        task = in_flight.get(key)
+        if task is None:
+            task = loop.create_task(compute())
+            in_flight[key] = task
+            task.add_done_callback(lambda _: in_flight.pop(key, None))
+            with self._lock:
+                self._executed += 1
+        else:
+            with self._lock:
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "executed_calls": self._executed,
+                "coalesced_calls": self._coalesced,
+                "in_flight": sum(len(tasks) for tasks in self._in_flight.values()),
+            }
@@ -1,26 +1,32 @@
 import uvicorn
 
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import FastAPI, status, Depends, HTTPException
-from sqlalchemy.orm import Session
 from customer360.Database.config import engine
-from customer360.Database.session import get_db
-from customer360.api.dependencies import emp_dependency
+from customer360.api.dependencies import emp_dependency, async_db_dependency
 from customer360.Database import config
+from customer360.core.executors import password_executor
+from customer360.core.security import Hashing
 
 config.Base.metadata.create_all(bind=engine)
 from customer360 import api
 
-app = FastAPI()
 
-db_dependncy = Annotated[Session, Depends(get_db)]
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick the bcrypt cost (calibrated unless BCRYPT_ROUNDS is set) before the first login needs it
+    await password_executor.run(Hashing.rounds)
+    yield
 
 
+app = FastAPI(lifespan=lifespan)
+
 app.include_router(api.router)
 
 @app.get("/", status_code=status.HTTP_200_OK)
-async def employee(emp: emp_dependency, db: db_dependncy):
+async def employee(emp: emp_dependency, db: async_db_dependency):
     if emp is None:
         raise HTTPException(status_code=401, detail="Authenticatin Failed")
 
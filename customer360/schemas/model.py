@@ -1,4 +1,6 @@
-from pydantic import BaseModel , EmailStr , field_validator
+from pydantic import BaseModel , EmailStr , Field , field_validator
+from datetime import date
+from typing import List , Literal , Optional
 
 
 class CreateUserRequest(BaseModel):
@@ -14,4 +16,28 @@ class CreateUserRequest(BaseModel):
 class Token(BaseModel):
 
     access_token: str
-    token_type: str
\ No newline at end of file
+    token_type: str
+
+MAX_BATCH_SIZE = 500
+
+CommunicationFilter = Literal["ALL", "Email", "SMS", "WhatsApp", "Post", "IVR", "Failed", "Delivered"]
+
+
+class CustomerDetailsBatchRequest(BaseModel):
+
+    customer_ids: List[str] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    filter_type: CommunicationFilter = "ALL"
+
+
+class LoanKey(BaseModel):
+
+    customer_id: str = Field(min_length=1)
+    lan: str = Field(min_length=1)
+
+
+class PaymentBehaviourBatchRequest(BaseModel):
+
+    loans: List[LoanKey] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    months: int = Field(default=6, ge=1, le=360)
+    from_date: Optional[date] = None
+    to_date: Optional[date] = None
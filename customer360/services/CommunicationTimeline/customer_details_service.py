@@ -5,38 +5,21 @@ Root cause: channel vs type field confusion + whitespace in JSON data
 
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from ...core.config import Setting
+from ..Customer360_services.repository import Customer360Repository, TimelineKey, get_customer360_repository
+import base64
+import binascii
 import json
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 
 
-class CustomerDetailsService:
-
-    def _load_data(self, filename: str) -> List[Dict[str, Any]]:
-        """Load JSON data from file in the data/ directory."""
-        try:
-            full_path = Setting.BASE_DATA_PATH / filename
+VALID_FILTER_TYPES = {"ALL", "Email", "SMS", "WhatsApp", "Post", "IVR", "Failed", "Delivered"}
 
-            if not full_path.is_file():
-                logger.warning(f"Data file not found: {full_path}")
-                return []
 
-            with full_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if not isinstance(data, list):
-                logger.error(f"Data in {filename} is not a list")
-                return []
+class CustomerDetailsService:
 
-            logger.debug(f"Loaded {len(data)} records from {filename}")
-            return data
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in {filename}: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load {filename}: {e}", exc_info=True)
-            return []
+    def _repository(self) -> Customer360Repository:
+        """Indexed customer / loan / communication lookups (built once per file version)."""
+        return get_customer360_repository()
 
     def _normalize(self, value: Any) -> str:
         """Safely strip and normalize any string value"""
@@ -46,7 +29,6 @@ class CustomerDetailsService:
 
     def _find_customer(
         self,
-        customers: List[Dict[str, Any]],
         customer_id: Optional[str] = None,
         name: Optional[str] = None,
         mobile: Optional[str] = None,
@@ -54,25 +36,7 @@ class CustomerDetailsService:
         pan: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
         """Find first matching customer (case-insensitive & partial for name/email)"""
-        name_lower  = name.lower().strip()  if name  else None
-        email_lower = email.lower().strip() if email else None
-
-        for cust in customers:
-            if customer_id and self._normalize(cust.get("customer_id")) == self._normalize(customer_id):
-                return cust
-            if pan and self._normalize(cust.get("pan")) == self._normalize(pan):
-                return cust
-            if mobile:
-                mob         = self._normalize(cust.get("mobile")).replace("+91", "").replace(" ", "")
-                search_mob  = self._normalize(mobile).replace("+91", "").replace(" ", "")
-                if mob == search_mob:
-                    return cust
-            if name_lower and name_lower in self._normalize(cust.get("name")).lower():
-                return cust
-            if email_lower and email_lower in self._normalize(cust.get("email")).lower():
-                return cust
-
-        return None
+        return self._repository().find_customer(customer_id, name, mobile, email, pan)
 
     def _get_loans_for_customer(
         self,
@@ -97,6 +61,35 @@ class CustomerDetailsService:
         logger.debug(f"Found {len(matched)} loans for customer_id='{customer_id}'")
         return matched
 
+    def _check_filter_type(self, filter_type: str) -> None:
+        if filter_type not in VALID_FILTER_TYPES:
+            raise ValueError(f"Invalid filter_type: '{filter_type}'. Must be one of {VALID_FILTER_TYPES}")
+
+    def _matches_filter(self, comm: Dict[str, Any], filter_type: str) -> bool:
+        """filter_type can match channel (SMS) or status (Delivered/Failed)"""
+        if filter_type == "ALL":
+            return True
+        # Your JSON: "channel": "SMS", "type": "Outbound"
+        # channel = communication medium (SMS/Email/WhatsApp)
+        # type    = direction (Inbound/Outbound)
+        comm_channel = self._normalize(comm.get("channel"))   # SMS, Email, WhatsApp
+        comm_status  = self._normalize(comm.get("status"))    # Delivered, Failed
+        return comm_channel == filter_type or comm_status == filter_type
+
+    def _communication_record(self, comm: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id"             : self._normalize(comm.get("id")),
+            "lan"            : self._normalize(comm.get("lan")),
+            "channel"        : self._normalize(comm.get("channel")),
+            "direction"      : self._normalize(comm.get("type")),  # Inbound/Outbound
+            "status"         : self._normalize(comm.get("status")),
+            "message"        : comm.get("message") or "",
+            "sent_time"      : comm.get("sent_time") or "",
+            "delivered_time" : comm.get("delivered_time") or "",
+            "template"       : comm.get("template") or "",
+            "issue_type"     : comm.get("issue_type") or None,
+        }
+
     def _get_communications(
         self,
         communications: List[Dict[str, Any]],
@@ -105,9 +98,7 @@ class CustomerDetailsService:
         filter_type: str = "ALL"
     ) -> List[Dict[str, Any]]:
         """Get filtered communications for a customer"""
-        valid_types = {"ALL", "Email", "SMS", "WhatsApp", "Post", "IVR", "Failed", "Delivered"}
-        if filter_type not in valid_types:
-            raise ValueError(f"Invalid filter_type: '{filter_type}'. Must be one of {valid_types}")
+        self._check_filter_type(filter_type)
 
         filtered = []
 
@@ -126,32 +117,12 @@ class CustomerDetailsService:
                              f"not in allowed {allowed_lans}")
                 continue
 
-            # ── Step 3: Get channel (your JSON uses 'channel' not 'type') ──────
-            # Your JSON: "channel": "SMS", "type": "Outbound"
-            # channel = communication medium (SMS/Email/WhatsApp)
-            # type    = direction (Inbound/Outbound)
-            comm_channel = self._normalize(comm.get("channel"))   # SMS, Email, WhatsApp
-            comm_status  = self._normalize(comm.get("status"))    # Delivered, Failed
-
-            # ── Step 4: Apply filter_type ──────────────────────────────────────
-            if filter_type != "ALL":
-                # filter_type can match channel (SMS) or status (Delivered/Failed)
-                if comm_channel != filter_type and comm_status != filter_type:
-                    continue
+            # ── Step 3 + 4: Apply filter_type ─────────────────────────────────
+            if not self._matches_filter(comm, filter_type):
+                continue
 
             # ── Step 5: Build communication record ────────────────────────────
-            filtered.append({
-                "id"             : self._normalize(comm.get("id")),
-                "lan"            : comm_lan,
-                "channel"        : comm_channel,
-                "direction"      : self._normalize(comm.get("type")),  # Inbound/Outbound
-                "status"         : comm_status,
-                "message"        : comm.get("message") or "",
-                "sent_time"      : comm.get("sent_time") or "",
-                "delivered_time" : comm.get("delivered_time") or "",
-                "template"       : comm.get("template") or "",
-                "issue_type"     : comm.get("issue_type") or None,
-            })
+            filtered.append(self._communication_record(comm))
 
         logger.debug(
             f"_get_communications result: {len(filtered)} records | "
@@ -178,12 +149,10 @@ class CustomerDetailsService:
         - lan=list  → communications for those specific loans only
         """
         try:
-            customers      = self._load_data("customers.json")
-            loans_data     = self._load_data("loans.json")
-            communications = self._load_data("communications.json")
+            repository = self._repository()
 
             # ── Step 1: Find customer ──────────────────────────────────────────
-            customer = self._find_customer(customers, customer_id, name, mobile, email, pan)
+            customer = self._find_customer(customer_id, name, mobile, email, pan)
             if not customer:
                 logger.info(f"No customer found | search params: "
                             f"id={customer_id}, name={name}, mobile={mobile}, "
@@ -196,7 +165,7 @@ class CustomerDetailsService:
                 return {"customer": None, "loans": [], "total_communications": 0}
 
             # ── Step 2: Get all loans ──────────────────────────────────────────
-            cust_loans = self._get_loans_for_customer(loans_data, cust_id)
+            cust_loans = self._get_loans_for_customer(repository.get_loans(cust_id, exact=False), cust_id)
 
             # ── Step 3: Normalize lan → set or None ───────────────────────────
             allowed_lans: Optional[set] = None
@@ -210,7 +179,7 @@ class CustomerDetailsService:
 
             # ── Step 4: Fetch filtered communications ─────────────────────────
             all_comms = self._get_communications(
-                communications, cust_id, allowed_lans, filter_type
+                repository.get_communications(cust_id, allowed_lans), cust_id, allowed_lans, filter_type
             )
 
             # ── Step 5: Group communications by LAN ───────────────────────────
@@ -267,6 +236,128 @@ class CustomerDetailsService:
             logger.error(f"Critical error in get_customer_details: {e}", exc_info=True)
             raise CalculationError(f"Failed to fetch customer details: {str(e)}")
 
+    def get_customer_details_batch(
+        self,
+        customer_ids: List[str],
+        filter_type: str = "ALL"
+    ) -> Dict[str, Any]:
+        """
+        get_customer_details for many customers in one call.
+        Results are keyed by customer_id (stripped; duplicates collapse) and are
+        None for ids with no customer. Every id is an index lookup against the
+        same loaded data, so the files are read at most once per batch.
+        """
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for customer_id in customer_ids:
+            cust_id = self._normalize(customer_id)
+            if not cust_id or cust_id in results:
+                continue
+            details = self.get_customer_details(customer_id=cust_id, filter_type=filter_type)
+            results[cust_id] = details if details["customer"] is not None else None
+
+        found = sum(1 for details in results.values() if details is not None)
+        logger.info(f"customer-details batch: {found}/{len(results)} customers found | type_filter='{filter_type}'")
+        return {"results": results, "requested": len(results), "found": found}
+
+    # ── Communication timeline (one loan, newest first) ──────────────────────
+
+    def _encode_cursor(self, key: TimelineKey) -> str:
+        """Opaque cursor for the timeline key (sent_epoch_us, id) of the last returned communication"""
+        raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> TimelineKey:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sent, comm_id = json.loads(raw)
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(sent, int) or isinstance(sent, bool) or not isinstance(comm_id, str):
+            raise ValueError("Invalid cursor")
+        return sent, comm_id
+
+    def _timeline(
+        self,
+        customer_id: str,
+        lan: str,
+        filter_type: str,
+        cursor: Optional[str]
+    ) -> Iterator[Tuple[TimelineKey, Dict[str, Any]]]:
+        """(key, record) of the loan's matching communications, newest first, after cursor"""
+        cust_id = self._normalize(customer_id)
+        lan_clean = self._normalize(lan)
+        if not cust_id:
+            raise ValueError("customer_id is required")
+        if not lan_clean:
+            raise ValueError("lan is required")
+        self._check_filter_type(filter_type)
+        before = self._decode_cursor(cursor) if cursor else None
+
+        timeline = self._repository().get_timeline(cust_id, lan_clean)
+        return (
+            (key, self._communication_record(comm))
+            for key, comm in timeline.newest_first(before)
+            if self._matches_filter(comm, filter_type)
+        )
+
+    def get_communication_timeline(
+        self,
+        customer_id: str,
+        lan: str,
+        filter_type: str = "ALL",
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        One page of a loan's communications, newest first by (sent_time, id).
+        - cursor: next_cursor of the previous page (None for the first page)
+        Communications without a sent_time come last.
+        Raises ValueError for bad input or a cursor this endpoint did not issue.
+        """
+        entries = self._timeline(customer_id, lan, filter_type, cursor)
+        try:
+            communications = []
+            last_key = None
+            has_more = False
+            for key, record in entries:
+                if len(communications) == limit:
+                    has_more = True
+                    break
+                communications.append(record)
+                last_key = key
+
+            logger.info(
+                f"communication timeline | customer='{customer_id}' | lan='{lan}' | "
+                f"page={len(communications)} | more={has_more} | type_filter='{filter_type}'"
+            )
+            return {
+                "customer_id"   : self._normalize(customer_id),
+                "lan"           : self._normalize(lan),
+                "filter_type"   : filter_type,
+                "communications": communications,
+                "limit"         : limit,
+                "next_cursor"   : self._encode_cursor(last_key) if has_more else None
+            }
+
+        except Exception as e:
+            logger.error(f"Critical error in get_communication_timeline: {e}", exc_info=True)
+            raise CalculationError(f"Failed to fetch communication timeline: {str(e)}")
+
+    def stream_communication_timeline(
+        self,
+        customer_id: str,
+        lan: str,
+        filter_type: str = "ALL",
+        cursor: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        The whole timeline from cursor on as NDJSON lines (one communication
+        per line, newest first). Input is validated before the first line, so
+        errors surface before the response starts.
+        """
+        entries = self._timeline(customer_id, lan, filter_type, cursor)
+        return (json.dumps(record) + "\n" for _, record in entries)
+
 
 def get_customer_details_service() -> CustomerDetailsService:
     return CustomerDetailsService()
\ No newline at end of file
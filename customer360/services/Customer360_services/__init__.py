@@ -1,8 +1,15 @@
+from .repository import Customer360Repository, get_customer360_repository
+from .database_repository import Customer360DatabaseRepository
+from .database_loader import load_customer360_data
 from .customer_service import CustomerListService
 from .loanBYloanid_service import  PaymentBehaviourService
 from .loansBYcustid_service import  CustomerByIdService
 
 
-__all__ = [CustomerListService,
+__all__ = [Customer360Repository,
+           get_customer360_repository,
+           Customer360DatabaseRepository,
+           load_customer360_data,
+           CustomerListService,
            PaymentBehaviourService,
            CustomerByIdService]
@@ -0,0 +1,163 @@
+"""
+Customer Data Store
+Shared, version-aware copies of customers.json, loans.json, payments.json and
+communications.json. Each file is parsed once per (mtime, size) and its
+timestamps are normalized at ingest, so request handlers never re-read the
+files or call fromisoformat per access:
+
+- payments:        due_* / payment_* fields from due_date / payment_date,
+                   plus due_month ("YYYY-MM")
+- communications:  sent_* / delivered_* fields from sent_time / delivered_time
+
+where * is at (datetime), epoch_us (int), day (date) and hour (int) - see
+utils.timestamps.timestamp_fields. Missing / invalid values give None.
+
+Indexes over a file (the customer search index, the lookup indexes of
+Customer360Repository) are built alongside it and rebuilt only when the
+file's version changes.
+
+Records are shared between requests and must be treated as read-only.
+"""
+
+from ...utils.logger import logger
+from ...utils.timestamps import timestamp_fields
+from ...core.config import Setting
+import json
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .customer_search import CustomerSearchIndex
+
+
+def _normalize_payment(payment: Dict[str, Any]) -> Dict[str, Any]:
+    payment.update(timestamp_fields("due", payment.get("due_date")))
+    payment.update(timestamp_fields("payment", payment.get("payment_date")))
+    due_at = payment["due_at"]
+    payment["due_month"] = due_at.strftime("%Y-%m") if due_at is not None else None
+    return payment
+
+
+def _normalize_communication(communication: Dict[str, Any]) -> Dict[str, Any]:
+    communication.update(timestamp_fields("sent", communication.get("sent_time")))
+    communication.update(timestamp_fields("delivered", communication.get("delivered_time")))
+    return communication
+
+
+_NORMALIZERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "payments.json": _normalize_payment,
+    "communications.json": _normalize_communication,
+}
+
+
+class CustomerDataStore:
+    """
+    Cached record lists keyed by file name. A file is re-read only when its
+    (mtime_ns, size) changes; if a changed file can't be parsed, the last
+    good copy keeps being served.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        # (filename, index name) -> (records the index was built from, index)
+        self._indexes: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], Any]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, filename: str) -> List[Dict[str, Any]]:
+        path = Setting.BASE_DATA_PATH / filename
+        try:
+            stat = path.stat()
+        except OSError:
+            logger.warning(f"Data file not found: {path}")
+            self._files.pop(filename, None)
+            return []
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(filename)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._files.get(filename)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to load {filename}: {e}")
+                return cached[1] if cached is not None else []
+
+            if not isinstance(data, list):
+                logger.error(f"Data in {filename} is not a list")
+                data = []
+
+            normalize = _NORMALIZERS.get(filename)
+            if normalize is not None:
+                data = [normalize(record) if isinstance(record, dict) else record for record in data]
+
+            self._files[filename] = (version, data)
+            logger.debug(f"Loaded {len(data)} records from {filename}")
+            return data
+
+    def version(self, *filenames: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+        """
+        (mtime_ns, size) of each file as it is on disk now, None if missing:
+        changes whenever the next read would reload the file
+        """
+        versions: List[Optional[Tuple[int, int]]] = []
+        for filename in filenames:
+            try:
+                stat = (Setting.BASE_DATA_PATH / filename).stat()
+            except OSError:
+                versions.append(None)
+                continue
+            versions.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(versions)
+
+    def index(self, filename: str, name: str, build: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        """
+        build(records) for the current version of filename, built once per
+        version and shared under name until the file changes.
+        """
+        records = self._load(filename)
+        cached = self._indexes.get((filename, name))
+        if cached is not None and cached[0] is records:
+            return cached[1]
+
+        with self._lock:
+            cached = self._indexes.get((filename, name))
+            if cached is not None and cached[0] is records:
+                return cached[1]
+            index = build(records)
+            self._indexes[(filename, name)] = (records, index)
+            logger.debug(f"Built {name} index over {len(records)} records of {filename}")
+            return index
+
+    def get_customers(self) -> List[Dict[str, Any]]:
+        return self._load("customers.json")
+
+    def get_loans(self) -> List[Dict[str, Any]]:
+        return self._load("loans.json")
+
+    def get_payments(self) -> List[Dict[str, Any]]:
+        return self._load("payments.json")
+
+    def get_communications(self) -> List[Dict[str, Any]]:
+        return self._load("communications.json")
+
+    def get_customer_search_index(self) -> CustomerSearchIndex:
+        return self.index("customers.json", "search", CustomerSearchIndex.build)
+
+
+_customer_data_store: Optional[CustomerDataStore] = None
+_customer_data_store_lock = threading.Lock()
+
+
+def get_customer_data_store() -> CustomerDataStore:
+    """Process-wide CustomerDataStore, created on first use"""
+    global _customer_data_store
+    if _customer_data_store is None:
+        with _customer_data_store_lock:
+            if _customer_data_store is None:
+                _customer_data_store = CustomerDataStore()
+    return _customer_data_store
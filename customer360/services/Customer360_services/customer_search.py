@@ -0,0 +1,230 @@
+"""
+Customer Search Index
+Trigram inverted index over the searchable customer fields (name,
+customer_id, mobile without spaces, email, PAN - all lowercased).
+
+A query of 3+ characters is resolved by intersecting the posting lists of
+its trigrams and then substring-checking only those candidates, so results
+and totals are exactly those of the old full scan. Shorter queries have no
+trigram and fall back to scanning the pre-lowered fields.
+
+Trigrams are packed into uint64 keys (three 21-bit code points) and built
+with NumPy over all customers at once. Postings are stored flat: customer
+rows grouped by trigram key, plus each key's [start, end) offsets.
+
+Rows are also presorted by (customer_id, row) so keyset pages resume right
+after the last returned key and stop scanning once the page is full.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+SEARCH_FIELDS = ("name", "customer_id", "mobile", "email", "pan")
+_GRAM = 3
+# Joins fields and customers so no trigram spans two of them
+_SEPARATOR = "\x00"
+_SCAN_CHUNK = 1024
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _search_fields(customer: Dict[str, Any]) -> Tuple[str, ...]:
+    """The lowercased strings a customer-list search matches against"""
+    return (
+        _text(customer.get("name")).lower(),
+        _text(customer.get("customer_id")).lower(),
+        _text(customer.get("mobile")).replace(" ", "").lower(),
+        _text(customer.get("email")).lower(),
+        _text(customer.get("pan")).lower(),
+    )
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def _gram_keys(codes: np.ndarray) -> np.ndarray:
+    """Key of the trigram starting at each position (len(codes) - 2 keys)"""
+    return (codes[:-2] << np.uint64(42)) | (codes[1:-1] << np.uint64(21)) | codes[2:]
+
+
+class KeysetPage:
+    """
+    One page in customer_id order:
+    - rows: matching rows, at most the requested limit
+    - has_more: more matches follow the last row
+    - candidates / scanned / found: size of the candidate set and how much of
+      it the page examined, for estimating the total without a full count
+    - complete: every candidate was examined from the first position on, so
+      found is the exact total
+    """
+
+    __slots__ = ("rows", "has_more", "candidates", "scanned", "found", "complete")
+
+    def __init__(self, rows: List[int], has_more: bool, candidates: int, scanned: int, found: int, complete: bool):
+        self.rows = rows
+        self.has_more = has_more
+        self.candidates = candidates
+        self.scanned = scanned
+        self.found = found
+        self.complete = complete
+
+    def estimated_total(self) -> int:
+        """found extrapolated over all candidates by the match rate seen so far"""
+        if self.complete:
+            return self.found
+        if not self.scanned:
+            return self.candidates
+        return round(self.found / self.scanned * self.candidates)
+
+
+class CustomerSearchIndex:
+    """
+    Built once per customers.json version; rows are positions in that list.
+    search() returns matching rows in file order; page() pages through them
+    in customer_id order.
+    """
+
+    def __init__(
+        self,
+        customers: List[Dict[str, Any]],
+        fields: List[Tuple[str, ...]],
+        grams: np.ndarray,
+        offsets: np.ndarray,
+        postings: np.ndarray,
+    ):
+        self.customers = customers
+        self._fields = fields
+        self._grams = grams
+        self._offsets = offsets
+        self._postings = postings
+
+        # Keyset order: customer_id, then row for duplicate ids
+        ids = np.array([_text(cust.get("customer_id")) for cust in customers], dtype=str)
+        order = np.argsort(ids, kind="stable")
+        self._sorted_ids = ids[order]
+        self._sorted_rows = order.astype(np.int64)
+        self._positions = np.empty(len(order), dtype=np.int64)
+        self._positions[order] = np.arange(len(order))
+
+    @classmethod
+    def build(cls, customers: List[Dict[str, Any]]) -> "CustomerSearchIndex":
+        fields = [_search_fields(cust) for cust in customers]
+        if not fields:
+            empty = np.zeros(0, dtype=np.uint64)
+            return cls(customers, fields, empty, np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+
+        texts = [_SEPARATOR.join(texts) + _SEPARATOR for texts in fields]
+        codes = _code_points("".join(texts))
+        rows = np.repeat(np.arange(len(texts), dtype=np.int32), [len(text) for text in texts])
+
+        separator = np.uint64(ord(_SEPARATOR))
+        valid = (codes[:-2] != separator) & (codes[1:-1] != separator) & (codes[2:] != separator)
+        keys = _gram_keys(codes)[valid]
+        rows = rows[:-2][valid]
+
+        # Stable sort keeps each posting list in row order; then drop repeats of a trigram within a row
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        rows = rows[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (rows[1:] != rows[:-1])
+        keys = keys[keep]
+        rows = rows[keep]
+
+        grams, starts = np.unique(keys, return_index=True)
+        offsets = np.append(starts, len(keys)).astype(np.int64)
+        return cls(customers, fields, grams, offsets, rows)
+
+    def __len__(self) -> int:
+        return len(self.customers)
+
+    def _candidates(self, query: str) -> Sequence[int]:
+        """Rows that contain every trigram of query (a superset of the matches)"""
+        if len(query) < _GRAM or _SEPARATOR in query:
+            return range(len(self._fields))
+
+        if not len(self._grams):
+            return []
+        keys = np.unique(_gram_keys(_code_points(query)))
+        positions = np.minimum(np.searchsorted(self._grams, keys), len(self._grams) - 1)
+        if (self._grams[positions] != keys).any():
+            return []
+
+        postings = sorted(
+            (self._postings[self._offsets[pos]:self._offsets[pos + 1]] for pos in positions.tolist()),
+            key=len,
+        )
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not rows.size:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows.tolist()
+
+    def position_after(self, customer_id: str, row: int) -> int:
+        """Position in keyset order right after the key (customer_id, row)"""
+        lo = int(np.searchsorted(self._sorted_ids, customer_id, side="left"))
+        hi = int(np.searchsorted(self._sorted_ids, customer_id, side="right"))
+        return lo + int(np.searchsorted(self._sorted_rows[lo:hi], row, side="right"))
+
+    def key_of(self, row: int) -> Tuple[str, int]:
+        """Keyset key of a row"""
+        return str(self._sorted_ids[self._positions[row]]), row
+
+    def _rows_from(self, candidates: Sequence[int], start: int) -> Iterator[int]:
+        """Candidate rows at keyset positions >= start, in keyset order"""
+        if isinstance(candidates, range):
+            for chunk in range(start, len(self._sorted_rows), _SCAN_CHUNK):
+                yield from self._sorted_rows[chunk:chunk + _SCAN_CHUNK].tolist()
+            return
+        positions = np.sort(self._positions[np.asarray(candidates, dtype=np.int64)])
+        positions = positions[np.searchsorted(positions, start):]
+        yield from self._sorted_rows[positions].tolist()
+
+    def page(
+        self,
+        query: Optional[str],
+        start: int,
+        limit: int,
+        fields: Sequence[str] = SEARCH_FIELDS,
+    ) -> KeysetPage:
+        """
+        Up to limit rows matching query (all rows if None) from keyset
+        position start on. Scanning stops at the first match past the page.
+        """
+        if not query:
+            rows = self._sorted_rows[start:start + limit].tolist()
+            total = len(self._sorted_rows)
+            return KeysetPage(rows, start + limit < total, total, total, total, True)
+
+        positions = [SEARCH_FIELDS.index(field) for field in fields]
+        texts = self._fields
+        candidates = self._candidates(query)
+        rows: List[int] = []
+        scanned = 0
+        has_more = False
+        for row in self._rows_from(candidates, start):
+            scanned += 1
+            if any(query in texts[row][pos] for pos in positions):
+                if len(rows) == limit:
+                    has_more = True
+                    break
+                rows.append(row)
+        found = len(rows) + has_more
+        return KeysetPage(rows, has_more, len(candidates), scanned, found, start == 0 and not has_more)
+
+    def search(self, query: str, fields: Sequence[str] = SEARCH_FIELDS) -> List[int]:
+        """
+        Rows (in file order) where query is a substring of any of the given
+        SEARCH_FIELDS; query must be lowercased.
+        """
+        positions = [SEARCH_FIELDS.index(field) for field in fields]
+        texts = self._fields
+        return [
+            row for row in self._candidates(query)
+            if any(query in texts[row][pos] for pos in positions)
+        ]
@@ -1,33 +1,52 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from ...core.config import Setting
+from .customer_data import get_customer_data_store
+from .customer_search import CustomerSearchIndex
+from .database_repository import Customer360DatabaseRepository
+from .repository import get_customer360_repository
+import base64
+import binascii
 import json
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class CustomerListService:
     
-    def _load_customers(self) -> List[Dict[str, Any]]:
-        """Load customer data from JSON file (only customer details)"""
-        path = Setting.BASE_DATA_PATH / "customers.json"
-        if not path.is_file():
-            logger.warning(f"Customers file not found: {path}")
-            return []
-        
+    def _load_search_index(self) -> CustomerSearchIndex:
+        """Trigram search index over the current customers.json (built once per file version)"""
+        return get_customer_data_store().get_customer_search_index()
+
+    def _database(self) -> Optional[Customer360DatabaseRepository]:
+        """The database repository when CUSTOMER360_BACKEND is "database" (else the JSON search index is used)"""
+        repository = get_customer360_repository()
+        return repository if isinstance(repository, Customer360DatabaseRepository) else None
+
+    def _summary(self, cust: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": cust.get("name", ""),
+            "customer_id": cust.get("customer_id", ""),
+            "ucic_id": cust.get("ucic_id", ""),
+            "mobile": cust.get("mobile", ""),
+            "email": cust.get("email", ""),
+            "pan": cust.get("pan", ""),
+            "branch": cust.get("branch", ""),
+            "risk": cust.get("risk", "Low")
+        }
+
+    def _encode_cursor(self, key: Tuple[str, int]) -> str:
+        """Opaque cursor for the keyset key (customer_id, row) of the last returned customer"""
+        raw = json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> Tuple[str, int]:
         try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                logger.error("Customers data is not a list")
-                return []
-            logger.debug(f"Loaded {len(data)} customers")
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load customers: {e}", exc_info=True)
-            return []
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            customer_id, row = json.loads(raw)
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(customer_id, str) or not isinstance(row, int):
+            raise ValueError("Invalid cursor")
+        return customer_id, row
 
     def get_customers(
         self,
@@ -42,43 +61,21 @@ class CustomerListService:
         Returns: customers list + total count
         """
         try:
-            all_customers = self._load_customers()
-            if not all_customers:
-                return {"customers": [], "total": 0}
-
-            filtered = []
             search_lower = search.lower().strip() if search else None
+            database = self._database()
+            if database is not None:
+                customers, total = database.search_customers(search_lower, offset, limit)
+                paginated = [self._summary(cust) for cust in customers]
+            else:
+                index = self._load_search_index()
+                all_customers = index.customers
+                if not all_customers:
+                    return {"customers": [], "total": 0}
+
+                rows = index.search(search_lower) if search_lower else range(len(all_customers))
 
-            for cust in all_customers:
-                if search_lower:
-                    name = cust.get("name", "").lower()
-                    cust_id = cust.get("customer_id", "").lower()
-                    mobile = cust.get("mobile", "").replace(" ", "").lower()
-                    email = cust.get("email", "").lower()
-                    pan = cust.get("pan", "").lower()
-
-                    if not any([
-                        search_lower in name,
-                        search_lower in cust_id,
-                        search_lower in mobile,
-                        search_lower in email,
-                        search_lower in pan
-                    ]):
-                        continue
-
-                filtered.append({
-                    "name": cust.get("name", ""),
-                    "customer_id": cust.get("customer_id", ""),
-                    "ucic_id": cust.get("ucic_id", ""),
-                    "mobile": cust.get("mobile", ""),
-                    "email": cust.get("email", ""),
-                    "pan": cust.get("pan", ""),
-                    "branch": cust.get("branch", ""),
-                    "risk": cust.get("risk", "Low")
-                })
-
-            total = len(filtered)
-            paginated = filtered[offset : offset + limit]
+                total = len(rows)
+                paginated = [self._summary(all_customers[row]) for row in rows[offset : offset + limit]]
 
             logger.info(f"Fetched {len(paginated)} customers (total: {total}, search: '{search}')")
             return {
@@ -92,6 +89,95 @@ class CustomerListService:
             logger.error(f"Customer list fetch failed: {e}", exc_info=True)
             raise CalculationError(f"Failed to fetch customers: {str(e)}")
 
+    def get_customers_page(
+        self,
+        search: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Keyset-paginated list of customers, ordered by customer_id
+        - search: same matching as get_customers
+        - cursor: next_cursor of the previous page (None for the first page)
+        - include_total: count every match exactly; otherwise total is
+          estimated from the part of the candidate set the page scanned
+        Returns: customers list + next_cursor (None on the last page) + total / total_exact
+        Raises ValueError for a cursor this endpoint did not issue.
+        """
+        key = self._decode_cursor(cursor) if cursor else None
+
+        try:
+            search_lower = search.lower().strip() if search else None
+            database = self._database()
+            if database is not None:
+                return self._get_customers_page_from_database(database, search, search_lower, limit, key, include_total)
+
+            index = self._load_search_index()
+            start = index.position_after(*key) if key is not None else 0
+            page = index.page(search_lower, start, limit)
+            customers = [self._summary(index.customers[row]) for row in page.rows]
+            next_cursor = self._encode_cursor(index.key_of(page.rows[-1])) if page.has_more else None
+
+            if include_total and not page.complete:
+                total, total_exact = len(index.search(search_lower)), True
+            else:
+                total, total_exact = page.estimated_total(), page.complete
+
+            logger.info(
+                f"Fetched {len(customers)} customers by cursor "
+                f"(total: {total}{'' if total_exact else ' est.'}, search: '{search}')"
+            )
+            return {
+                "customers": customers,
+                "total": total,
+                "total_exact": total_exact,
+                "limit": limit,
+                "next_cursor": next_cursor
+            }
+
+        except Exception as e:
+            logger.error(f"Customer list (cursor) fetch failed: {e}", exc_info=True)
+            raise CalculationError(f"Failed to fetch customers: {str(e)}")
+
+    def _get_customers_page_from_database(
+        self,
+        database: Customer360DatabaseRepository,
+        search: Optional[str],
+        search_lower: Optional[str],
+        limit: int,
+        key: Optional[Tuple[str, int]],
+        include_total: bool
+    ) -> Dict[str, Any]:
+        """
+        get_customers_page on the database backend: one keyset query per page.
+        Unfiltered lists are always counted. A search is counted only with
+        include_total (a separate query) or when the first page holds every
+        match; otherwise total is None.
+        """
+        rows, has_more = database.customers_after(search_lower, key, limit)
+        customers = [self._summary(cust) for cust, _ in rows]
+        next_cursor = self._encode_cursor(rows[-1][1]) if has_more else None
+
+        if key is None and not has_more:
+            total, total_exact = len(rows), True
+        elif include_total or not search_lower:
+            total, total_exact = database.count_customers(search_lower), True
+        else:
+            total, total_exact = None, False
+
+        logger.info(
+            f"Fetched {len(customers)} customers by cursor from database "
+            f"(total: {total if total_exact else 'not counted'}, search: '{search}')"
+        )
+        return {
+            "customers": customers,
+            "total": total,
+            "total_exact": total_exact,
+            "limit": limit,
+            "next_cursor": next_cursor
+        }
+
 
 def get_customer_list_service() -> CustomerListService:
     return CustomerListService()
\ No newline at end of file
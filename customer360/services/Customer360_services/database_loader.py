@@ -0,0 +1,193 @@
+"""
+Customer360 Database Loader
+Imports data/customers.json, loans.json, payments.json and
+communications.json into the customers / loans / payments / communications
+tables (Database/model/customer360_model.py).
+
+Files are stream-parsed and inserted in batches of executemany INSERTs, so
+memory stays at one batch whatever the file size. All four tables are
+replaced in a single transaction: readers see either the old data or the
+new data, never a mix.
+
+Rows keep their file position, so the database backend
+(CUSTOMER360_BACKEND=database) returns records in the same order as the
+JSON files.
+
+Load / reload:
+    python -m customer360.services.Customer360_services.database_loader
+"""
+
+from ...utils.exceptions import DataLoadError
+from ...utils.json_stream import iter_json_batches
+from ...utils.logger import logger
+from ...utils.timestamps import epoch_us, parse_datetime
+from ...core.config import Setting
+from ...Database.config import Base, engine
+from ...Database.model.customer360_model import PG_TRGM, TRIGRAM_INDEXES, Communication, Customer, Loan, Payment
+from pathlib import Path
+import argparse
+from typing import Any, Callable, Dict, List, Optional, Union
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection, Engine
+from .customer_search import _search_fields
+from .repository import NO_SENT_TIME, canonical_mobile, normalize
+
+
+_BATCH_SIZE = 1000
+# Joins the customer search fields so a LIKE match never spans two of them
+# (not NUL: PostgreSQL rejects it in text and SQLite's LIKE stops at it)
+_FIELD_SEPARATOR = "\x1f"
+
+
+def _raw(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _customer_row(position: int, customer: Dict[str, Any]) -> Dict[str, Any]:
+    fields = _search_fields(customer)
+    row = {field: _raw(customer.get(field)) for field in Customer.FIELDS}
+    row.update(
+        position=position,
+        customer_key=normalize(customer.get("customer_id")),
+        pan_key=normalize(customer.get("pan")),
+        mobile_key=canonical_mobile(customer.get("mobile")),
+        name_lower=fields[0],
+        email_lower=fields[3],
+        search_text=_FIELD_SEPARATOR.join(fields),
+    )
+    return row
+
+
+def _loan_row(position: int, loan: Dict[str, Any]) -> Dict[str, Any]:
+    active = loan.get("active")
+    return {
+        "position": position,
+        "customer_id": _raw(loan.get("customer_id")),
+        "lan": _raw(loan.get("lan")),
+        "type": _raw(loan.get("type")),
+        "zone": _raw(loan.get("zone")),
+        "status": _raw(loan.get("status")),
+        "outstanding": _number(loan.get("outstanding")),
+        "emi": _number(loan.get("emi")),
+        "active": active if isinstance(active, bool) else None,
+        "customer_key": normalize(loan.get("customer_id")),
+        "lan_key": normalize(loan.get("lan")),
+    }
+
+
+def _payment_row(position: int, payment: Dict[str, Any]) -> Dict[str, Any]:
+    due_at = parse_datetime(payment.get("due_date"))
+    return {
+        "position": position,
+        "payment_id": _raw(payment.get("payment_id")),
+        "customer_id": _raw(payment.get("customer_id")),
+        "lan": _raw(payment.get("lan")),
+        "payment_date": _raw(payment.get("payment_date")),
+        "due_date": _raw(payment.get("due_date")),
+        "amount_due": _number(payment.get("amount_due")),
+        "amount_paid": _number(payment.get("amount_paid")),
+        "status": _raw(payment.get("status")),
+        "payment_method": _raw(payment.get("payment_method")),
+        "due_month": due_at.strftime("%Y-%m") if due_at is not None else None,
+    }
+
+
+def _communication_row(position: int, comm: Dict[str, Any]) -> Dict[str, Any]:
+    row = {column: _raw(comm.get(field)) for field, column in Communication.FIELDS.items()}
+    sent_at = parse_datetime(comm.get("sent_time"))
+    row.update(
+        position=position,
+        customer_key=normalize(comm.get("customer_id")),
+        lan_key=normalize(comm.get("lan")),
+        sent_key=epoch_us(sent_at) if sent_at is not None else NO_SENT_TIME,
+        id_key=normalize(comm.get("id")),
+    )
+    return row
+
+
+_TABLES = [
+    ("customers.json", Customer, _customer_row),
+    ("loans.json", Loan, _loan_row),
+    ("payments.json", Payment, _payment_row),
+    ("communications.json", Communication, _communication_row),
+]
+
+
+def load_customer360_data(
+    data_path: Union[str, Path] = Setting.BASE_DATA_PATH,
+    bind: Engine = engine,
+    batch_size: int = _BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Replace the Customer360 tables with the contents of the JSON files in
+    data_path. Creates missing tables. Returns the row count per table.
+    A missing file leaves its table empty.
+    """
+    data_path = Path(data_path)
+    Base.metadata.create_all(bind=bind, tables=[model.__table__ for _, model, _ in _TABLES])
+    if bind.dialect.name == "postgresql":
+        # create_all skips existing tables: add the trigram indexes to ones created before them
+        with bind.begin() as conn:
+            conn.execute(PG_TRGM)
+            for index in TRIGRAM_INDEXES:
+                index.create(conn, checkfirst=True)
+
+    counts: Dict[str, int] = {}
+    with bind.begin() as conn:
+        for _, model, _ in reversed(_TABLES):
+            conn.execute(model.__table__.delete())
+
+        for filename, model, build_row in _TABLES:
+            path = data_path / filename
+            if not path.exists():
+                logger.warning(f"Data file not found: {path}")
+                counts[model.__tablename__] = 0
+                continue
+
+            counts[model.__tablename__] = _insert_file(conn, path, model.__table__, build_row, batch_size)
+            logger.info(f"Loaded {counts[model.__tablename__]} rows from {filename} into {model.__tablename__}")
+
+    return counts
+
+
+def _insert_file(
+    conn: Connection,
+    path: Path,
+    table: Table,
+    build_row: Callable[[int, Dict[str, Any]], Dict[str, Any]],
+    batch_size: int,
+) -> int:
+    position = 0
+    inserted = 0
+    try:
+        for batch in iter_json_batches(path, batch_size):
+            rows: List[Dict[str, Any]] = []
+            for record in batch:
+                if isinstance(record, dict):
+                    rows.append(build_row(position, record))
+                position += 1
+            if rows:
+                conn.execute(table.insert(), rows)
+                inserted += len(rows)
+    except DataLoadError as e:
+        raise DataLoadError(f"Failed to load {path.name}: {e}")
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load data/*.json into the Customer360 database tables")
+    parser.add_argument("--data-dir", type=Path, default=Setting.BASE_DATA_PATH)
+    parser.add_argument("--batch-size", type=int, default=_BATCH_SIZE)
+    args = parser.parse_args()
+    counts = load_customer360_data(args.data_dir, batch_size=args.batch_size)
+    print(", ".join(f"{table}: {rows}" for table, rows in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Customer360 Database Repository
+Same lookups as Customer360Repository, served from the customers / loans /
+payments / communications tables (CUSTOMER360_BACKEND=database; load them
+with database_loader). Lookups and what serves them:
+
+- customers:       customer_key / pan_key / mobile_key equality. Name,
+                   email and customer-list substring searches are
+                   LIKE '%...%' on the lowercased columns: served by pg_trgm
+                   GIN indexes on PostgreSQL (queries of 3+ characters),
+                   full table scans on SQLite
+- loans:           (customer_key, lan_key)
+- payments:        (customer_id, lan, due_month)
+- communications:  (customer_key, position) and the timeline index
+                   (customer_key, lan_key, sent_key, id_key)
+
+Records come back as dicts shaped like the JSON store's (to_record()), in
+file order (ORDER BY position), so the services behave the same on either
+backend. Runs on SQLite and PostgreSQL.
+"""
+
+from ...Database.config import session
+from ...Database.model.customer360_model import Communication, Customer, Loan, Payment
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+from .repository import TimelineKey, canonical_mobile, normalize
+
+
+_TIMELINE_CHUNK = 200
+
+
+class DatabaseTimeline:
+    """A loan's communications read newest first from the timeline index, in chunks"""
+
+    def __init__(self, session_factory: Callable[[], Session], customer_id: str, lan: str):
+        self._session = session_factory
+        self._customer_id = customer_id
+        self._lan = lan
+
+    def newest_first(self, before: Optional[TimelineKey] = None) -> Iterator[Tuple[TimelineKey, Dict[str, Any]]]:
+        """
+        (key, record) pairs newest first, only those with key < before if
+        given. A session is held per chunk only, so a slow consumer (an NDJSON
+        stream) doesn't pin a connection.
+        """
+        after: Optional[Tuple[int, str, int]] = None   # (sent_key, id_key, position) of the last row read
+        while True:
+            query = select(Communication).where(
+                Communication.customer_key == self._customer_id,
+                Communication.lan_key == self._lan,
+            )
+            if before is not None:
+                sent, comm_id = before
+                query = query.where(or_(
+                    Communication.sent_key < sent,
+                    and_(Communication.sent_key == sent, Communication.id_key < comm_id),
+                ))
+            if after is not None:
+                sent, comm_id, position = after
+                query = query.where(or_(
+                    Communication.sent_key < sent,
+                    and_(Communication.sent_key == sent, Communication.id_key < comm_id),
+                    and_(Communication.sent_key == sent, Communication.id_key == comm_id,
+                         Communication.position < position),
+                ))
+            query = query.order_by(
+                Communication.sent_key.desc(), Communication.id_key.desc(), Communication.position.desc()
+            ).limit(_TIMELINE_CHUNK)
+
+            with self._session() as db:
+                rows = db.scalars(query).all()
+                chunk = [((row.sent_key, row.id_key), row.to_record()) for row in rows]
+                if rows:
+                    after = (rows[-1].sent_key, rows[-1].id_key, rows[-1].position)
+
+            yield from chunk
+            if len(chunk) < _TIMELINE_CHUNK:
+                return
+
+
+class Customer360DatabaseRepository:
+
+    def __init__(self, session_factory: Callable[[], Session] = session):
+        self._session = session_factory
+
+    def _first(self, query) -> Optional[Dict[str, Any]]:
+        with self._session() as db:
+            row = db.scalars(query.limit(1)).first()
+            return row.to_record() if row is not None else None
+
+    def _all(self, query) -> List[Dict[str, Any]]:
+        with self._session() as db:
+            return [row.to_record() for row in db.scalars(query)]
+
+    # ── Customers ────────────────────────────────────────────────────────────
+
+    def has_customers(self) -> bool:
+        with self._session() as db:
+            return db.scalars(select(Customer.position).limit(1)).first() is not None
+
+    def get_customer(self, customer_id: str) -> Optional[Dict[str, Any]]:
+        """First customer whose customer_id equals customer_id exactly"""
+        return self._first(
+            select(Customer)
+            .where(Customer.customer_key == normalize(customer_id), Customer.customer_id == customer_id)
+            .order_by(Customer.position)
+        )
+
+    def find_customer(
+        self,
+        customer_id: Optional[str] = None,
+        name: Optional[str] = None,
+        mobile: Optional[str] = None,
+        email: Optional[str] = None,
+        pan: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        First customer (in file order) matching any given criterion:
+        customer_id / PAN (normalized equality), mobile (canonical equality),
+        name / email (case-insensitive substring).
+        """
+        criteria = []
+        if customer_id:
+            criteria.append(Customer.customer_key == normalize(customer_id))
+        if pan:
+            criteria.append(Customer.pan_key == normalize(pan))
+        if mobile:
+            criteria.append(Customer.mobile_key == canonical_mobile(mobile))
+        name_lower = name.lower().strip() if name else None
+        email_lower = email.lower().strip() if email else None
+        if name_lower:
+            criteria.append(Customer.name_lower.contains(name_lower, autoescape=True))
+        if email_lower:
+            criteria.append(Customer.email_lower.contains(email_lower, autoescape=True))
+        if not criteria:
+            return None
+
+        # One MIN(position) per criterion, so each can use its own index, instead of a single OR the planner may scan
+        with self._session() as db:
+            positions = [
+                db.scalar(select(func.min(Customer.position)).where(criterion))
+                for criterion in criteria
+            ]
+            positions = [position for position in positions if position is not None]
+            if not positions:
+                return None
+            return db.get(Customer, min(positions)).to_record()
+
+    def search_customers(self, query: Optional[str], offset: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        (page of customers in file order, total) where the lowercased query is
+        a substring of any customer-list search field (all customers if None)
+        """
+        condition = Customer.search_text.contains(query, autoescape=True) if query else None
+        page = select(Customer).order_by(Customer.position).offset(offset).limit(limit)
+        count = select(func.count()).select_from(Customer)
+        if condition is not None:
+            page = page.where(condition)
+            count = count.where(condition)
+        with self._session() as db:
+            return [row.to_record() for row in db.scalars(page)], db.scalar(count)
+
+    def count_customers(self, query: Optional[str]) -> int:
+        count = select(func.count()).select_from(Customer)
+        if query:
+            count = count.where(Customer.search_text.contains(query, autoescape=True))
+        with self._session() as db:
+            return db.scalar(count)
+
+    def customers_after(
+        self,
+        query: Optional[str],
+        key: Optional[Tuple[str, int]],
+        limit: int,
+    ) -> Tuple[List[Tuple[Dict[str, Any], Tuple[str, int]]], bool]:
+        """
+        Up to limit (customer, keyset key) pairs matching query, ordered by
+        (customer_id, position) after key, and whether more follow
+        """
+        page = select(Customer).order_by(Customer.customer_id, Customer.position).limit(limit + 1)
+        if query:
+            page = page.where(Customer.search_text.contains(query, autoescape=True))
+        if key is not None:
+            customer_id, position = key
+            page = page.where(or_(
+                Customer.customer_id > customer_id,
+                and_(Customer.customer_id == customer_id, Customer.position > position),
+            ))
+        with self._session() as db:
+            rows = db.scalars(page).all()
+            customers = [(row.to_record(), (row.customer_id or "", row.position)) for row in rows[:limit]]
+        return customers, len(rows) > limit
+
+    # ── Loans ────────────────────────────────────────────────────────────────
+
+    def get_loans(self, customer_id: str, exact: bool = True) -> List[Dict[str, Any]]:
+        """
+        Loans of a customer in file order. exact: the raw customer_id must
+        equal customer_id; otherwise compared normalized.
+        """
+        query = select(Loan).where(Loan.customer_key == normalize(customer_id))
+        if exact:
+            query = query.where(Loan.customer_id == customer_id)
+        return self._all(query.order_by(Loan.position))
+
+    def get_loan(self, customer_id: str, lan: str) -> Optional[Dict[str, Any]]:
+        """First loan whose customer_id and lan equal the given ones exactly"""
+        return self._first(
+            select(Loan)
+            .where(
+                Loan.customer_key == normalize(customer_id), Loan.lan_key == normalize(lan),
+                Loan.customer_id == customer_id, Loan.lan == lan,
+            )
+            .order_by(Loan.position)
+        )
+
+    # ── Payments ─────────────────────────────────────────────────────────────
+
+    def get_payments(self, customer_id: str, lan: str) -> List[Dict[str, Any]]:
+        """Payments whose customer_id and lan equal the given ones exactly, in file order"""
+        return self._all(
+            select(Payment)
+            .where(Payment.customer_id == customer_id, Payment.lan == lan)
+            .order_by(Payment.position)
+        )
+
+    def get_payments_by_month(self, customer_id: str, lan: str) -> Dict[str, Dict[str, Any]]:
+        """
+        {"YYYY-MM": payment} for a loan (exact customer_id and lan): the first
+        payment in file order whose due_date falls in that month
+        """
+        payments = self._all(
+            select(Payment)
+            .where(Payment.customer_id == customer_id, Payment.lan == lan, Payment.due_month.is_not(None))
+            .order_by(Payment.position)
+        )
+        months: Dict[str, Dict[str, Any]] = {}
+        for payment in payments:
+            months.setdefault(payment["due_month"], payment)
+        return months
+
+    # ── Communications ───────────────────────────────────────────────────────
+
+    def get_communications(
+        self,
+        customer_id: str,
+        lans: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Communications whose normalized customer_id equals customer_id, in
+        file order; only those whose normalized lan is in lans, if given.
+        """
+        query = select(Communication).where(Communication.customer_key == customer_id)
+        if lans is not None:
+            lan_list = list(set(lans))
+            if not lan_list:
+                return []
+            query = query.where(Communication.lan_key.in_(lan_list))
+        return self._all(query.order_by(Communication.position))
+
+    def get_timeline(self, customer_id: str, lan: str) -> DatabaseTimeline:
+        """Communications of a loan (normalized customer_id and lan) by (sent time, id)"""
+        return DatabaseTimeline(self._session, customer_id, lan)
+
+
+def get_customer360_database_repository() -> Customer360DatabaseRepository:
+    return Customer360DatabaseRepository(session)
@@ -1,58 +1,66 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import datetime, date
-from ...core.config import Setting
-import json
-from typing import Dict, Any, List
+from datetime import date
+from .repository import Customer360Repository, get_customer360_repository
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+
+DEFAULT_LOOKBACK_MONTHS = 6
+MAX_LOOKBACK_MONTHS = 360   # 30-year tenure
+
+
+def _month_index(day: date) -> int:
+    """Months since year 0, so month arithmetic is plain integer arithmetic"""
+    return day.year * 12 + day.month - 1
+
+
+def _month_start(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
 
 
 class PaymentBehaviourService:
     
-    def _load_customers(self) -> List[Dict[str, Any]]:
-        path = Setting.BASE_DATA_PATH / "customers.json"
-        if not path.is_file():
-            logger.warning(f"Customers file not found: {path}")
-            return []
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except Exception as e:
-            logger.error(f"Failed to load customers: {e}")
-            return []
-
-    def _load_loans(self) -> List[Dict[str, Any]]:
-        path = Setting.BASE_DATA_PATH / "loans.json"
-        if not path.is_file():
-            logger.warning(f"Loans file not found: {path}")
-            return []
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except Exception as e:
-            logger.error(f"Failed to load loans: {e}")
-            return []
-
-    def _load_payments(self) -> List[Dict[str, Any]]:
-        path = Setting.BASE_DATA_PATH / "payments.json"
-        if not path.is_file():
-            logger.warning(f"Payments file not found: {path}")
-            return []
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except Exception as e:
-            logger.error(f"Failed to load payments: {e}")
-            return []
+    def _repository(self) -> Customer360Repository:
+        # Payments are indexed per loan by due month (pre-parsed at load)
+        return get_customer360_repository()
+
+    def _month_window(
+        self,
+        months: int,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        today: date
+    ) -> Tuple[int, int]:
+        """
+        (first, last) month index of the requested window:
+        - to_date's month (default: current month) is the last month
+        - from_date's month is the first; without it, `months` back from the last
+        """
+        if not 1 <= months <= MAX_LOOKBACK_MONTHS:
+            raise ValueError(f"months must be between 1 and {MAX_LOOKBACK_MONTHS}")
+
+        last = _month_index(to_date) if to_date else _month_index(today)
+        first = _month_index(from_date) if from_date else last - months + 1
+        if first > last:
+            raise ValueError("from_date must not be after to_date")
+        if last - first + 1 > MAX_LOOKBACK_MONTHS:
+            raise ValueError(f"Date range must not span more than {MAX_LOOKBACK_MONTHS} months")
+        return first, last
 
     def get_payment_behaviour(
         self,
         customer_id: str,
-        lan: str
+        lan: str,
+        months: int = DEFAULT_LOOKBACK_MONTHS,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
     ) -> Dict[str, Any]:
-
+        """
+        Customer + loan summary + EMI history for a window of months
+        (oldest → newest): the last `months` months up to the current month by
+        default, or the months from from_date to to_date. Each month is an
+        O(1) lookup, so the cost follows the window, not the payment count.
+        """
         cust_id_clean = customer_id.strip()
         lan_clean = lan.strip()
 
@@ -61,25 +69,19 @@ class PaymentBehaviourService:
         if not lan_clean:
             raise ValueError("lan is required")
 
+        today = date.today()
+        first_month, last_month = self._month_window(months, from_date, to_date, today)
+
         try:
-            customers = self._load_customers()
-            loans     = self._load_loans()
-            payments  = self._load_payments()
+            repository = self._repository()
 
             # Find customer
-            customer = next(
-                (c for c in customers if c.get("customer_id") == cust_id_clean),
-                None
-            )
+            customer = repository.get_customer(cust_id_clean)
             if not customer:
                 return {"customer": None, "loan": None, "payment_behaviour": {}}
 
             # Find the specific loan
-            loan = next(
-                (l for l in loans
-                 if l.get("customer_id") == cust_id_clean and l.get("lan") == lan_clean),
-                None
-            )
+            loan = repository.get_loan(cust_id_clean, lan_clean)
             if not loan:
                 return {
                     "customer": {
@@ -98,32 +100,20 @@ class PaymentBehaviourService:
 
             expected_emi = loan.get("emi", 0.0)
 
-            # Get payments for this loan
+            # Payments for this loan, by due_date month
             # FIX: Don't filter by payment_date — missed payments have payment_date: null
-            relevant_payments = [
-                p for p in payments
-                if p.get("customer_id") == cust_id_clean
-                and p.get("lan") == lan_clean
-            ]
+            payments_by_month = repository.get_payments_by_month(cust_id_clean, lan_clean)
 
-            # Generate last 6 months (from current month backward)
-            today = date.today()
-            last_6_months = []
-            missed_count  = 0
-            current_month = today
+            current_month = _month_index(today)
+            emis = []
+            missed_count = 0
 
-            for i in range(6):
-                month_key = current_month.strftime("%Y-%m")
+            for month in range(first_month, last_month + 1):
+                month_date = _month_start(month)
+                month_key  = month_date.strftime("%Y-%m")
 
                 # FIX: Match payment by due_date month (not payment_date, which can be null)
-                month_payment = next(
-                    (
-                        p for p in relevant_payments
-                        if p.get("due_date") and
-                        datetime.fromisoformat(p["due_date"]).strftime("%Y-%m") == month_key
-                    ),
-                    None
-                )
+                month_payment = payments_by_month.get(month_key)
 
                 # FIX: Use status field directly from JSON
                 if month_payment:
@@ -133,8 +123,7 @@ class PaymentBehaviourService:
                     missed         = payment_status == "Missed"
                 else:
                     # No payment record found for this month
-                    month_date  = date(current_month.year, current_month.month, 1)
-                    is_past     = month_date < date(today.year, today.month, 1)
+                    is_past        = month < current_month
                     payment_status = "Missed" if is_past else "Pending"
                     amount_paid    = 0.0
                     amount_due     = expected_emi
@@ -143,7 +132,7 @@ class PaymentBehaviourService:
                 if missed:
                     missed_count += 1
 
-                last_6_months.append({
+                emis.append({
                     "month"         : month_key,
                     "due_date"      : month_payment.get("due_date")      if month_payment else None,
                     "payment_date"  : month_payment.get("payment_date")  if month_payment else None,
@@ -154,15 +143,14 @@ class PaymentBehaviourService:
                     "missed"        : missed
                 })
 
-                # Move to previous month
-                if current_month.month == 1:
-                    current_month = current_month.replace(year=current_month.year - 1, month=12)
-                else:
-                    current_month = current_month.replace(month=current_month.month - 1)
-
-            last_6_months.reverse()  # oldest → newest
-
-            missed_note = f"{missed_count} missed payment{'s' if missed_count != 1 else ''} in last 6 months"
+            window_size = last_month - first_month + 1
+            from_month  = _month_start(first_month).strftime("%Y-%m")
+            to_month    = _month_start(last_month).strftime("%Y-%m")
+            plural      = 's' if missed_count != 1 else ''
+            if from_date is None and to_date is None:
+                missed_note = f"{missed_count} missed payment{plural} in last {window_size} months"
+            else:
+                missed_note = f"{missed_count} missed payment{plural} between {from_month} and {to_month}"
 
             result = {
                 "customer": {
@@ -185,7 +173,11 @@ class PaymentBehaviourService:
                     "active"     : loan.get("active", True)
                 },
                 "payment_behaviour": {
-                    "last_6_emis" : last_6_months,
+                    "emis"        : emis,
+                    "last_6_emis" : emis[-6:],  # kept for older clients
+                    "months"      : window_size,
+                    "from_month"  : from_month,
+                    "to_month"    : to_month,
                     "missed_count": missed_count,
                     "missed_note" : missed_note
                 }
@@ -204,6 +196,37 @@ class PaymentBehaviourService:
             logger.error(f"Critical error in payment_behaviour: {e}", exc_info=True)
             raise CalculationError(f"Failed to fetch payment behaviour: {str(e)}")
 
+    def get_payment_behaviour_batch(
+        self,
+        loans: Iterable[Tuple[str, str]],
+        months: int = DEFAULT_LOOKBACK_MONTHS,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        get_payment_behaviour for many (customer_id, lan) pairs with one window.
+        Results are keyed customer_id → lan → behaviour (None when the customer
+        or loan doesn't exist). Each pair is an index lookup, so the cost follows
+        the number of pairs times the window, not the size of the data files.
+        """
+        pairs = [(customer_id.strip(), lan.strip()) for customer_id, lan in loans]
+        if any(not customer_id or not lan for customer_id, lan in pairs):
+            raise ValueError("Every entry needs a customer_id and a lan")
+        self._month_window(months, from_date, to_date, date.today())
+
+        results: Dict[str, Dict[str, Optional[Dict[str, Any]]]] = {}
+        for customer_id, lan in pairs:
+            by_lan = results.setdefault(customer_id, {})
+            if lan in by_lan:
+                continue
+            behaviour = self.get_payment_behaviour(customer_id, lan, months, from_date, to_date)
+            by_lan[lan] = behaviour if behaviour["customer"] is not None and behaviour["loan"] is not None else None
+
+        requested = sum(len(by_lan) for by_lan in results.values())
+        found = sum(1 for by_lan in results.values() for behaviour in by_lan.values() if behaviour is not None)
+        logger.info(f"payment-behaviour batch: {found}/{requested} loans found")
+        return {"results": results, "requested": requested, "found": found}
+
 
 def get_payment_behaviour_service() -> PaymentBehaviourService:
     return PaymentBehaviourService()
\ No newline at end of file
@@ -1,53 +1,14 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from ...core.config import Setting
-import json
-from typing import Dict, Any, Optional, List
+from .repository import Customer360Repository, get_customer360_repository
+from typing import Dict, Any, Optional
 
 
 class CustomerByIdService:
     
-    def _load_customers(self) -> List[Dict[str, Any]]:
-        """Load customers from JSON file"""
-        path = Setting.BASE_DATA_PATH / "customers.json"
-        if not path.is_file():
-            logger.warning(f"Customers file not found: {path}")
-            return []
-        
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                logger.error("Customers data is not a list")
-                return []
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in customers.json: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load customers: {e}", exc_info=True)
-            return []
-
-    def _load_loans(self) -> List[Dict[str, Any]]:
-        """Load loans from JSON file"""
-        path = Setting.BASE_DATA_PATH / "loans.json"
-        if not path.is_file():
-            logger.warning(f"Loans file not found: {path}")
-            return []
-        
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if not isinstance(data, list):
-                logger.error("Loans data is not a list")
-                return []
-            return data
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in loans.json: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load loans: {e}", exc_info=True)
-            return []
+    def _repository(self) -> Customer360Repository:
+        """Indexed customer / loan lookups (indexes built once per file version)"""
+        return get_customer360_repository()
 
     def get_customer_by_id(self, customer_id: str) -> Dict[str, Any]:
         """
@@ -59,19 +20,14 @@ class CustomerByIdService:
             raise ValueError("customer_id is required and cannot be empty")
 
         try:
-            customers = self._load_customers()
-            loans = self._load_loans()
+            repository = self._repository()
 
-            if not customers:
+            if not repository.has_customers():
                 logger.info("No customers found in file")
                 return {"customer": None, "loans": []}
 
             # Find customer by exact ID
-            customer = None
-            for cust in customers:
-                if cust.get("customer_id") == customer_id.strip():
-                    customer = cust
-                    break
+            customer = repository.get_customer(customer_id.strip())
 
             if not customer:
                 logger.info(f"No customer found with ID: {customer_id}")
@@ -88,8 +44,7 @@ class CustomerByIdService:
                     "emi": l.get("emi", 0.0),
                     "active": l.get("active", True)
                 }
-                for l in loans
-                if l.get("customer_id") == customer_id
+                for l in repository.get_loans(customer_id)
             ]
 
             result = {
@@ -0,0 +1,251 @@
+"""
+Customer360 Repository
+Keyed lookups over the customer data files, so single-customer endpoints cost
+O(1) plus the size of their result instead of a scan of every file:
+
+- customers:       by customer_id, PAN and canonical mobile (name / email
+                   substring matches go through the trigram search index)
+- loans:           by customer_id and by (customer_id, lan)
+- payments:        by (customer_id, lan), and per loan by due month
+- communications:  by customer_id and by (customer_id, lan), and per loan
+                   as a timeline sorted by (sent time, id)
+
+Index keys are normalized (str + strip; mobile also drops "+91" and spaces).
+Methods documented as exact re-check the raw field values on the indexed
+candidates, so they match the same records the old equality scans did.
+Every index is built by CustomerDataStore once per file version.
+
+get_customer360_repository() returns the database-backed equivalent
+(database_repository.py) when CUSTOMER360_BACKEND is "database".
+"""
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+from ...core.config import Setting
+from .customer_data import CustomerDataStore, get_customer_data_store
+
+
+def normalize(value: Any) -> str:
+    """Field value as a stripped string ("" for None)"""
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def canonical_mobile(value: Any) -> str:
+    """Mobile number without the +91 prefix and spaces"""
+    return normalize(value).replace("+91", "").replace(" ", "")
+
+
+class KeyIndex:
+    """Rows of a record list grouped by key, each group in file order"""
+
+    def __init__(self, records: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], Hashable]):
+        self.records = records
+        self._rows: Dict[Hashable, List[int]] = {}
+        for row, record in enumerate(records):
+            if isinstance(record, dict):
+                self._rows.setdefault(key(record), []).append(row)
+
+    def rows(self, key: Hashable) -> List[int]:
+        return self._rows.get(key, [])
+
+    def get(self, key: Hashable) -> List[Dict[str, Any]]:
+        records = self.records
+        return [records[row] for row in self._rows.get(key, [])]
+
+
+def _by(*fields: str) -> Callable[[List[Dict[str, Any]]], KeyIndex]:
+    """Builder of a KeyIndex on the normalized values of fields"""
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda records: KeyIndex(records, lambda record: normalize(record.get(field)))
+    return lambda records: KeyIndex(records, lambda record: tuple(normalize(record.get(f)) for f in fields))
+
+
+def _by_mobile(records: List[Dict[str, Any]]) -> KeyIndex:
+    return KeyIndex(records, lambda record: canonical_mobile(record.get("mobile")))
+
+
+def _by_loan_month(payments: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Dict[str, Dict[str, Any]]]:
+    """
+    {(customer_id, lan): {due_month: first payment due that month}} keyed on
+    the raw string values, so lookups are exact like get_payments()
+    """
+    months: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+    for payment in payments:
+        if not isinstance(payment, dict):
+            continue
+        customer_id, lan, due_month = payment.get("customer_id"), payment.get("lan"), payment.get("due_month")
+        if isinstance(customer_id, str) and isinstance(lan, str) and due_month:
+            months.setdefault((customer_id, lan), {}).setdefault(due_month, payment)
+    return months
+
+
+# Sorts communications without a (valid) sent_time after every dated one
+NO_SENT_TIME = -(2 ** 63)
+
+TimelineKey = Tuple[int, str]
+
+
+class Timeline:
+    """
+    Communications of one loan sorted by (sent_epoch_us, id), read newest
+    first. Keys are unique per record unless ids repeat within a loan.
+    """
+
+    def __init__(self, entries: List[Tuple[TimelineKey, Dict[str, Any]]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.keys: List[TimelineKey] = [key for key, _ in entries]
+        self.records: List[Dict[str, Any]] = [record for _, record in entries]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def newest_first(self, before: Optional[TimelineKey] = None) -> Iterator[Tuple[TimelineKey, Dict[str, Any]]]:
+        """(key, record) pairs newest first, only those with key < before if given"""
+        end = bisect_left(self.keys, before) if before is not None else len(self.keys)
+        for pos in range(end - 1, -1, -1):
+            yield self.keys[pos], self.records[pos]
+
+
+def timeline_key(communication: Dict[str, Any]) -> TimelineKey:
+    sent = communication.get("sent_epoch_us")
+    return (sent if sent is not None else NO_SENT_TIME), normalize(communication.get("id"))
+
+
+def _by_loan_timeline(communications: List[Dict[str, Any]]) -> Dict[Tuple[str, str], Timeline]:
+    """{(customer_id, lan): Timeline} on normalized customer_id / lan"""
+    entries: Dict[Tuple[str, str], List[Tuple[TimelineKey, Dict[str, Any]]]] = {}
+    for comm in communications:
+        if isinstance(comm, dict):
+            loan = (normalize(comm.get("customer_id")), normalize(comm.get("lan")))
+            entries.setdefault(loan, []).append((timeline_key(comm), comm))
+    return {loan: Timeline(loan_entries) for loan, loan_entries in entries.items()}
+
+
+_EMPTY_TIMELINE = Timeline([])
+
+
+class Customer360Repository:
+
+    def __init__(self, store: CustomerDataStore):
+        self._store = store
+
+    def _index(self, filename: str, name: str, build: Callable[[List[Dict[str, Any]]], Any]) -> Any:
+        return self._store.index(filename, name, build)
+
+    # ── Customers ────────────────────────────────────────────────────────────
+
+    def has_customers(self) -> bool:
+        return bool(self._store.get_customers())
+
+    def get_customer(self, customer_id: str) -> Optional[Dict[str, Any]]:
+        """First customer whose customer_id equals customer_id exactly"""
+        candidates = self._index("customers.json", "customer_id", _by("customer_id")).get(normalize(customer_id))
+        return next((c for c in candidates if c.get("customer_id") == customer_id), None)
+
+    def find_customer(
+        self,
+        customer_id: Optional[str] = None,
+        name: Optional[str] = None,
+        mobile: Optional[str] = None,
+        email: Optional[str] = None,
+        pan: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        First customer (in file order) matching any given criterion:
+        customer_id / PAN (normalized equality), mobile (canonical equality),
+        name / email (case-insensitive substring).
+        """
+        rows: List[int] = []
+        if customer_id:
+            rows += self._index("customers.json", "customer_id", _by("customer_id")).rows(normalize(customer_id))[:1]
+        if pan:
+            rows += self._index("customers.json", "pan", _by("pan")).rows(normalize(pan))[:1]
+        if mobile:
+            rows += self._index("customers.json", "mobile", _by_mobile).rows(canonical_mobile(mobile))[:1]
+
+        name_lower = name.lower().strip() if name else None
+        email_lower = email.lower().strip() if email else None
+        if name_lower or email_lower:
+            search = self._store.get_customer_search_index()
+            if name_lower:
+                rows += search.search(name_lower, fields=("name",))[:1]
+            if email_lower:
+                rows += search.search(email_lower, fields=("email",))[:1]
+
+        if not rows:
+            return None
+        return self._store.get_customers()[min(rows)]
+
+    # ── Loans ────────────────────────────────────────────────────────────────
+
+    def get_loans(self, customer_id: str, exact: bool = True) -> List[Dict[str, Any]]:
+        """
+        Loans of a customer in file order. exact: the raw customer_id must
+        equal customer_id; otherwise compared normalized.
+        """
+        loans = self._index("loans.json", "customer_id", _by("customer_id")).get(normalize(customer_id))
+        if exact:
+            loans = [l for l in loans if l.get("customer_id") == customer_id]
+        return loans
+
+    def get_loan(self, customer_id: str, lan: str) -> Optional[Dict[str, Any]]:
+        """First loan whose customer_id and lan equal the given ones exactly"""
+        candidates = self._index("loans.json", "customer_lan", _by("customer_id", "lan")).get(
+            (normalize(customer_id), normalize(lan))
+        )
+        return next(
+            (l for l in candidates if l.get("customer_id") == customer_id and l.get("lan") == lan),
+            None
+        )
+
+    # ── Payments ─────────────────────────────────────────────────────────────
+
+    def get_payments(self, customer_id: str, lan: str) -> List[Dict[str, Any]]:
+        """Payments whose customer_id and lan equal the given ones exactly, in file order"""
+        candidates = self._index("payments.json", "customer_lan", _by("customer_id", "lan")).get(
+            (normalize(customer_id), normalize(lan))
+        )
+        return [p for p in candidates if p.get("customer_id") == customer_id and p.get("lan") == lan]
+
+    def get_payments_by_month(self, customer_id: str, lan: str) -> Dict[str, Dict[str, Any]]:
+        """
+        {"YYYY-MM": payment} for a loan (exact customer_id and lan): the first
+        payment in file order whose due_date falls in that month
+        """
+        return self._index("payments.json", "loan_month", _by_loan_month).get((customer_id, lan), {})
+
+    # ── Communications ───────────────────────────────────────────────────────
+
+    def get_communications(
+        self,
+        customer_id: str,
+        lans: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Communications whose normalized customer_id equals customer_id, in
+        file order; only those whose normalized lan is in lans, if given.
+        """
+        if lans is None:
+            return self._index("communications.json", "customer_id", _by("customer_id")).get(customer_id)
+
+        index = self._index("communications.json", "customer_lan", _by("customer_id", "lan"))
+        lan_set: Set[str] = set(lans)
+        rows = sorted(row for lan in lan_set for row in index.rows((customer_id, lan)))
+        return [index.records[row] for row in rows]
+
+    def get_timeline(self, customer_id: str, lan: str) -> Timeline:
+        """Communications of a loan (normalized customer_id and lan) by (sent time, id)"""
+        timelines = self._index("communications.json", "loan_timeline", _by_loan_timeline)
+        return timelines.get((customer_id, lan), _EMPTY_TIMELINE)
+
+
+def get_customer360_repository() -> Customer360Repository:
+    """Repository of the configured backend (Setting.CUSTOMER360_BACKEND)"""
+    if Setting.CUSTOMER360_BACKEND == "database":
+        # Imported here: the database repository builds on this module
+        from .database_repository import get_customer360_database_repository
+        return get_customer360_database_repository()
+    return Customer360Repository(get_customer_data_store())
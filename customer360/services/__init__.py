@@ -5,10 +5,13 @@ from .token_service import TokenService
 
 from .CommunicationTimeline import CustomerDetailsService
 
+from .Customer360_services import Customer360Repository, get_customer360_repository
+from .Customer360_services import Customer360DatabaseRepository, load_customer360_data
 from .Customer360_services import CustomerListService
 from .Customer360_services import CustomerByIdService
 from .Customer360_services import PaymentBehaviourService
 
+from .dashboard_services import MessageStore, get_message_store
 from .dashboard_services import MessageService
 from .dashboard_services import AverageResolutionTime
 from .dashboard_services import FailedMessage
@@ -21,9 +24,12 @@ from .dashboard_services import DeliveryStatusService
 from .dashboard_services import VolumeTrendsService
 from .dashboard_services import TopIssuesService
 from .dashboard_services import ResolutionTimeTrendService
+from .dashboard_services import DashboardSnapshotService
 
 
 __all__ = [
+           MessageStore,
+           get_message_store,
            MessageService,
            AverageResolutionTime,
            FailedMessage,
@@ -36,7 +42,12 @@ __all__ = [
            VolumeTrendsService,
            TopIssuesService,
            ResolutionTimeTrendService,
+           DashboardSnapshotService,
            
+           Customer360Repository,
+           get_customer360_repository,
+           Customer360DatabaseRepository,
+           load_customer360_data,
            CustomerListService,
            PaymentBehaviourService,
            CustomerByIdService ,
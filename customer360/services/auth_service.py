@@ -1,30 +1,38 @@
 from typing import  Optional , Annotated 
 from fastapi import Depends
 
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from ..utils.exceptions import DatabaseError , EmployeeNotFoundError , InvalidCredentialsError  , AuthenticationError
-from ..Database.session import get_db
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from ..utils.exceptions import DatabaseError , EmployeeNotFoundError , InvalidCredentialsError  , AuthenticationError , ExecutorBusyError
+from ..Database.session import get_async_db
 from ..schemas.model import CreateUserRequest
 from ..Database.model.db_model import EmployeeCreate
 from ..core.security import Hashing
+from ..core.executors import password_executor
 from ..utils.logger import logger
 
-db_dependency = Annotated[Session, Depends(get_db)]
+async_db_dependency = Annotated[AsyncSession, Depends(get_async_db)]
 
 
 # ==================== Authentication Service ====================
 class AuthenticationService:
-    """Handles authentication logic"""
-
-    def __init__(self, db: Session):
+    """
+    Handles authentication logic on an AsyncSession, so database round trips
+    don't block the event loop. bcrypt runs on the bounded password executor
+    for the same reason; when its queue is full ExecutorBusyError propagates
+    to the caller.
+    """
+
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def get_employee_by_email(self, email: str) -> Optional[EmployeeCreate]:
+    async def get_employee_by_email(self, email: str) -> Optional[EmployeeCreate]:
         try:
-            employee = self.db.query(EmployeeCreate).filter(
-                EmployeeCreate.Emp_email == email
-            ).first()
+            result = await self.db.execute(
+                select(EmployeeCreate).where(EmployeeCreate.Emp_email == email).limit(1)
+            )
+            employee = result.scalars().first()
 
             if employee:
                 logger.info(f"Employee found: {email}")
@@ -37,22 +45,23 @@ class AuthenticationService:
             logger.error(f"Database error while fetching employee: {str(e)}")
             raise DatabaseError(f"Failed to retrieve employee: {str(e)}")
 
-    def authenticate(self, email: str, password: str) -> EmployeeCreate:
+    async def authenticate(self, email: str, password: str) -> EmployeeCreate:
         try:
-            employee = self.get_employee_by_email(email)
+            employee = await self.get_employee_by_email(email)
 
             if not employee:
                 logger.warning(f"Authentication failed: Employee not found - {email}")
                 raise EmployeeNotFoundError(f"No employee found with email: {email}")
 
-            if not Hashing.verify_password(password, employee.hashed_pass):
+            if not await password_executor.run(Hashing.verify_password, password, employee.hashed_pass):
                 logger.warning(f"Authentication failed: Invalid password for {email}")
                 raise InvalidCredentialsError("Invalid password")
 
             logger.info(f"Employee authenticated successfully: {email}")
+            await self._rehash_if_needed(employee, password)
             return employee
 
-        except (EmployeeNotFoundError, InvalidCredentialsError):
+        except (EmployeeNotFoundError, InvalidCredentialsError, ExecutorBusyError):
             raise
         except Exception as e:
             logger.error(f"Authentication error: {str(e)}")
@@ -60,14 +69,44 @@ class AuthenticationService:
 
 
 
-    def create_employee(self, employee_data: CreateUserRequest) -> EmployeeCreate:
+    async def _rehash_if_needed(self, employee: EmployeeCreate, password: str) -> None:
+        """
+        Re-hash a just-verified password stored at another bcrypt cost than
+        the current one (Hashing.rounds()). Best effort: the login succeeds
+        even if the upgrade fails, and the next login tries again.
+        Skipped while the hashing executor is busy, so during a login storm
+        every bcrypt slot goes to verifying passwords.
+        The new hash is written by an UPDATE on a session of its own: a
+        failure rolls back only that session, and `employee` (still needed
+        by the caller) is never expired.
+        """
+        if not Hashing.needs_rehash(employee.hashed_pass):
+            return
+        emp_id, email = employee.Emp_id, employee.Emp_email
+        if password_executor.busy():
+            logger.info(f"Password rehash of {email} deferred: hashing executor busy")
+            return
+        try:
+            hashed = await password_executor.run(Hashing.hash_password, password)
+            async with AsyncSession(self.db.bind) as upgrade_db:
+                await upgrade_db.execute(
+                    update(EmployeeCreate).where(EmployeeCreate.Emp_id == emp_id).values(hashed_pass=hashed)
+                )
+                await upgrade_db.commit()
+            logger.info(f"Password hash of {email} updated to cost {Hashing.rounds()}")
+        except ExecutorBusyError:
+            logger.info(f"Password rehash of {email} deferred: hashing queue full")
+        except Exception as e:
+            logger.warning(f"Password rehash failed for {email}: {str(e)}")
+
+    async def create_employee(self, employee_data: CreateUserRequest) -> EmployeeCreate:
         try:
-            existing_emp = self.get_employee_by_email(employee_data.Emp_email)
+            existing_emp = await self.get_employee_by_email(employee_data.Emp_email)
             if existing_emp:
                 logger.warning(f"Employee already exists: {employee_data.Emp_email}")
                 raise DatabaseError("Employee with this email already exists")
 
-            hashed_password = Hashing.hash_password(employee_data.password)
+            hashed_password = await password_executor.run(Hashing.hash_password, employee_data.password)
 
             employee = EmployeeCreate(
                 Emp_email=employee_data.Emp_email,
@@ -75,25 +114,30 @@ class AuthenticationService:
             )
 
             self.db.add(employee)
-            self.db.commit()
-            self.db.refresh(employee)
+            await self.db.commit()
+            await self.db.refresh(employee)
 
             logger.info(f"Employee created successfully: {employee_data.Emp_email}")
             return employee
 
-        except DatabaseError:
+        except (DatabaseError, ExecutorBusyError):
             raise
+        except IntegrityError as e:
+            # A concurrent registration of the same email won the race
+            await self.db.rollback()
+            logger.warning(f"Employee already exists: {employee_data.Emp_email}")
+            raise DatabaseError("Employee with this email already exists")
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Database error during employee creation: {str(e)}")
             raise DatabaseError(f"Failed to create employee: {str(e)}")
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(f"Unexpected error during employee creation: {str(e)}")
             raise DatabaseError(f"Employee creation failed: {str(e)}")
 
 
 
-def get_auth_service(db: db_dependency) -> AuthenticationService:
+def get_auth_service(db: async_db_dependency) -> AuthenticationService:
         """Dependency to get authentication service instance"""
         return AuthenticationService(db)
\ No newline at end of file
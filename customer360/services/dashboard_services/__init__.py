@@ -1,4 +1,6 @@
 
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
 from .message_service import MessageService
 from .avg_resolution_time import AverageResolutionTime
 from .failed_message import FailedMessage
@@ -11,8 +13,13 @@ from .delivery_status import DeliveryStatusService
 from .message_volume_trends import VolumeTrendsService
 from .top_issues_service import TopIssuesService
 from .resolution_time_trend_service import ResolutionTimeTrendService
+from .dashboard_snapshot import DashboardSnapshotService
 
 __all__ = [
+           MessageStore,
+           get_message_store,
+           MessageAggregates,
+           get_message_aggregates,
            MessageService,
            AverageResolutionTime,
            FailedMessage,
@@ -23,4 +30,5 @@ __all__ = [
            DeliveryStatusService,
            VolumeTrendsService,
            TopIssuesService,
-           ResolutionTimeTrendService]
\ No newline at end of file
+           ResolutionTimeTrendService,
+           DashboardSnapshotService]
\ No newline at end of file
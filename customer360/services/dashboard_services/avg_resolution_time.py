@@ -1,39 +1,18 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from typing import List
-from datetime import date, datetime
-from ...core.config import Setting
-import json
+from typing import Optional
+from datetime import date
+from .message_store import MessageStore, get_message_store
+from .message_columns import MessageColumns, masked_mean
 
 class AverageResolutionTime:
     
-    def _get_today_messages(self):
-        """Load messages from JSON file and filter by today's date"""
-        try:
-            if not Setting.MESSAGES_JSON_PATH.is_file():
-                logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-                return []
-            
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    return []
-                
-                today = date.today()
-                today_messages = []
-                for msg in data:
-                    try:
-                        datetime_str = msg.get("datetime")
-                        if datetime_str:
-                            msg_datetime = datetime.fromisoformat(datetime_str)
-                            if msg_datetime.date() == today:
-                                today_messages.append(msg)
-                    except (ValueError, TypeError):
-                        continue
-                return today_messages
-        except Exception as e:
-            logger.error(f"Error loading messages: {str(e)}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None):
+        self.store = store or get_message_store()
+
+    def _get_today_columns(self) -> MessageColumns:
+        """Columns holding only today's messages"""
+        return self.store.get_day_columns(date.today())
 
     def get_avg_resolution_time(self) -> float:
         """
@@ -43,17 +22,12 @@ class AverageResolutionTime:
             Float rounded to 1 decimal
         """
         try:
-            messages = self._get_today_messages()
-            times: List[float] = [
-                msg["resolution_time_seconds"]
-                for msg in messages
-                if msg.get("resolved") and isinstance(msg.get("resolution_time_seconds"), (int, float))
-            ]
+            columns = self._get_today_columns()
+            avg = masked_mean(columns.resolution_time, columns.resolved)
 
-            if not times:
+            if avg is None:
                 return 0.0
 
-            avg = sum(times) / len(times)
             return round(avg, 1)
 
         except Exception as e:
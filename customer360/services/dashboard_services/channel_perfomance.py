@@ -6,32 +6,53 @@ Supports sorting by volume or delivery_rate
 
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import datetime
-import json
-from ...core.config import Setting
+from typing import Any, List, Optional, Tuple
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
+import numpy as np
 
 
 class ChannelPerformanceService:
     
-    def _get_all_messages(self):
-        """Load all messages from JSON file"""
-        try:
-            if not Setting.MESSAGES_JSON_PATH.is_file():
-                logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-                return []
-            
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    logger.error("Messages data is not a list")
-                    return []
-                
-                return data
-                
-        except Exception as e:
-            logger.error(f"Error loading messages: {str(e)}")
+    def __init__(self, store: Optional[MessageStore] = None, aggregates: Optional[MessageAggregates] = None):
+        self.store = store or get_message_store()
+        self.aggregates = aggregates or get_message_aggregates()
+
+    def _get_columns(self):
+        """All messages from the shared message store, in columnar form"""
+        return self.store.get_columns()
+
+    def _aggregate_channels(self) -> List[Tuple[Any, int, int, int, float]]:
+        """
+        (channel, volume, delivered, delivered with a resolution time, sum of
+        those times) per channel, in order of first appearance
+        """
+        if self.aggregates is not None:
+            return self.aggregates.channel_performance()
+
+        columns = self._get_columns()
+        if not len(columns):
             return []
 
+        # Aggregate per channel code (codes follow first-appearance order)
+        channel = columns.channel
+        n_codes = len(channel.labels)
+        delivered = columns.status.mask_of("DELIVERED")
+        timed = delivered & ~np.isnan(columns.resolution_time)
+
+        volumes = np.bincount(channel.codes, minlength=n_codes)
+        delivered_counts = np.bincount(channel.codes[delivered], minlength=n_codes)
+        timed_counts = np.bincount(channel.codes[timed], minlength=n_codes)
+        time_sums = np.bincount(
+            channel.codes[timed],
+            weights=columns.resolution_time[timed].astype(np.float64),
+            minlength=n_codes,
+        )
+        return [
+            (ch, int(volumes[code]), int(delivered_counts[code]), int(timed_counts[code]), float(time_sums[code]))
+            for code, ch in enumerate(channel.labels)
+        ]
+
     def get_channel_performance(self, sort_by: str = "volume") -> list:
         """
         Calculate performance metrics per channel
@@ -45,44 +66,19 @@ class ChannelPerformanceService:
         [{"channel": "SMS", "volume": 21000, "delivery_rate": 95.8, "avg_time": 2.3}, ...]
         """
         try:
-            messages = self._get_all_messages()
-            if not messages:
-                return []
-            
-            # Aggregate per channel
-            channels = {}
-            for msg in messages:
-                channel = msg.get("channel")
-                if not channel:
-                    continue
-                    
-                if channel not in channels:
-                    channels[channel] = {
-                        "volume": 0,
-                        "delivered_count": 0,
-                        "resolution_times": []
-                    }
-                
-                channels[channel]["volume"] += 1
-                
-                if msg.get("status") == "DELIVERED":
-                    channels[channel]["delivered_count"] += 1
-                    res_time = msg.get("resolution_time_seconds")
-                    if isinstance(res_time, (int, float)):
-                        channels[channel]["resolution_times"].append(res_time)
-            
+            channels = self._aggregate_channels()
+
             # Calculate rates and avgs
             result = []
-            for ch, data in channels.items():
-                volume = data["volume"]
-                if volume == 0:
+            for ch, volume, delivered_count, timed_count, time_sum in channels:
+                if not ch or volume == 0:
                     continue
                     
-                delivery_rate = round((data["delivered_count"] / volume) * 100, 1)
+                delivery_rate = round((delivered_count / volume) * 100, 1)
                 
                 avg_time = 0.0
-                if data["resolution_times"]:
-                    avg_time = round(sum(data["resolution_times"]) / len(data["resolution_times"]), 1)
+                if timed_count:
+                    avg_time = round(time_sum / timed_count, 1)
                 
                 result.append({
                     "channel": ch,
@@ -1,40 +1,21 @@
-from typing import List
+from typing import Optional
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import date, datetime
-from ...core.config import Setting
-import json
+from datetime import date
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
+from .message_columns import MessageColumns, masked_mean
 
 
 class CSAT_Score:
     
-    def _get_today_messages(self):
-        """Load messages from JSON file and filter by today's date"""
-        try:
-            if not Setting.MESSAGES_JSON_PATH.is_file():
-                logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-                return []
-            
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    return []
-                
-                today = date.today()
-                today_messages = []
-                for msg in data:
-                    try:
-                        datetime_str = msg.get("datetime")
-                        if datetime_str:
-                            msg_datetime = datetime.fromisoformat(datetime_str)
-                            if msg_datetime.date() == today:
-                                today_messages.append(msg)
-                    except (ValueError, TypeError):
-                        continue
-                return today_messages
-        except Exception as e:
-            logger.error(f"Error loading messages: {str(e)}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None, aggregates: Optional[MessageAggregates] = None):
+        self.store = store or get_message_store()
+        self.aggregates = aggregates or get_message_aggregates()
+
+    def _get_today_columns(self) -> MessageColumns:
+        """Columns holding only today's messages"""
+        return self.store.get_day_columns(date.today())
     
     def get_csat_score(self) -> float:
         """
@@ -44,17 +25,14 @@ class CSAT_Score:
             Float rounded to 1 decimal
         """
         try:
-            messages = self._get_today_messages()
-            scores: List[float] = [
-                msg["csat_score"]
-                for msg in messages
-                if isinstance(msg.get("csat_score"), (int, float))
-            ]
+            if self.aggregates is not None:
+                avg = self.aggregates.csat_average(date.today())
+            else:
+                avg = masked_mean(self._get_today_columns().csat_score)
 
-            if not scores:
+            if avg is None:
                 return 0.0
 
-            avg = sum(scores) / len(scores)
             return round(avg, 1)
 
         except Exception as e:
@@ -0,0 +1,75 @@
+"""
+Dashboard Snapshot Service
+Builds every dashboard widget's payload from one pinned version of the messages,
+so a page load shares one data pass instead of rescanning per widget.
+Each section is produced by the same service the individual endpoint uses.
+"""
+
+from ...utils.exceptions import CalculationError
+from ...utils.logger import logger
+from typing import List, Dict, Any, Optional
+from .message_store import MessageStore, get_message_store
+from .activate_escalation import ActiveEscalation
+from .avg_resolution_time import AverageResolutionTime
+from .delivery_rate import DeliveryRate
+from .failed_message import FailedMessage
+from .csat_score import CSAT_Score
+from .delivery_status import DeliveryStatusService
+from .message_volume_trends import VolumeTrendsService
+from .top_issues_service import TopIssuesService
+from .resolution_time_trend_service import ResolutionTimeTrendService
+from .channel_perfomance import ChannelPerformanceService
+
+
+class DashboardSnapshotService:
+
+    def __init__(self, store: Optional[MessageStore] = None):
+        self.store = store or get_message_store()
+
+    def get_snapshot(
+        self,
+        period: str = "7days",
+        channels: Optional[List[str]] = None,
+        timeline: str = "7days",
+        channel: Optional[str] = None,
+        sort_by: str = "volume",
+    ) -> Dict[str, Any]:
+        """
+        Returns all dashboard widgets in one payload:
+        - kpi: active escalations, avg resolution, delivery rate, failed messages, CSAT
+        - delivery_status, volume_trends (period/channels), top_issues,
+          resolution_time_trend (timeline/channel), channel_performance (sort_by)
+        """
+        try:
+            # Pin one version so every widget sees the same data
+            snapshot = self.store.snapshot()
+
+            result = {
+                "kpi": {
+                    "active_escalations": ActiveEscalation(snapshot).get_active_escalations(),
+                    "average_resolution": AverageResolutionTime(snapshot).get_avg_resolution_time(),
+                    "delivery_rate": DeliveryRate(snapshot).get_delivery_rate(),
+                    "failed_messages": FailedMessage(snapshot).get_failed_messages(),
+                    "csat_score": CSAT_Score(snapshot).get_csat_score(),
+                },
+                "delivery_status": DeliveryStatusService(snapshot).get_delivery_status(),
+                "volume_trends": VolumeTrendsService(snapshot).get_volume_trends(period=period, channels=channels),
+                "top_issues": TopIssuesService(snapshot).get_top_issues(),
+                "resolution_time_trend": ResolutionTimeTrendService(snapshot).get_resolution_trend(
+                    timeline=timeline, channel=channel
+                ),
+                "channel_performance": ChannelPerformanceService(snapshot).get_channel_performance(sort_by=sort_by),
+            }
+
+            logger.info(f"Dashboard snapshot built for data version {snapshot.version}")
+            return result
+
+        except CalculationError:
+            raise
+        except Exception as e:
+            logger.error(f"Dashboard snapshot failed: {e}", exc_info=True)
+            raise CalculationError(f"Failed to build dashboard snapshot: {str(e)}")
+
+
+def get_dashboard_snapshot_service() -> DashboardSnapshotService:
+    return DashboardSnapshotService()
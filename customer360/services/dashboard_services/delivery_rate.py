@@ -1,40 +1,24 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import date, datetime
+from datetime import date
+from typing import Optional
 from ...core.config import Setting
-import json
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
+from .message_columns import MessageColumns
+import numpy as np
 
 
 
 class DeliveryRate:
 
-    def _get_today_messages(self):
-        """Load messages from JSON file and filter by today's date"""
-        try:
-            if not Setting.MESSAGES_JSON_PATH.is_file():
-                logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-                return []
-            
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    return []
-                
-                today = date.today()
-                today_messages = []
-                for msg in data:
-                    try:
-                        datetime_str = msg.get("datetime")
-                        if datetime_str:
-                            msg_datetime = datetime.fromisoformat(datetime_str)
-                            if msg_datetime.date() == today:
-                                today_messages.append(msg)
-                    except (ValueError, TypeError):
-                        continue
-                return today_messages
-        except Exception as e:
-            logger.error(f"Error loading messages: {str(e)}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None, aggregates: Optional[MessageAggregates] = None):
+        self.store = store or get_message_store()
+        self.aggregates = aggregates or get_message_aggregates()
+
+    def _get_today_columns(self) -> MessageColumns:
+        """Columns holding only today's messages"""
+        return self.store.get_day_columns(date.today())
 
     def get_delivery_rate(self) -> float:
         """
@@ -47,12 +31,15 @@ class DeliveryRate:
             CalculationError: If calculation fails
         """
         try:
-            messages = self._get_today_messages()
-            total = len(messages)
+            if self.aggregates is not None:
+                total, delivered = self.aggregates.delivery_counts(date.today(), Setting.STATUS_DELIVERED)
+            else:
+                columns = self._get_today_columns()
+                total = len(columns)
+                delivered = int(np.count_nonzero(columns.status.mask_of(Setting.STATUS_DELIVERED)))
             if total == 0:
                 return 0.0
 
-            delivered = sum(1 for msg in messages if msg.get("status") == Setting.STATUS_DELIVERED)
             rate = (delivered / total) * 100
             return round(rate, 1)
 
@@ -1,48 +1,31 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import date, datetime, timedelta
-from ...core.config import Setting
-import json
+from datetime import date, timedelta
+from typing import Dict, Optional
+from .message_store import MessageStore, get_message_store
+from .rollup_cube import RollupCube
 
 
 class DeliveryStatusService:
     
-    def _get_period_messages(self, days_back: int = 7) -> list:
+    def __init__(self, store: Optional[MessageStore] = None):
+        self.store = store or get_message_store()
+
+    def _count_by_status(self, cube: RollupCube, days_back: int = 7) -> tuple[Dict[str, int], Dict[str, int]]:
         """
-        Load messages from JSON and filter by date range (today + previous days)
-        Returns list of messages in the period
+        Message counts per status for today, and for the previous days of the
+        range (today + previous days)
         """
-        try:
-            if not Setting.MESSAGES_JSON_PATH.is_file():
-                logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-                return []
-            
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    logger.error("Messages data is not a list")
-                    return []
-                
-                today = date.today()
-                start_date = today - timedelta(days=days_back - 1)  # inclusive
-                
-                period_messages = []
-                for msg in data:
-                    try:
-                        datetime_str = msg.get("datetime")
-                        if datetime_str:
-                            msg_datetime = datetime.fromisoformat(datetime_str)
-                            msg_date = msg_datetime.date()
-                            if start_date <= msg_date <= today:
-                                period_messages.append(msg)
-                    except (ValueError, TypeError):
-                        continue
-                
-                return period_messages
-                
-        except Exception as e:
-            logger.error(f"Error loading messages for delivery status: {str(e)}")
-            return []
+        today = date.today()
+        start_date = today - timedelta(days=days_back - 1)  # inclusive
+        labels = cube.columns.status.labels
+
+        today_counts: Dict[str, int] = {}
+        prev_counts: Dict[str, int] = {}
+        for day, (_, _, status, _), cell in cube.cells(start_date, today):
+            counts = today_counts if day == today else prev_counts
+            counts[labels[status]] = counts.get(labels[status], 0) + cell.count
+        return today_counts, prev_counts
 
     def get_delivery_status(self) -> dict:
         """
@@ -56,33 +39,29 @@ class DeliveryStatusService:
         }
         """
         try:
-            messages = self._get_period_messages(days_back=7)
-            if not messages:
+            today_counts, prev_counts = self._count_by_status(self.store.get_cube(), days_back=7)
+            if not today_counts and not prev_counts:
                 return {
                     "delivered": {"count": 0, "change": 0.0},
                     "failed":    {"count": 0, "change": 0.0},
                     "pending":   {"count": 0, "change": 0.0}
                 }
 
-            today = date.today()
-            today_messages = [m for m in messages if datetime.fromisoformat(m["datetime"]).date() == today]
-            prev_messages  = [m for m in messages if datetime.fromisoformat(m["datetime"]).date() < today]
-
-            def count_status(records: list, status: str) -> int:
-                return sum(1 for m in records if m.get("status") == status)
+            def count_status(counts: Dict[str, int], status: str) -> int:
+                return counts.get(status, 0)
 
             # Today's counts
             current = {
-                "delivered": count_status(today_messages, "DELIVERED"),
-                "failed":    count_status(today_messages, "FAILED"),
-                "pending":   count_status(today_messages, "PENDING"),
+                "delivered": count_status(today_counts, "DELIVERED"),
+                "failed":    count_status(today_counts, "FAILED"),
+                "pending":   count_status(today_counts, "PENDING"),
             }
 
             # Previous period counts (last 6 days)
             previous = {
-                "delivered": count_status(prev_messages, "DELIVERED"),
-                "failed":    count_status(prev_messages, "FAILED"),
-                "pending":   count_status(prev_messages, "PENDING"),
+                "delivered": count_status(prev_counts, "DELIVERED"),
+                "failed":    count_status(prev_counts, "FAILED"),
+                "pending":   count_status(prev_counts, "PENDING"),
             }
 
             def percent_change(curr: int, prev: int) -> float:
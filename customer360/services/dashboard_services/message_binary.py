@@ -0,0 +1,165 @@
+"""
+Message Binary
+Compact columnar binary copy of message.json that uvicorn workers (and
+process pool workers) memory-map read-only, so every process shares the same
+physical pages for the columns and the time index instead of each parsing
+its own copy. The rollup cube is not in the file: every process still
+aggregates its own from the mapped columns. Rows appended through the
+message log are not in the file either; once a process reads some, its
+columns and index are private copies until the binary is rebuilt.
+
+Layout:
+- 8-byte magic, then the header length as a little-endian uint64
+- JSON header: row count, source file version, column and time index dtypes /
+  offsets, and the label list (string dictionary) of each categorical column
+- fixed-width column arrays, then the time index (row order, sorted
+  timestamps), each starting on a 64-byte boundary
+
+Build / rebuild (atomic: written to a temp file, then renamed over the old one):
+    python -m customer360.services.dashboard_services.message_binary
+"""
+
+from ...utils.exceptions import DataLoadError
+from ...utils.json_stream import iter_json_batches
+from ...utils.logger import logger
+from ...core.config import Setting
+from pathlib import Path
+import argparse
+import json
+import os
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+from .message_columns import MessageColumns, CategoricalColumn, _CATEGORICAL_FIELDS, _ARRAY_FIELDS
+from .time_index import TimeIndex
+
+
+MAGIC = b"C360MSG1"
+FORMAT_VERSION = 3
+_ALIGNMENT = 64
+_BATCH_SIZE = 10_000
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _place(arrays: Dict[str, np.ndarray], offset: int) -> Tuple[Dict[str, Dict[str, Any]], int]:
+    """Layout (dtype, offset) of arrays laid out one after another from offset, and the offset after them"""
+    layout = {}
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "offset": offset}
+        offset = _align(offset + array.nbytes)
+    return layout, offset
+
+
+def _map(path: Path, spec: Dict[str, Any], data_start: int, length: int) -> np.ndarray:
+    dtype = np.dtype(spec["dtype"])
+    if not length:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=data_start + spec["offset"], shape=(length,))
+
+
+def write_message_binary(
+    columns: MessageColumns,
+    path: Path,
+    source_version: Optional[Tuple[int, int]] = None,
+) -> None:
+    """
+    Write columns and their time index to path atomically: readers see
+    either the old file or the complete new one, never a partial write.
+    """
+    path = Path(path)
+    arrays = {field: np.ascontiguousarray(getattr(columns, field)) for field in _ARRAY_FIELDS}
+    for field in _CATEGORICAL_FIELDS:
+        arrays[field] = np.ascontiguousarray(getattr(columns, field).codes)
+    index = TimeIndex.build(columns)
+    index_arrays = {
+        "order": np.ascontiguousarray(index.order, dtype=np.int64),
+        "times": np.ascontiguousarray(index.times),
+    }
+
+    layout, offset = _place(arrays, 0)
+    index_layout, _ = _place(index_arrays, offset)
+
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "rows": len(columns),
+        "indexed_rows": len(index),
+        "source_version": list(source_version) if source_version is not None else None,
+        "columns": layout,
+        "index": index_layout,
+        "labels": {field: getattr(columns, field).labels for field in _CATEGORICAL_FIELDS},
+    }).encode("utf-8")
+    data_start = _align(len(MAGIC) + 8 + len(header))
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for placed, spec in ((arrays, layout), (index_arrays, index_layout)):
+                for name, array in placed.items():
+                    f.seek(data_start + spec[name]["offset"])
+                    array.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_message_binary(path: Path) -> Tuple[MessageColumns, TimeIndex, Dict[str, Any]]:
+    """
+    Memory-map a binary message file read-only.
+    Returns (columns, time index, header). Raises DataLoadError if the file is not a valid message binary.
+    """
+    path = Path(path)
+    try:
+        with path.open("rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise DataLoadError(f"{path} is not a message binary file")
+            header_len = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_len))
+    except (OSError, ValueError) as e:
+        raise DataLoadError(f"Cannot read message binary header from {path}: {e}")
+
+    if header.get("format") != FORMAT_VERSION:
+        raise DataLoadError(f"Unsupported message binary format {header.get('format')} in {path}")
+
+    rows = header["rows"]
+    data_start = _align(len(MAGIC) + 8 + header_len)
+    arrays = {field: _map(path, spec, data_start, rows) for field, spec in header["columns"].items()}
+    for field in _CATEGORICAL_FIELDS:
+        arrays[field] = CategoricalColumn(arrays[field], header["labels"][field])
+
+    indexed = header["indexed_rows"]
+    index = TimeIndex(
+        _map(path, header["index"]["order"], data_start, indexed),
+        _map(path, header["index"]["times"], data_start, indexed),
+    )
+    return MessageColumns(**arrays), index, header
+
+
+def build_message_binary(source: Path, output: Path) -> int:
+    """Convert a message.json file into a binary message file. Returns the row count."""
+    source = Path(source)
+    stat = source.stat()
+    columns = MessageColumns.from_batches(iter_json_batches(source, _BATCH_SIZE))
+    write_message_binary(columns, output, source_version=(stat.st_mtime_ns, stat.st_size))
+    logger.info(f"Message binary built: {len(columns)} rows from {source} into {output}")
+    return len(columns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the memory-mapped message binary from message.json")
+    parser.add_argument("--source", type=Path, default=Setting.MESSAGES_JSON_PATH)
+    parser.add_argument("--output", type=Path, default=Setting.MESSAGES_BINARY_PATH)
+    args = parser.parse_args()
+    rows = build_message_binary(args.source, args.output)
+    print(f"Wrote {rows} messages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
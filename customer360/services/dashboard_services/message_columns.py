@@ -0,0 +1,252 @@
+"""
+Message Columns
+Columnar (NumPy) representation of message.json used by the dashboard aggregates.
+Categorical fields are stored as small-int codes into a per-column label list;
+code 0 is always "missing" (None).
+"""
+
+from ...utils.timestamps import parse_datetime
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+import numpy as np
+
+
+MISSING_CODE = 0
+MISSING_ID = -1
+_CATEGORICAL_FIELDS = ("status", "channel", "issue_type")
+_ARRAY_FIELDS = (
+    "timestamp", "day", "hour", "resolution_time", "csat_score", "escalated", "resolved", "employee_id",
+)
+_EMPLOYEE_FIELDS = ("employee_id", "sender_id", "emp_id", "created_by")
+_INT64 = np.iinfo(np.int64)
+
+
+def _as_number(value: Any) -> float:
+    """Numeric value as float, NaN if the field is missing or not a number"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    return np.nan
+
+
+def _employee_id(message: Dict[str, Any]) -> int:
+    """
+    Sending employee's id: the first truthy identifier field (else the last one), as int.
+    MISSING_ID if there is none or it is not an integer.
+    """
+    value = None
+    for field in _EMPLOYEE_FIELDS:
+        value = message.get(field)
+        if value:
+            break
+    try:
+        value = int(value)
+    except (ValueError, TypeError, OverflowError):
+        return MISSING_ID
+    return value if _INT64.min < value <= _INT64.max else MISSING_ID
+
+
+def _encode(values: Iterable[Any], size: int, labels: List[Any], index: Dict[Any, int]) -> np.ndarray:
+    """Codes for values; unseen values are added to labels / index"""
+    codes = np.zeros(size, dtype=np.int16)
+    for i, value in enumerate(values):
+        code = index.get(value)
+        if code is None:
+            code = len(labels)
+            index[value] = code
+            labels.append(value)
+        codes[i] = code
+    return codes
+
+
+class CategoricalColumn:
+    """Small-int codes plus the label each code stands for"""
+
+    def __init__(self, codes: np.ndarray, labels: List[Any]):
+        self.codes = codes
+        self.labels = labels
+        self._index = {label: code for code, label in enumerate(labels)}
+
+    def code_of(self, label: Any) -> int:
+        """Code for a label, -1 if the label never occurs"""
+        return self._index.get(label, -1)
+
+    def mask_of(self, label: Any) -> np.ndarray:
+        return self.codes == self.code_of(label)
+
+    def mask_in(self, labels: Iterable[Any]) -> np.ndarray:
+        wanted = [self._index[label] for label in labels if label in self._index]
+        return np.isin(self.codes, wanted)
+
+    def truthy_mask(self) -> np.ndarray:
+        """Rows whose label is truthy (skips None and empty strings)"""
+        return self.mask_in(label for label in self.labels if label)
+
+
+class MessageColumns:
+    """
+    One array per message field:
+    - timestamp: datetime64[us] (NaT when missing/invalid), plus day and hour
+      (derived from timestamp unless given, e.g. when read from a binary file)
+    - status / channel / issue_type: CategoricalColumn
+    - resolution_time_seconds / csat_score: float32 (NaN when not numeric)
+    - escalated / resolved: bool
+    - employee_id: int64 sender id (MISSING_ID when absent / not an integer)
+    """
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        status: CategoricalColumn,
+        channel: CategoricalColumn,
+        issue_type: CategoricalColumn,
+        resolution_time: np.ndarray,
+        csat_score: np.ndarray,
+        escalated: np.ndarray,
+        resolved: np.ndarray,
+        employee_id: Optional[np.ndarray] = None,
+        day: Optional[np.ndarray] = None,
+        hour: Optional[np.ndarray] = None,
+    ):
+        self.timestamp = timestamp
+        if day is None:
+            day = timestamp.astype("datetime64[D]")
+        if hour is None:
+            hour = (timestamp - day).astype("timedelta64[h]").astype(np.int16)
+            hour = np.where(np.isnat(timestamp), -1, hour).astype(np.int8)
+        self.day = day
+        self.hour = hour
+        self.status = status
+        self.channel = channel
+        self.issue_type = issue_type
+        self.resolution_time = resolution_time
+        self.csat_score = csat_score
+        self.escalated = escalated
+        self.resolved = resolved
+        if employee_id is None:
+            employee_id = np.full(len(timestamp), MISSING_ID, dtype=np.int64)
+        self.employee_id = employee_id
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def from_messages(cls, messages: List[Dict[str, Any]]) -> "MessageColumns":
+        return cls.from_batches([messages])
+
+    def append(self, messages: List[Dict[str, Any]]) -> "MessageColumns":
+        """New columns with the given messages added after the existing rows"""
+        return self.from_batches([messages], base=self)
+
+    @classmethod
+    def from_batches(
+        cls,
+        batches: Iterable[List[Dict[str, Any]]],
+        base: Optional["MessageColumns"] = None,
+    ) -> "MessageColumns":
+        """
+        Columns for messages arriving in batches, after base's rows if given.
+        Each batch is only needed while it is being encoded, so callers can
+        stream batches without holding every message dict at once.
+        """
+        categoricals = {}
+        parts: Dict[str, List[np.ndarray]] = {
+            "timestamp": [np.zeros(0, dtype="datetime64[us]")],
+            "resolution_time": [np.zeros(0, dtype=np.float32)],
+            "csat_score": [np.zeros(0, dtype=np.float32)],
+            "escalated": [np.zeros(0, dtype=bool)],
+            "resolved": [np.zeros(0, dtype=bool)],
+            "employee_id": [np.zeros(0, dtype=np.int64)],
+        }
+        for field in _CATEGORICAL_FIELDS:
+            column = getattr(base, field) if base is not None else None
+            labels = list(column.labels) if column is not None else [None]
+            categoricals[field] = (labels, {label: code for code, label in enumerate(labels)})
+            parts[field] = [column.codes] if column is not None else [np.zeros(0, dtype=np.int16)]
+        if base is not None:
+            for field in ("timestamp", "resolution_time", "csat_score", "escalated", "resolved", "employee_id"):
+                parts[field].append(getattr(base, field))
+
+        for messages in batches:
+            size = len(messages)
+            parts["timestamp"].append(np.array(
+                [parse_datetime(msg.get("datetime")) for msg in messages],
+                dtype="datetime64[us]",
+            ).reshape(size))
+            for field in _CATEGORICAL_FIELDS:
+                labels, index = categoricals[field]
+                parts[field].append(_encode((msg.get(field) for msg in messages), size, labels, index))
+            parts["resolution_time"].append(np.fromiter(
+                (_as_number(msg.get("resolution_time_seconds")) for msg in messages),
+                dtype=np.float32, count=size,
+            ))
+            parts["csat_score"].append(np.fromiter(
+                (_as_number(msg.get("csat_score")) for msg in messages),
+                dtype=np.float32, count=size,
+            ))
+            parts["escalated"].append(
+                np.fromiter((bool(msg.get("escalated")) for msg in messages), dtype=bool, count=size)
+            )
+            parts["resolved"].append(
+                np.fromiter((bool(msg.get("resolved")) for msg in messages), dtype=bool, count=size)
+            )
+            parts["employee_id"].append(
+                np.fromiter((_employee_id(msg) for msg in messages), dtype=np.int64, count=size)
+            )
+
+        columns = {field: np.concatenate(arrays) for field, arrays in parts.items()}
+        for field in _CATEGORICAL_FIELDS:
+            columns[field] = CategoricalColumn(columns[field], categoricals[field][0])
+        return cls(**columns)
+
+    @classmethod
+    def concat(cls, parts: List["MessageColumns"]) -> "MessageColumns":
+        """
+        Rows of parts one after another. Categorical codes are remapped onto
+        merged label lists (labels in order of first appearance across parts).
+        """
+        if not parts:
+            return cls.from_messages([])
+
+        columns = {field: np.concatenate([getattr(part, field) for part in parts]) for field in _ARRAY_FIELDS}
+        for field in _CATEGORICAL_FIELDS:
+            labels: List[Any] = [None]
+            index: Dict[Any, int] = {None: MISSING_CODE}
+            codes = []
+            for part in parts:
+                column = getattr(part, field)
+                lookup = _encode(column.labels, len(column.labels), labels, index)
+                codes.append(lookup[column.codes])
+            columns[field] = CategoricalColumn(np.concatenate(codes), labels)
+        return cls(**columns)
+
+    def take(self, rows: Any) -> "MessageColumns":
+        """Columns for a subset of rows (index array, mask or slice); labels are shared"""
+        columns = {field: getattr(self, field)[rows] for field in _ARRAY_FIELDS}
+        for field in _CATEGORICAL_FIELDS:
+            column = getattr(self, field)
+            columns[field] = CategoricalColumn(column.codes[rows], column.labels)
+        return MessageColumns(**columns)
+
+
+def first_mode(values: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    (value, count) of the most frequent value, ties going to the value
+    seen first - the same answer Counter.most_common(1) gives. None if empty.
+    """
+    if values.size == 0:
+        return None
+    unique, first_seen, counts = np.unique(values, return_index=True, return_counts=True)
+    best = counts.max()
+    tied = np.flatnonzero(counts == best)
+    winner = tied[np.argmin(first_seen[tied])]
+    return int(unique[winner]), int(best)
+
+
+def masked_mean(values: np.ndarray, mask: Optional[np.ndarray] = None) -> Optional[float]:
+    """Mean of the non-NaN values (under mask, if given) accumulated in float64, None if empty"""
+    keep = ~np.isnan(values)
+    if mask is not None:
+        keep &= mask
+    selected = values[keep]
+    if selected.size == 0:
+        return None
+    return float(selected.astype(np.float64).mean())
@@ -0,0 +1,105 @@
+"""
+Message Log
+Append-only NDJSON log of messages (one JSON object per line) that sits next
+to message.json. Producers append lines; the message store follows the log
+by byte offset and only parses what was added since its last read.
+"""
+
+from ...utils.logger import logger
+from pathlib import Path
+import json
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def append_messages(path: Path, messages: List[Dict[str, Any]]) -> None:
+    """
+    Append messages to the log as complete lines in a single write,
+    so a concurrent reader never sees half of a batch's last record.
+    """
+    if not messages:
+        return
+    data = "".join(json.dumps(msg, ensure_ascii=False) + "\n" for msg in messages).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+class MessageLogTail:
+    """Tracks the read offset into a message log and hands out newly appended records"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset = 0
+        # (inode, size) at the last read; None until the log has been seen
+        self._seen: Optional[Tuple[int, int]] = None
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def stat(self) -> Optional[Tuple[int, int]]:
+        """(inode, size) of the log now, None if it doesn't exist"""
+        return self._stat()
+
+    def reset(self) -> None:
+        """Start over from the beginning of the log"""
+        self.offset = 0
+        self._seen = None
+
+    def has_changed(self) -> bool:
+        """True if the log grew, shrank or was replaced since the last read"""
+        return self._stat() != self._seen
+
+    def was_rewritten(self) -> bool:
+        """
+        True if records already read are gone: the log was truncated, replaced
+        (different inode) or removed. Readers must then rebuild from scratch.
+        """
+        current = self._stat()
+        if self._seen is None:
+            return False
+        if current is None:
+            return self.offset > 0
+        return current[0] != self._seen[0] or current[1] < self.offset
+
+    def read_new(self) -> List[Dict[str, Any]]:
+        """
+        Records from complete lines appended since the last read.
+        A trailing line without its newline is left for the next read.
+        """
+        current = self._stat()
+        if current is None or current == self._seen:
+            self._seen = current
+            return []
+
+        with self.path.open("rb") as f:
+            f.seek(self.offset)
+            data = f.read(current[1] - self.offset)
+
+        end = data.rfind(b"\n") + 1
+        self._seen = current
+        if not end:
+            return []
+
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line in {self.path} after offset {self.offset}: {e}")
+                continue
+            if not isinstance(record, dict):
+                logger.warning(f"Skipping non-object line in {self.path} after offset {self.offset}")
+                continue
+            records.append(record)
+
+        self.offset += end
+        return records
@@ -0,0 +1,179 @@
+"""
+Message Partitions
+Date-partitioned message storage: one JSON array per calendar day
+(data/messages/2026-02-18.json), records without a valid datetime in
+undated.json, and a manifest.json listing the partitions in order.
+
+Adding messages rewrites only the partitions of the days they fall on, and
+readers re-parse only partitions whose files changed. Every file (manifest
+last) is replaced atomically via write-then-rename.
+
+Split an existing message.json:
+    python -m customer360.services.dashboard_services.message_partitions
+"""
+
+from ...utils.exceptions import DataLoadError
+from ...utils.json_stream import iter_json_array, iter_json_batches
+from ...utils.logger import logger
+from ...utils.timestamps import parse_datetime
+from ...core.config import Setting
+from datetime import date
+from pathlib import Path
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+
+MANIFEST_NAME = "manifest.json"
+UNDATED_NAME = "undated.json"
+FORMAT_VERSION = 1
+_BATCH_SIZE = 10_000
+
+
+def partition_name(day: Optional[date]) -> str:
+    """File name of the partition holding a day's messages (None: undated)"""
+    return f"{day.isoformat()}.json" if day is not None else UNDATED_NAME
+
+
+def _partition_day(message: Dict[str, Any]) -> Optional[date]:
+    parsed = parse_datetime(message.get("datetime"))
+    return parsed.date() if parsed is not None else None
+
+
+def _replace(path: Path, chunks: Iterable[str]) -> None:
+    """Write text chunks to path via a temp file + rename"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_manifest(directory: Path) -> List[Dict[str, Any]]:
+    """
+    Partitions listed in the manifest, in storage order:
+    [{"date": "2026-02-18" | None, "file": "2026-02-18.json", "rows": 123}, ...]
+    Raises DataLoadError if the manifest is missing or invalid.
+    """
+    path = Path(directory) / MANIFEST_NAME
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise DataLoadError(f"Cannot read partition manifest {path}: {e}")
+    if not isinstance(manifest, dict) or manifest.get("format") != FORMAT_VERSION:
+        raise DataLoadError(f"Unsupported partition manifest {path}")
+    return manifest["partitions"]
+
+
+def _write_manifest(directory: Path, partitions: Dict[Optional[date], int]) -> None:
+    # Days in order, undated records last
+    ordered = sorted((day for day in partitions if day is not None)) + ([None] if None in partitions else [])
+    manifest = {
+        "format": FORMAT_VERSION,
+        "partitions": [
+            {
+                "date": day.isoformat() if day is not None else None,
+                "file": partition_name(day),
+                "rows": partitions[day],
+            }
+            for day in ordered
+        ],
+    }
+    _replace(Path(directory) / MANIFEST_NAME, [json.dumps(manifest, indent=2)])
+
+
+def _manifest_rows(directory: Path) -> Dict[Optional[date], int]:
+    try:
+        entries = read_manifest(directory)
+    except DataLoadError:
+        return {}
+    return {
+        (date.fromisoformat(entry["date"]) if entry["date"] else None): entry["rows"]
+        for entry in entries
+    }
+
+
+def add_messages(directory: Path, messages: List[Dict[str, Any]]) -> None:
+    """
+    Add messages to their day partitions: only the partitions of days that
+    receive messages are rewritten, then the manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    by_day: Dict[Optional[date], List[Dict[str, Any]]] = {}
+    for msg in messages:
+        by_day.setdefault(_partition_day(msg), []).append(msg)
+
+    rows = _manifest_rows(directory)
+    for day, new_messages in by_day.items():
+        path = directory / partition_name(day)
+        existing = list(iter_json_array(path)) if path.is_file() else []
+        combined = existing + new_messages
+        _replace(path, [json.dumps(combined, ensure_ascii=False)])
+        rows[day] = len(combined)
+
+    _write_manifest(directory, rows)
+    logger.info(f"Added {len(messages)} messages to {len(by_day)} partitions in {directory}")
+
+
+def split_messages(source: Path, directory: Path) -> int:
+    """
+    Rebuild the partitions of directory from a message.json array.
+    The source is streamed and each day's records are flushed to that day's
+    file batch by batch. Returns the number of messages written.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    rows: Dict[Optional[date], int] = {}
+    tmp_paths: Dict[Optional[date], Path] = {}
+    try:
+        for batch in iter_json_batches(source, _BATCH_SIZE):
+            by_day: Dict[Optional[date], List[str]] = {}
+            for msg in batch:
+                by_day.setdefault(_partition_day(msg), []).append(json.dumps(msg, ensure_ascii=False))
+
+            for day, records in by_day.items():
+                if day not in tmp_paths:
+                    tmp_paths[day] = directory / f".{partition_name(day)}.{os.getpid()}.part"
+                    tmp_paths[day].write_text("[", encoding="utf-8")
+                with tmp_paths[day].open("a", encoding="utf-8") as f:
+                    f.write(("," if rows.get(day) else "") + ",".join(records))
+                rows[day] = rows.get(day, 0) + len(records)
+
+        for day, tmp_path in tmp_paths.items():
+            with tmp_path.open("a", encoding="utf-8") as f:
+                f.write("]")
+            os.replace(tmp_path, directory / partition_name(day))
+    finally:
+        for tmp_path in tmp_paths.values():
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    # Partitions of days no longer in the source are dropped from the manifest
+    _write_manifest(directory, rows)
+    total = sum(rows.values())
+    logger.info(f"Split {total} messages from {source} into {len(rows)} partitions in {directory}")
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Split message.json into per-day partitions")
+    parser.add_argument("--source", type=Path, default=Setting.MESSAGES_JSON_PATH)
+    parser.add_argument("--output", type=Path, default=Setting.MESSAGES_PARTITION_DIR)
+    args = parser.parse_args()
+    total = split_messages(args.source, args.output)
+    print(f"Wrote {total} messages to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,22 @@
-from pathlib import Path
-from typing import List , Dict , Any
+from typing import Iterable , Dict , Any
 from ...utils.logger import logger
-import json
 from datetime import date , datetime
-from ...core.config import Setting
+import numpy as np
+from .message_store import MessageStore, get_message_store
 
 class MessageService:
-    def load_messages_from_json() -> List[Dict[str, Any]]:
+    @staticmethod
+    def load_messages_from_json() -> Iterable[Dict[str, Any]]:
         """
-        Safely load messages list from JSON file.
+        Messages from the shared message store (streamed for very large files).
         Returns empty list on any failure.
         """
-        if not Setting.MESSAGES_JSON_PATH.is_file():
-            logger.warning(f"Messages file not found: {Setting.MESSAGES_JSON_PATH}")
-            return []
-
-        try:
-            with Setting.MESSAGES_JSON_PATH.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    logger.error("Messages data is not a list")
-                    return []
-                return data
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {str(e)}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load messages file: {str(e)}")
-            return []
+        return get_message_store().get_messages()
 
 
+    @staticmethod
     def count_messages_sent_today_by_employee(
-        messages: List[Dict[str, Any]],
+        messages: Iterable[Dict[str, Any]],
         employee_id: int
     ) -> int:
         """
@@ -99,3 +84,17 @@ class MessageService:
 
         return count
 
+
+    @staticmethod
+    def count_sent_today_from_store(store: MessageStore, employee_id: int) -> int:
+        """
+        Same count as count_messages_sent_today_by_employee, read from the
+        store's pre-parsed columns: today's rows only, compared on the
+        employee_id column parsed once at load.
+        """
+        columns = store.get_day_columns(date.today())
+        try:
+            employee_id = int(employee_id)
+        except (ValueError, TypeError):
+            return 0
+        return int(np.count_nonzero(columns.employee_id == employee_id))
@@ -0,0 +1,248 @@
+"""
+Message SQL Aggregates
+SQL-pushdown mode for the dashboard (Setting.DASHBOARD_BACKEND = "database"):
+messages live in the message_events table (Database/model/message_model.py)
+of the database configured in Database/config.py, and each metric is one
+GROUP BY / filtered COUNT / AVG query over an index range on day, so only
+the aggregated rows reach Python:
+
+- delivery rate, CSAT:  today's COUNT(*), COUNT(*) FILTER (status), AVG(csat)
+- channel performance:  per channel volume, delivered count, delivered AVG time
+- daily volume:         per day sent / delivered / failed, optional channels
+- hourly peak:          per hour volume
+- top issues:           per (issue_type, channel) volume
+
+MIN(position) comes back with every group so callers can order groups by
+first appearance, the tie-break the in-memory services use.
+
+Works on PostgreSQL and on SQLite (3.30+ for FILTER) for local testing, e.g.
+DATABASE_URL=sqlite:///./customer360.db.
+
+The table is a copy of message.json. Messages appended to the in-memory
+store are not written to it, so reload after the source changes:
+    python -m customer360.services.dashboard_services.message_sql
+"""
+
+from ...utils.exceptions import DataLoadError
+from ...utils.json_stream import iter_json_batches
+from ...utils.logger import logger
+from ...utils.timestamps import parse_datetime
+from ...core.config import Setting
+from ...Database.config import Base, engine, session
+from ...Database.model.message_model import MessageEvent
+from datetime import date
+from pathlib import Path
+import argparse
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from .message_columns import MISSING_ID, _as_number, _employee_id
+
+
+_BATCH_SIZE = 10_000
+DELIVERED = "DELIVERED"
+FAILED = "FAILED"
+
+
+def _label(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    number = _as_number(value)
+    return None if math.isnan(number) else number
+
+
+def _event_row(position: int, message: Dict[str, Any]) -> Dict[str, Any]:
+    sent_at = parse_datetime(message.get("datetime"))
+    employee_id = _employee_id(message)
+    return {
+        "position": position,
+        "message_id": _label(message.get("id")),
+        "employee_id": employee_id if employee_id != MISSING_ID else None,
+        "sent_at": sent_at,
+        "day": sent_at.date() if sent_at is not None else None,
+        "hour": sent_at.hour if sent_at is not None else None,
+        "channel": _label(message.get("channel")),
+        "status": _label(message.get("status")),
+        "issue_type": _label(message.get("issue_type")),
+        "resolution_time": _number(message.get("resolution_time_seconds")),
+        "csat_score": _number(message.get("csat_score")),
+        "escalated": bool(message.get("escalated")),
+        "resolved": bool(message.get("resolved")),
+    }
+
+
+def load_messages_into_database(
+    source: Union[str, Path] = Setting.MESSAGES_JSON_PATH,
+    bind: Engine = engine,
+    batch_size: int = _BATCH_SIZE,
+) -> int:
+    """
+    Replace message_events with the messages of a message.json file, in
+    batched INSERTs within one transaction. Creates the table if missing.
+    Returns the row count.
+    """
+    source = Path(source)
+    Base.metadata.create_all(bind=bind, tables=[MessageEvent.__table__])
+    table = MessageEvent.__table__
+
+    position = 0
+    inserted = 0
+    with bind.begin() as conn:
+        conn.execute(table.delete())
+        try:
+            for batch in iter_json_batches(source, batch_size):
+                rows = []
+                for message in batch:
+                    if isinstance(message, dict):
+                        rows.append(_event_row(position, message))
+                    position += 1
+                if rows:
+                    conn.execute(table.insert(), rows)
+                    inserted += len(rows)
+        except DataLoadError as e:
+            raise DataLoadError(f"Failed to load {source.name}: {e}")
+
+    logger.info(f"Loaded {inserted} messages from {source} into {table.name}")
+    return inserted
+
+
+class MessageAggregates:
+    """Dashboard aggregates computed by the database over message_events"""
+
+    def __init__(self, session_factory: Callable[[], Session] = session):
+        self._session = session_factory
+
+    def has_messages(self) -> bool:
+        with self._session() as db:
+            return db.scalars(select(MessageEvent.position).limit(1)).first() is not None
+
+    def delivery_counts(self, day: date, delivered_status: str = DELIVERED) -> Tuple[int, int]:
+        """(messages, delivered messages) on day"""
+        query = select(
+            func.count(),
+            func.count().filter(MessageEvent.status == delivered_status),
+        ).where(MessageEvent.day == day)
+        with self._session() as db:
+            total, delivered = db.execute(query).one()
+        return int(total), int(delivered)
+
+    def csat_average(self, day: date) -> Optional[float]:
+        """Mean csat_score of day's messages that have one, None if none do"""
+        query = select(func.avg(MessageEvent.csat_score)).where(MessageEvent.day == day)
+        with self._session() as db:
+            average = db.scalar(query)
+        return float(average) if average is not None else None
+
+    def channel_performance(self) -> List[Tuple[Optional[str], int, int, int, float]]:
+        """
+        (channel, volume, delivered, delivered with a resolution time, sum of
+        those times) per channel over all messages, in order of first appearance
+        """
+        delivered = MessageEvent.status == DELIVERED
+        timed = delivered & MessageEvent.resolution_time.is_not(None)
+        query = (
+            select(
+                MessageEvent.channel,
+                func.count(),
+                func.count().filter(delivered),
+                func.count().filter(timed),
+                func.sum(MessageEvent.resolution_time).filter(timed),
+                func.min(MessageEvent.position),
+            )
+            .group_by(MessageEvent.channel)
+            .order_by(func.min(MessageEvent.position))
+        )
+        with self._session() as db:
+            rows = db.execute(query).all()
+        return [
+            (channel, int(volume), int(delivered_count), int(timed_count), float(time_sum or 0.0))
+            for channel, volume, delivered_count, timed_count, time_sum, _ in rows
+        ]
+
+    def _day_range(self, query, start_date: date, end_date: date, channels: Optional[List[str]]):
+        query = query.where(MessageEvent.day.between(start_date, end_date))
+        if channels is not None:
+            query = query.where(MessageEvent.channel.in_(channels))
+        return query
+
+    def daily_volume(
+        self,
+        start_date: date,
+        end_date: date,
+        channels: Optional[List[str]] = None,
+    ) -> List[Tuple[date, int, int, int]]:
+        """(day, sent, delivered, failed) per day in [start_date, end_date], by day"""
+        query = self._day_range(
+            select(
+                MessageEvent.day,
+                func.count(),
+                func.count().filter(MessageEvent.status == DELIVERED),
+                func.count().filter(MessageEvent.status == FAILED),
+            ),
+            start_date, end_date, channels,
+        ).group_by(MessageEvent.day).order_by(MessageEvent.day)
+        with self._session() as db:
+            rows = db.execute(query).all()
+        return [(day, int(sent), int(delivered), int(failed)) for day, sent, delivered, failed in rows]
+
+    def hourly_volume(
+        self,
+        start_date: date,
+        end_date: date,
+        channels: Optional[List[str]] = None,
+    ) -> List[Tuple[int, int]]:
+        """(hour, messages) per hour of day in [start_date, end_date], in order of first appearance"""
+        query = self._day_range(
+            select(MessageEvent.hour, func.count()),
+            start_date, end_date, channels,
+        ).group_by(MessageEvent.hour).order_by(func.min(MessageEvent.position))
+        with self._session() as db:
+            rows = db.execute(query).all()
+        return [(int(hour), int(count)) for hour, count in rows]
+
+    def issue_channel_volume(self, start_date: date, end_date: date) -> List[Tuple[str, Optional[str], int, int]]:
+        """
+        (issue_type, channel, messages, first position) per pair in
+        [start_date, end_date], for messages with a non-empty issue_type
+        """
+        query = (
+            select(
+                MessageEvent.issue_type,
+                MessageEvent.channel,
+                func.count(),
+                func.min(MessageEvent.position),
+            )
+            .where(
+                MessageEvent.day.between(start_date, end_date),
+                MessageEvent.issue_type.is_not(None),
+                MessageEvent.issue_type != "",
+            )
+            .group_by(MessageEvent.issue_type, MessageEvent.channel)
+        )
+        with self._session() as db:
+            rows = db.execute(query).all()
+        return [(issue, channel, int(count), int(first)) for issue, channel, count, first in rows]
+
+
+def get_message_aggregates() -> Optional[MessageAggregates]:
+    """SQL aggregates when Setting.DASHBOARD_BACKEND is "database", else None (in-memory store)"""
+    if Setting.DASHBOARD_BACKEND == "database":
+        return MessageAggregates(session)
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load message.json into the message_events table")
+    parser.add_argument("--source", type=Path, default=Setting.MESSAGES_JSON_PATH)
+    parser.add_argument("--batch-size", type=int, default=_BATCH_SIZE)
+    args = parser.parse_args()
+    rows = load_messages_into_database(args.source, batch_size=args.batch_size)
+    print(f"Loaded {rows} messages into message_events")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+Message Store
+Process-wide, version-aware cache of message.json shared by every dashboard service.
+The file is parsed once and only re-read when its mtime/size change.
+Columns and the rollup cube are built once per loaded version and extended
+in place of a rebuild when messages are appended.
+Files above Setting.MESSAGES_STREAM_THRESHOLD_MB are parsed incrementally:
+only the columns are kept, and the raw records are re-streamed on demand.
+New messages can also arrive through an append-only NDJSON log
+(Setting.MESSAGES_LOG_PATH); only lines added since the last read are parsed.
+That log is the only way to add messages when dashboard services run on a
+process pool: each worker has its own store and follows the log itself.
+When an up-to-date binary copy exists (Setting.MESSAGES_BINARY_PATH, see
+message_binary.py) its columns and time index are memory-mapped instead of
+parsing the file; the rollup cube is still aggregated per process.
+If a day-partitioned copy exists (Setting.MESSAGES_PARTITION_DIR, see
+message_partitions.py) it replaces message.json, and a reload only re-parses
+partitions whose files changed.
+"""
+
+from ...utils.logger import logger
+from ...utils.exceptions import DataLoadError
+from ...utils.json_stream import iter_json_array, iter_json_batches
+from ...core.config import Setting
+from pathlib import Path
+import json
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from .message_columns import MessageColumns
+from .rollup_cube import RollupCube
+from .time_index import TimeIndex
+from .message_log import MessageLogTail
+from .message_binary import read_message_binary
+from .message_partitions import MANIFEST_NAME, read_manifest
+from datetime import date
+
+
+STREAM_BATCH_SIZE = 10_000
+
+
+class StreamedMessages:
+    """
+    Re-iterable stand-in for the messages list of streamed files.
+    Every iteration streams the files again, followed by appended messages.
+    """
+
+    def __init__(self, paths: List[Path], appended: Optional[List[Dict[str, Any]]] = None):
+        self.paths = paths
+        self.appended = appended or []
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in self.paths:
+            yield from iter_json_array(path)
+        yield from self.appended
+
+    def __add__(self, messages: List[Dict[str, Any]]) -> "StreamedMessages":
+        return StreamedMessages(self.paths, self.appended + messages)
+
+
+class MessageSnapshot:
+    """
+    One frozen version of the store. It exposes the same read methods as
+    MessageStore, so services handed a snapshot all see identical data.
+    """
+
+    def __init__(
+        self,
+        version: Tuple[int, int, int],
+        messages: Iterable[Dict[str, Any]],
+        columns: MessageColumns,
+        cube: RollupCube,
+    ):
+        self.version = version
+        self._messages = messages
+        self._columns = columns
+        self._cube = cube
+
+    def get_messages(self) -> Iterable[Dict[str, Any]]:
+        return self._messages
+
+    def get_columns(self) -> MessageColumns:
+        return self._columns
+
+    def get_cube(self) -> RollupCube:
+        return self._cube
+
+    def get_day_columns(self, day: date) -> MessageColumns:
+        return self._columns.take(self._cube.index.rows_on_days(day, day))
+
+
+class MessageStore:
+    """
+    Holds the parsed messages list and reloads it when the file changes.
+    Messages appended to the log (or through append()) are added incrementally.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        stream_threshold_bytes: Optional[int] = None,
+        log_path: Optional[Path] = None,
+        binary_path: Optional[Path] = None,
+        partition_dir: Optional[Path] = None,
+    ):
+        self.path = Path(path)
+        if stream_threshold_bytes is None:
+            stream_threshold_bytes = Setting.MESSAGES_STREAM_THRESHOLD_MB * 1024 * 1024
+        self.stream_threshold_bytes = stream_threshold_bytes
+        self._log = MessageLogTail(log_path) if log_path is not None else None
+        self.binary_path = Path(binary_path) if binary_path is not None else None
+        # (inode, mtime_ns, size) of the binary file when the data was last loaded
+        self._binary_seen: Optional[Tuple[int, int, int]] = None
+        self.partition_dir = Path(partition_dir) if partition_dir is not None else None
+        # partition file name -> ((mtime_ns, size), parsed columns)
+        self._partitions: Dict[str, Tuple[Tuple[int, int], MessageColumns]] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._file_loaded: Optional[Tuple[int, int]] = None
+        self._appended = 0
+        # Messages added through append() (they exist in no file) over the store's lifetime
+        self._appended_in_process = 0
+        self._messages: Iterable[Dict[str, Any]] = []
+        self._columns: Optional[MessageColumns] = None
+        # Time index of _columns read from the binary copy, used when the cube is built
+        self._index: Optional[TimeIndex] = None
+        self._cube: Optional[RollupCube] = None
+
+    def _manifest_path(self) -> Optional[Path]:
+        """Partition manifest, if this store has a partitioned copy of the messages"""
+        if self.partition_dir is None:
+            return None
+        manifest = self.partition_dir / MANIFEST_NAME
+        return manifest if manifest.is_file() else None
+
+    def _file_version(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the backing file (or partition manifest), or None if it is missing"""
+        try:
+            stat = (self._manifest_path() or self.path).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_file(self) -> Optional[List[Dict[str, Any]]]:
+        """Parse the backing file. Returns None if the file could not be read."""
+        if not self.path.is_file():
+            logger.warning(f"Messages file not found: {self.path}")
+            return []
+
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                logger.error("Messages data is not a list")
+                return []
+            return data
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load messages file: {str(e)}")
+            return None
+
+    def _binary_version(self) -> Optional[Tuple[int, int, int]]:
+        """(inode, mtime_ns, size) of the binary file; a rebuild renames a new inode in"""
+        if self.binary_path is None:
+            return None
+        try:
+            stat = self.binary_path.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _map_binary(self, current: Optional[Tuple[int, int]]) -> Optional[Tuple[MessageColumns, TimeIndex]]:
+        """
+        Columns and time index memory-mapped from the binary file, or None if
+        there is none or it was built from a different version of the messages file
+        """
+        if self._binary_seen is None or current is None:
+            return None
+        try:
+            columns, index, header = read_message_binary(self.binary_path)
+        except DataLoadError as e:
+            logger.error(f"Ignoring message binary: {str(e)}")
+            return None
+        if header.get("source_version") != list(current):
+            logger.warning(f"Message binary {self.binary_path} is stale, parsing {self.path} instead")
+            return None
+        return columns, index
+
+    def _load_partitions(self) -> Optional[Tuple[Iterable[Dict[str, Any]], MessageColumns]]:
+        """
+        Columns of every partition in manifest order, re-parsing only the
+        partitions whose files changed since the last load.
+        Returns (messages view, columns), or None if a partition could not be read.
+        """
+        try:
+            entries = read_manifest(self.partition_dir)
+            partitions = {}
+            for entry in entries:
+                path = self.partition_dir / entry["file"]
+                stat = path.stat()
+                version = (stat.st_mtime_ns, stat.st_size)
+                cached = self._partitions.get(entry["file"])
+                if cached is None or cached[0] != version:
+                    cached = (version, MessageColumns.from_batches(iter_json_batches(path, STREAM_BATCH_SIZE)))
+                    logger.info(f"Parsed message partition {path} ({len(cached[1])} messages)")
+                partitions[entry["file"]] = cached
+        except (DataLoadError, OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load message partitions from {self.partition_dir}: {str(e)}")
+            return None
+
+        self._partitions = partitions
+        paths = [self.partition_dir / entry["file"] for entry in entries]
+        return StreamedMessages(paths), MessageColumns.concat([columns for _, columns in partitions.values()])
+
+    def _stream_file(self) -> Optional[Tuple[Iterable[Dict[str, Any]], MessageColumns]]:
+        """
+        Build columns straight from the file, one batch of records at a time.
+        Returns (messages view, columns), or None if the file could not be read.
+        """
+        try:
+            columns = MessageColumns.from_batches(iter_json_batches(self.path, STREAM_BATCH_SIZE))
+            return StreamedMessages([self.path]), columns
+        except DataLoadError:
+            logger.error("Messages data is not a list")
+            return [], MessageColumns.from_messages([])
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to stream messages file: {str(e)}")
+            return None
+
+    @property
+    def version(self) -> Tuple[int, int, int]:
+        """
+        Version of the currently loaded data (after a refresh):
+        (file mtime_ns, file size, messages appended since the file was loaded)
+        """
+        self.refresh()
+        return self._version
+
+    @property
+    def _version(self) -> Tuple[int, int, int]:
+        mtime_ns, size = self._file_loaded or (0, 0)
+        return mtime_ns, size, self._appended
+
+    def source_version(self) -> Tuple[Any, ...]:
+        """
+        Cheap version of the data the store would serve: the stats of the
+        backing file (or partition manifest), the binary copy and the message
+        log, plus the messages added through append(). Nothing is loaded or
+        refreshed, so it changes as soon as any input changes, before the
+        next refresh picks the change up.
+        """
+        return (
+            self._file_version(),
+            self._binary_version(),
+            self._log.stat() if self._log is not None else None,
+            self._appended_in_process,
+        )
+
+    def refresh(self) -> None:
+        """
+        Reload the file if its mtime/size differ from the loaded version, and
+        pick up lines appended to the message log since the last read
+        """
+        current = self._file_version()
+        if (
+            self._loaded
+            and current == self._file_loaded
+            and self._binary_version() == self._binary_seen
+            and not (self._log and self._log.has_changed())
+        ):
+            return
+
+        with self._lock:
+            current = self._file_version()
+            file_changed = (
+                not self._loaded
+                or current != self._file_loaded
+                or self._binary_version() != self._binary_seen
+            )
+            if self._log is not None and self._log.was_rewritten():
+                # Records we already hold are gone from the log: rebuild everything
+                logger.info(f"Message log {self._log.path} was truncated or replaced, reloading")
+                file_changed = True
+
+            if file_changed:
+                if not self._load_file(current):
+                    # Keep serving the last good copy; retry on the next call
+                    return
+                if self._log is not None:
+                    self._log.reset()
+
+            if self._log is not None:
+                records = self._log.read_new()
+                if records:
+                    self._append_locked(records)
+                    logger.info(f"Message store read {len(records)} messages from log {self._log.path}")
+
+    def _load_file(self, current: Optional[Tuple[int, int]]) -> bool:
+        """Load the backing file (call under lock). False if it could not be read."""
+        self._binary_seen = self._binary_version()
+        partitioned = self._manifest_path() is not None
+        mapped = None if partitioned else self._map_binary(current)
+        index = None
+        if partitioned:
+            loaded = self._load_partitions()
+            if loaded is None:
+                return False
+            self._messages, self._columns = loaded
+            count = len(self._columns)
+        elif mapped is not None:
+            # Raw records are only needed by a few callers: stream them on demand
+            self._messages = StreamedMessages([self.path])
+            self._columns, index = mapped
+            count = len(self._columns)
+        elif current is not None and current[1] >= self.stream_threshold_bytes:
+            streamed = self._stream_file()
+            if streamed is None:
+                return False
+            self._messages, self._columns = streamed
+            count = len(self._columns)
+        else:
+            data = self._read_file()
+            if data is None:
+                return False
+            self._messages = data
+            self._columns = None
+            count = len(data)
+
+        self._index = index
+        self._cube = None
+        self._file_loaded = current
+        self._appended = 0
+        self._loaded = True
+        logger.info(f"Message store loaded {count} messages from {self.partition_dir if partitioned else self.path}")
+        return True
+
+    def get_messages(self) -> Iterable[Dict[str, Any]]:
+        """
+        All messages from the file: a list shared between callers (treat it as
+        read-only), or a StreamedMessages for files that were stream-parsed.
+        """
+        self.refresh()
+        return self._messages
+
+    def _build_views(self) -> None:
+        """Build columns / cube for the loaded messages if missing (call under lock)"""
+        if self._columns is None:
+            self._columns = MessageColumns.from_messages(self._messages)
+        if self._cube is None:
+            self._cube = RollupCube.build(self._columns, self._index)
+
+    def get_columns(self) -> MessageColumns:
+        """Columnar view of the current messages, built once per version"""
+        self.refresh()
+        columns = self._columns
+        if columns is not None:
+            return columns
+
+        with self._lock:
+            if self._columns is None:
+                self._columns = MessageColumns.from_messages(self._messages)
+            return self._columns
+
+    def get_cube(self) -> RollupCube:
+        """Rollup cube over the current columns, built once per version"""
+        self.refresh()
+        cube = self._cube
+        if cube is not None:
+            return cube
+
+        with self._lock:
+            self._build_views()
+            return self._cube
+
+    def get_day_columns(self, day: date) -> MessageColumns:
+        """Columns of one day's messages, sliced out of the time index by binary search"""
+        cube = self.get_cube()
+        return cube.columns.take(cube.index.rows_on_days(day, day))
+
+    def append(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Add newly arrived messages to the loaded data.
+        Columns and cube only process the new rows; earlier snapshots are left untouched.
+        The messages exist only in this process, so this is refused when
+        dashboard services run on a process pool (Setting.EXECUTOR_PROCESSES > 0):
+        the workers would never see them. Write them to the message log
+        instead (message_log.append_messages), which every process follows.
+        """
+        if Setting.EXECUTOR_PROCESSES > 0:
+            raise RuntimeError(
+                "MessageStore.append() is not supported with EXECUTOR_PROCESSES > 0; "
+                "append to the message log instead"
+            )
+        if not messages:
+            return
+
+        self.refresh()
+        with self._lock:
+            self._append_locked(list(messages))
+            self._appended_in_process += len(messages)
+            logger.info(f"Message store appended {len(messages)} messages")
+
+    def _append_locked(self, messages: List[Dict[str, Any]]) -> None:
+        """Add messages after the current ones (call under lock)"""
+        self._messages = self._messages + messages
+        if self._columns is not None:
+            self._columns = self._columns.append(messages)
+            # The mapped index only covers the mapped rows: from here on the index is this process's own
+            self._index = None
+            if self._cube is not None:
+                self._cube = self._cube.extended(self._columns)
+        self._appended += len(messages)
+
+    def snapshot(self) -> MessageSnapshot:
+        """Pin the current version (messages + columns + cube) for a multi-widget request"""
+        self.refresh()
+        with self._lock:
+            self._build_views()
+            return MessageSnapshot(self._version, self._messages, self._columns, self._cube)
+
+
+_message_store: Optional[MessageStore] = None
+_message_store_lock = threading.Lock()
+
+
+def get_message_store() -> MessageStore:
+    """
+    Process-wide message store for Setting.MESSAGES_JSON_PATH
+    (+ Setting.MESSAGES_LOG_PATH, Setting.MESSAGES_BINARY_PATH, Setting.MESSAGES_PARTITION_DIR)
+    """
+    global _message_store
+    if _message_store is None:
+        with _message_store_lock:
+            if _message_store is None:
+                _message_store = MessageStore(
+                    Setting.MESSAGES_JSON_PATH,
+                    log_path=Setting.MESSAGES_LOG_PATH,
+                    binary_path=Setting.MESSAGES_BINARY_PATH,
+                    partition_dir=Setting.MESSAGES_PARTITION_DIR,
+                )
+    return _message_store
@@ -1,30 +1,21 @@
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import date, datetime, timedelta
-from ...core.config import Setting
-import json
+from datetime import date, timedelta
 from typing import List, Dict, Any, Optional
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
+from .rollup_cube import RollupCube
 
 
 class VolumeTrendsService:
     """Handles message volume trends calculation by period and channels."""
 
-    def _load_messages(self) -> List[Dict[str, Any]]:
-        path = Setting.MESSAGES_JSON_PATH
-        if not path.is_file():
-            logger.warning(f"Messages file not found: {path}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None, aggregates: Optional[MessageAggregates] = None):
+        self.store = store or get_message_store()
+        self.aggregates = aggregates or get_message_aggregates()
 
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load messages: {e}")
-            return []
+    def _get_cube(self) -> RollupCube:
+        return self.store.get_cube()
 
     def _get_date_range(self, period: str) -> tuple[date, date]:
         today = date.today()
@@ -38,49 +29,58 @@ class VolumeTrendsService:
             raise ValueError(f"Invalid period: {period}")
         return ranges[period]
 
-    def _filter_messages(
+    def _aggregate_daily(
         self,
-        messages: List[Dict[str, Any]],
+        cube: RollupCube,
         start_date: date,
         end_date: date,
         channels: Optional[List[str]] = None,
-    ) -> List[Dict[str, Any]]:
-        filtered = []
-        for msg in messages:
-            dt_str = msg.get("datetime")
-            if not dt_str:
-                continue
-            try:
-                msg_date = datetime.fromisoformat(dt_str).date()
-                if start_date <= msg_date <= end_date:
-                    ch = msg.get("channel")
-                    if channels is None or ch in channels:
-                        filtered.append(msg)
-            except (ValueError, TypeError):
-                continue
-        return filtered
+    ) -> tuple[Dict[str, Dict[str, int]], Dict[int, int]]:
+        columns = cube.columns
+        wanted = None
+        if channels is not None:
+            wanted = {columns.channel.code_of(ch) for ch in channels}
+        delivered_code = columns.status.code_of("DELIVERED")
+        failed_code = columns.status.code_of("FAILED")
 
-    def _aggregate_daily(self, messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
         daily = {}
-        hour_counts = {}
+        hour_totals = {}
+        hour_first_seen = {}
+        for day, (hour, channel, status, _), cell in cube.cells(start_date, end_date):
+            if wanted is not None and channel not in wanted:
+                continue
 
-        for msg in messages:
-            dt = datetime.fromisoformat(msg["datetime"])
-            day_str = dt.date().isoformat()
-            hour = dt.hour
+            d = daily.setdefault(str(day), {"sent": 0, "delivered": 0, "failed": 0})
+            d["sent"] += cell.count
+            if status == delivered_code:
+                d["delivered"] += cell.count
+            elif status == failed_code:
+                d["failed"] += cell.count
 
-            if day_str not in daily:
-                daily[day_str] = {"sent": 0, "delivered": 0, "failed": 0}
+            hour_totals[hour] = hour_totals.get(hour, 0) + cell.count
+            hour_first_seen[hour] = min(hour_first_seen.get(hour, cell.first_row), cell.first_row)
 
-            daily[day_str]["sent"] += 1
-            status = msg.get("status")
-            if status == "DELIVERED":
-                daily[day_str]["delivered"] += 1
-            elif status == "FAILED":
-                daily[day_str]["failed"] += 1
+        # Keep hours in order of first appearance so ties pick the same peak hour
+        hour_counts = {
+            hour: hour_totals[hour]
+            for hour in sorted(hour_totals, key=hour_first_seen.get)
+        }
 
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
+        return daily, hour_counts
 
+    def _aggregate_daily_sql(
+        self,
+        start_date: date,
+        end_date: date,
+        channels: Optional[List[str]] = None,
+    ) -> tuple[Dict[str, Dict[str, int]], Dict[int, int]]:
+        """_aggregate_daily computed by the database: one GROUP BY day, one GROUP BY hour"""
+        daily = {
+            str(day): {"sent": sent, "delivered": delivered, "failed": failed}
+            for day, sent, delivered, failed in self.aggregates.daily_volume(start_date, end_date, channels)
+        }
+        # Hours come back in order of first appearance, as in _aggregate_daily
+        hour_counts = dict(self.aggregates.hourly_volume(start_date, end_date, channels))
         return daily, hour_counts
 
     def get_volume_trends(
@@ -92,18 +92,22 @@ class VolumeTrendsService:
         Returns daily volume trends with totals, rates, peak hour, and spike note.
         """
         try:
-            all_msgs = self._load_messages()
-            if not all_msgs:
-                return {"data": [], "peak_hour": None, "note": "No data available"}
-
-            start_date, end_date = self._get_date_range(period)
-            filtered = self._filter_messages(all_msgs, start_date, end_date, channels)
-
-            if not filtered:
+            if self.aggregates is not None:
+                if not self.aggregates.has_messages():
+                    return {"data": [], "peak_hour": None, "note": "No data available"}
+                start_date, end_date = self._get_date_range(period)
+                daily, hour_counts = self._aggregate_daily_sql(start_date, end_date, channels)
+            else:
+                cube = self._get_cube()
+                if not cube.size:
+                    return {"data": [], "peak_hour": None, "note": "No data available"}
+
+                start_date, end_date = self._get_date_range(period)
+                daily, hour_counts = self._aggregate_daily(cube, start_date, end_date, channels)
+
+            if not daily:
                 return {"data": [], "peak_hour": None, "note": "No messages in period"}
 
-            daily, hour_counts = self._aggregate_daily(filtered)
-
             # Build result list (sorted by date)
             trends = []
             total_sent = total_delivered = 0
@@ -6,32 +6,63 @@ Includes per-bucket details for hover and overall improvement
 
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import datetime, date, timedelta
-from ...core.config import Setting
-import json
-from typing import List, Dict, Any, Optional
-from statistics import mean, median
-from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Any, Optional, Tuple
+from .message_store import MessageStore, get_message_store
+from .rollup_cube import RollupCube, RollupCell, SLA_SECONDS
+import numpy as np
+
+
+class _Bucket:
+    """Running resolution stats for one trend bucket"""
+
+    def __init__(self):
+        self.resolved = 0
+        self.res_sum = 0.0
+        self.res_min = float("inf")
+        self.res_max = float("-inf")
+        self.sla = 0
+        # issue_type code -> [count, earliest row]
+        self.causes: Dict[int, list] = {}
+
+    def _add_cause(self, issue: Optional[int], count: int, row: int) -> None:
+        if issue is None:
+            return
+        cause = self.causes.setdefault(issue, [0, row])
+        cause[0] += count
+        cause[1] = min(cause[1], row)
+
+    def add_cell(self, cell: RollupCell, issue: Optional[int]) -> None:
+        self.resolved += cell.res_count
+        self.res_sum += cell.res_sum
+        self.res_min = min(self.res_min, cell.res_min)
+        self.res_max = max(self.res_max, cell.res_max)
+        self.sla += cell.res_sla
+        self._add_cause(issue, cell.res_count, cell.res_first_row)
+
+    def add_row(self, row: int, res_time: float, issue: Optional[int]) -> None:
+        self.resolved += 1
+        self.res_sum += res_time
+        self.res_min = min(self.res_min, res_time)
+        self.res_max = max(self.res_max, res_time)
+        self.sla += res_time < SLA_SECONDS
+        self._add_cause(issue, 1, row)
+
+    def top_cause(self) -> Optional[Tuple[int, int]]:
+        """(issue code, count) of the most frequent cause, ties going to the one seen first"""
+        if not self.causes:
+            return None
+        issue, (count, _) = max(self.causes.items(), key=lambda item: (item[1][0], -item[1][1]))
+        return issue, count
 
 
 class ResolutionTimeTrendService:
     
-    def _load_messages(self) -> List[Dict[str, Any]]:
-        path = Setting.MESSAGES_JSON_PATH
-        if not path.is_file():
-            logger.warning(f"Messages file not found: {path}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None):
+        self.store = store or get_message_store()
 
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load messages: {e}")
-            return []
+    def _get_cube(self) -> RollupCube:
+        return self.store.get_cube()
 
     def _get_date_range(self, timeline: str) -> tuple[datetime, datetime]:
         now = datetime.now()
@@ -45,42 +76,65 @@ class ResolutionTimeTrendService:
             raise ValueError(f"Invalid timeline: {timeline}")
         return start, now
 
-    def _filter_messages(
+    def _bucket_key(self, day: date, hour: int, timeline: str) -> str:
+        if timeline == "24h":
+            return f"{hour:02d}:00"  # hourly
+        return str(day)  # daily
+
+    def _collect_buckets(
         self,
-        messages: List[Dict[str, Any]],
+        cube: RollupCube,
         start: datetime,
         end: datetime,
+        timeline: str,
         channel: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        filtered = []
-        for msg in messages:
-            dt_str = msg.get("datetime")
-            res_time = msg.get("resolution_time_seconds")
-            if not dt_str or not isinstance(res_time, (int, float)) or res_time <= 0:
+    ) -> Dict[str, _Bucket]:
+        """
+        Resolved messages (status RESOLVED, positive resolution time) within
+        [start, end], accumulated per bucket. Whole hours come from the cube;
+        the partial hours at either end come from the raw rows.
+        """
+        columns = cube.columns
+        resolved_code = columns.status.code_of("RESOLVED")
+        channel_code = columns.channel.code_of(channel) if channel is not None else None
+        has_cause = [bool(label) for label in columns.issue_type.labels]
+
+        first_hour = start.replace(minute=0, second=0, microsecond=0)
+        last_hour = end.replace(minute=0, second=0, microsecond=0)
+        buckets: Dict[str, _Bucket] = {}
+
+        for day, (hour, cell_channel, status, issue), cell in cube.cells(first_hour.date(), last_hour.date()):
+            if status != resolved_code or not cell.res_count:
+                continue
+            if channel_code is not None and cell_channel != channel_code:
                 continue
-            try:
-                msg_dt = datetime.fromisoformat(dt_str)
-                if start <= msg_dt <= end and msg.get("status") == "RESOLVED":
-                    ch = msg.get("channel")
-                    if channel is None or ch == channel:
-                        filtered.append(msg)
-            except (ValueError, TypeError):
+            slot = datetime.combine(day, time(hour))
+            if not first_hour < slot < last_hour:
                 continue
-        return filtered
+            bucket = buckets.setdefault(self._bucket_key(day, hour, timeline), _Bucket())
+            bucket.add_cell(cell, issue if has_cause[issue] else None)
+
+        # Partial hours at the edges: sliced out of the time index by binary search
+        if first_hour == last_hour:
+            rows = cube.index.rows_between(start, end)
+        else:
+            rows = np.concatenate([
+                cube.index.rows_between(start, first_hour + timedelta(hours=1), end_inclusive=False),
+                cube.index.rows_between(last_hour, end),
+            ])
+        keep = (
+            (columns.status.codes[rows] == resolved_code)
+            & (columns.resolution_time[rows] > 0)  # NaN fails the > 0 check
+        )
+        if channel_code is not None:
+            keep &= columns.channel.codes[rows] == channel_code
+
+        for row in rows[keep].tolist():
+            ts = columns.timestamp[row].astype(datetime)
+            issue = int(columns.issue_type.codes[row])
+            bucket = buckets.setdefault(self._bucket_key(ts.date(), ts.hour, timeline), _Bucket())
+            bucket.add_row(row, float(columns.resolution_time[row]), issue if has_cause[issue] else None)
 
-    def _bucket_messages(
-        self,
-        messages: List[Dict[str, Any]],
-        timeline: str,
-    ) -> Dict[str, List[Dict[str, Any]]]:
-        buckets = {}
-        for msg in messages:
-            dt = datetime.fromisoformat(msg["datetime"])
-            if timeline == "24h":
-                bucket_key = dt.strftime("%H:00")  # hourly
-            else:
-                bucket_key = dt.date().isoformat()  # daily
-            buckets.setdefault(bucket_key, []).append(msg)
         return buckets
 
     def _calculate_improvement(self, current_avg: float, previous_avg: float) -> float:
@@ -101,42 +155,39 @@ class ResolutionTimeTrendService:
         Includes per-bucket hover details and overall improvement
         """
         try:
-            all_msgs = self._load_messages()
-            if not all_msgs:
+            cube = self._get_cube()
+            if not cube.size:
                 return {"data": [], "improvement": 0.0, "note": "No data available"}
 
             curr_start, curr_end = self._get_date_range(timeline)
-            curr_filtered = self._filter_messages(all_msgs, curr_start, curr_end, channel)
 
-            if not curr_filtered:
+            # Aggregate per bucket
+            buckets = self._collect_buckets(cube, curr_start, curr_end, timeline, channel)
+
+            if not buckets:
                 return {"data": [], "improvement": 0.0, "note": "No resolutions in period"}
 
-            # Aggregate per bucket
-            buckets = self._bucket_messages(curr_filtered, timeline)
             trends = []
-
-            total_res_times = []
-            resolved_count = len(curr_filtered)
+            resolved_count = sum(bucket.resolved for bucket in buckets.values())
+            labels = cube.columns.issue_type.labels
 
             for bucket_key in sorted(buckets):
-                bucket_msgs = buckets[bucket_key]
-                res_times = [m["resolution_time_seconds"] for m in bucket_msgs]
+                bucket = buckets[bucket_key]
 
-                if not res_times:
+                if not bucket.resolved:
                     continue
 
-                avg = round(mean(res_times) / 60, 1)  # in minutes
-                fastest = min(res_times) / 60
-                slowest = max(res_times) / 60
+                avg = round(bucket.res_sum / bucket.resolved / 60, 1)  # in minutes
+                fastest = bucket.res_min / 60
+                slowest = bucket.res_max / 60
 
                 # Top cause
-                causes = Counter(m.get("issue_type") for m in bucket_msgs if m.get("issue_type"))
-                top_cause = causes.most_common(1)
-                top_cause_type = top_cause[0][0] if top_cause else None
-                top_cause_pct = round(top_cause[0][1] / len(bucket_msgs) * 100, 1) if top_cause else 0.0
+                top_cause = bucket.top_cause()
+                top_cause_type = labels[top_cause[0]] if top_cause else None
+                top_cause_pct = round(top_cause[1] / bucket.resolved * 100, 1) if top_cause else 0.0
 
                 # SLA (assume SLA threshold = 30 min, adjust if needed)
-                sla_met = round(sum(t/60 < 30 for t in res_times) / len(res_times) * 100, 1)
+                sla_met = round(bucket.sla / bucket.resolved * 100, 1)
 
                 trends.append({
                     "bucket": bucket_key,
@@ -144,28 +195,26 @@ class ResolutionTimeTrendService:
                     "sla_met": sla_met,
                     "fastest": round(fastest, 1),
                     "slowest": round(slowest, 1),
-                    "resolved": len(bucket_msgs),
+                    "resolved": bucket.resolved,
                     "top_cause": {
                         "type": top_cause_type,
                         "percentage": top_cause_pct
                     }
                 })
 
-                total_res_times.extend(res_times)
-
             if not trends:
                 return {"data": [], "improvement": 0.0, "note": "No resolutions in period"}
 
             # Overall avg for current period (in minutes)
-            current_avg = round(mean(total_res_times) / 60, 1)
+            current_avg = round(sum(bucket.res_sum for bucket in buckets.values()) / resolved_count / 60, 1)
 
             # Previous period for improvement (same length as current)
             prev_end = curr_start - timedelta(seconds=1)
             prev_start = prev_end - (curr_end - curr_start)
-            prev_filtered = self._filter_messages(all_msgs, prev_start, prev_end, channel)
-            prev_res_times = [m["resolution_time_seconds"] for m in prev_filtered]
+            prev_buckets = self._collect_buckets(cube, prev_start, prev_end, timeline, channel).values()
+            prev_resolved = sum(bucket.resolved for bucket in prev_buckets)
 
-            previous_avg = mean(prev_res_times) / 60 if prev_res_times else 0.0
+            previous_avg = sum(bucket.res_sum for bucket in prev_buckets) / prev_resolved / 60 if prev_resolved else 0.0
             improvement = self._calculate_improvement(current_avg, previous_avg)
 
             note = f"Resolution Time Improved by {improvement}% vs last {timeline.replace('h', ' hours').replace('days', ' days')}." if improvement > 0 else "No improvement in resolution time."
@@ -0,0 +1,191 @@
+"""
+Rollup Cube
+Pre-aggregated message stats keyed by (date, hour, channel, status, issue_type).
+Time-bucketed dashboard queries walk the cells of the requested days instead of
+every message, so their cost follows the number of buckets, not the row count.
+Channel / status / issue_type are codes of the MessageColumns the cube covers.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterator, Optional, Set, Tuple
+import numpy as np
+from .message_columns import MessageColumns
+from .time_index import TimeIndex
+
+
+SLA_SECONDS = 30 * 60
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# (hour, channel code, status code, issue_type code) within one day
+CellKey = Tuple[int, int, int, int]
+
+
+class RollupCell:
+    """
+    Stats for one cube cell.
+    - count / first_row: all messages in the cell, and the earliest row among them
+    - res_*: messages with a positive resolution time (sum in seconds,
+      sla = resolved in under SLA_SECONDS)
+    - csat_*: messages with a numeric CSAT score
+    - escalated / active_escalations: escalated, and escalated but not resolved
+    """
+
+    __slots__ = (
+        "count", "first_row",
+        "res_count", "res_sum", "res_min", "res_max", "res_sla", "res_first_row",
+        "csat_count", "csat_sum",
+        "escalated", "active_escalations",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.first_row = -1
+        self.res_count = 0
+        self.res_sum = 0.0
+        self.res_min = float("inf")
+        self.res_max = float("-inf")
+        self.res_sla = 0
+        self.res_first_row = -1
+        self.csat_count = 0
+        self.csat_sum = 0.0
+        self.escalated = 0
+        self.active_escalations = 0
+
+    def copy(self) -> "RollupCell":
+        cell = RollupCell()
+        for name in self.__slots__:
+            setattr(cell, name, getattr(self, name))
+        return cell
+
+
+def _earliest(current: int, row: int) -> int:
+    """Earlier of two row ids, -1 meaning "none yet" """
+    if row < 0:
+        return current
+    return row if current < 0 else min(current, row)
+
+
+class RollupCube:
+    """
+    Cells grouped per day, plus a TimeIndex over the same columns so callers
+    can handle windows that don't align with whole hours from the raw rows.
+    A cube is never mutated once built; extended() returns a new one.
+    """
+
+    def __init__(
+        self,
+        columns: MessageColumns,
+        index: TimeIndex,
+        days: Optional[Dict[date, Dict[CellKey, RollupCell]]] = None,
+        size: int = 0,
+    ):
+        self.columns = columns
+        self.index = index
+        self.days = days if days is not None else {}
+        self.size = size
+
+    @classmethod
+    def build(cls, columns: MessageColumns, index: Optional[TimeIndex] = None) -> "RollupCube":
+        """Cube over columns; index: their time index if already built (e.g. memory-mapped)"""
+        cube = cls(columns, index if index is not None else TimeIndex.build(columns))
+        cube._fold(start=0)
+        return cube
+
+    def extended(self, columns: MessageColumns) -> "RollupCube":
+        """
+        Cube for columns that hold this cube's rows plus newly appended ones.
+        Only the new rows are aggregated; days they don't touch are shared.
+        """
+        cube = RollupCube(columns, self.index.extended(columns, self.size), dict(self.days), self.size)
+        cube._fold(start=self.size)
+        return cube
+
+    def _fold(self, start: int) -> None:
+        """Aggregate rows [start:] of self.columns into the cells"""
+        columns = self.columns
+        rows = np.arange(start, len(columns))
+        rows = rows[~np.isnat(columns.timestamp[start:])]
+        self.size = len(columns)
+        if not rows.size:
+            return
+
+        day_num = columns.day[rows].astype(np.int64)
+        hour_key = day_num * 24 + columns.hour[rows]
+        n_channel = len(columns.channel.labels)
+        n_status = len(columns.status.labels)
+        n_issue = len(columns.issue_type.labels)
+        keys = (
+            (hour_key * n_channel + columns.channel.codes[rows]) * n_status
+            + columns.status.codes[rows]
+        ) * n_issue + columns.issue_type.codes[rows]
+
+        unique, first_seen, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        size = len(unique)
+
+        count = np.bincount(inverse, minlength=size)
+
+        res = columns.resolution_time[rows].astype(np.float64)
+        positive = res > 0
+        res_inverse = inverse[positive]
+        res_values = res[positive]
+        res_count = np.bincount(res_inverse, minlength=size)
+        res_sum = np.bincount(res_inverse, weights=res_values, minlength=size)
+        res_min = np.full(size, np.inf)
+        np.minimum.at(res_min, res_inverse, res_values)
+        res_max = np.full(size, -np.inf)
+        np.maximum.at(res_max, res_inverse, res_values)
+        res_sla = np.bincount(res_inverse[res_values < SLA_SECONDS], minlength=size)
+        res_first_row = np.full(size, np.iinfo(np.int64).max)
+        np.minimum.at(res_first_row, res_inverse, rows[positive])
+
+        csat = columns.csat_score[rows].astype(np.float64)
+        has_csat = ~np.isnan(csat)
+        csat_count = np.bincount(inverse[has_csat], minlength=size)
+        csat_sum = np.bincount(inverse[has_csat], weights=csat[has_csat], minlength=size)
+
+        escalated = columns.escalated[rows]
+        escalated_count = np.bincount(inverse[escalated], minlength=size)
+        active_count = np.bincount(inverse[escalated & ~columns.resolved[rows]], minlength=size)
+
+        first_row = rows[first_seen]
+
+        # Copy a day's cells before touching them: older cubes may still share them
+        touched: Set[date] = set()
+        for i, key in enumerate(unique.tolist()):
+            key, issue = divmod(key, n_issue)
+            key, status = divmod(key, n_status)
+            key, channel = divmod(key, n_channel)
+            day_offset, hour = divmod(key, 24)
+            day = date.fromordinal(_EPOCH_ORDINAL + day_offset)
+
+            if day not in touched:
+                touched.add(day)
+                self.days[day] = {k: c.copy() for k, c in self.days.get(day, {}).items()}
+
+            cells = self.days[day]
+            cell_key = (hour, channel, status, issue)
+            cell = cells.get(cell_key)
+            if cell is None:
+                cell = cells[cell_key] = RollupCell()
+
+            cell.count += int(count[i])
+            cell.first_row = _earliest(cell.first_row, int(first_row[i]))
+            if res_count[i]:
+                cell.res_count += int(res_count[i])
+                cell.res_sum += float(res_sum[i])
+                cell.res_min = min(cell.res_min, float(res_min[i]))
+                cell.res_max = max(cell.res_max, float(res_max[i]))
+                cell.res_sla += int(res_sla[i])
+                cell.res_first_row = _earliest(cell.res_first_row, int(res_first_row[i]))
+            cell.csat_count += int(csat_count[i])
+            cell.csat_sum += float(csat_sum[i])
+            cell.escalated += int(escalated_count[i])
+            cell.active_escalations += int(active_count[i])
+
+    def cells(self, start_date: date, end_date: date) -> Iterator[Tuple[date, CellKey, RollupCell]]:
+        """(day, (hour, channel, status, issue_type), cell) for days in [start_date, end_date]"""
+        day = start_date
+        while day <= end_date:
+            for key, cell in self.days.get(day, {}).items():
+                yield day, key, cell
+            day += timedelta(days=1)
@@ -0,0 +1,61 @@
+"""
+Time Index
+Message row ids ordered by datetime, with the sorted timestamps alongside,
+so any time window resolves to a contiguous slice via binary search.
+"""
+
+from datetime import date, datetime, time, timedelta
+import numpy as np
+from .message_columns import MessageColumns
+
+
+class TimeIndex:
+    """
+    order: row ids sorted by timestamp (ties keep row order)
+    times: the timestamps of those rows (datetime64[us]), ascending
+    Rows without a valid datetime are not indexed.
+    """
+
+    def __init__(self, order: np.ndarray, times: np.ndarray):
+        self.order = order
+        self.times = times
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def build(cls, columns: MessageColumns, start: int = 0) -> "TimeIndex":
+        """Index of rows [start:] of columns"""
+        timestamps = columns.timestamp[start:]
+        rows = np.flatnonzero(~np.isnat(timestamps))
+        rows = rows[np.argsort(timestamps[rows], kind="stable")]
+        return cls(rows + start, timestamps[rows])
+
+    def extended(self, columns: MessageColumns, start: int) -> "TimeIndex":
+        """
+        Index that also covers rows [start:] of columns. New rows later than
+        everything indexed (the usual case) are appended; otherwise merged in.
+        """
+        added = TimeIndex.build(columns, start)
+        if not len(added):
+            return self
+        if not len(self) or added.times[0] >= self.times[-1]:
+            return TimeIndex(np.concatenate([self.order, added.order]), np.concatenate([self.times, added.times]))
+
+        # side="right": new rows go after indexed rows with the same timestamp
+        positions = np.searchsorted(self.times, added.times, side="right")
+        return TimeIndex(np.insert(self.order, positions, added.order), np.insert(self.times, positions, added.times))
+
+    def rows_between(self, start: datetime, end: datetime, end_inclusive: bool = True) -> np.ndarray:
+        """Row ids (in time order) with start <= datetime <= end (< end if not end_inclusive)"""
+        lo = np.searchsorted(self.times, np.datetime64(start, "us"), side="left")
+        hi = np.searchsorted(self.times, np.datetime64(end, "us"), side="right" if end_inclusive else "left")
+        return self.order[lo:max(lo, hi)]
+
+    def rows_on_days(self, start_date: date, end_date: date) -> np.ndarray:
+        """Row ids of messages dated within [start_date, end_date] (inclusive)"""
+        return self.rows_between(
+            datetime.combine(start_date, time()),
+            datetime.combine(end_date + timedelta(days=1), time()),
+            end_inclusive=False,
+        )
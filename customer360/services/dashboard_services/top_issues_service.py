@@ -6,69 +6,76 @@ Includes affected channel and % change vs previous 7 days
 
 from ...utils.exceptions import CalculationError
 from ...utils.logger import logger
-from datetime import date, datetime, timedelta
-from ...core.config import Setting
-import json
+from datetime import date, timedelta
 from typing import List, Dict, Any, Optional
-from collections import Counter
+from .message_store import MessageStore, get_message_store
+from .message_sql import MessageAggregates, get_message_aggregates
+from .rollup_cube import RollupCube
 
 
 class TopIssuesService:
     
-    def _load_messages(self) -> List[Dict[str, Any]]:
-        path = Setting.MESSAGES_JSON_PATH
-        if not path.is_file():
-            logger.warning(f"Messages file not found: {path}")
-            return []
+    def __init__(self, store: Optional[MessageStore] = None, aggregates: Optional[MessageAggregates] = None):
+        self.store = store or get_message_store()
+        self.aggregates = aggregates or get_message_aggregates()
 
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, list) else []
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Failed to load messages: {e}")
-            return []
+    def _get_cube(self) -> RollupCube:
+        return self.store.get_cube()
 
     def _get_date_range(self, days_back: int) -> tuple[date, date]:
         today = date.today()
         start = today - timedelta(days=days_back - 1)
         return start, today
 
-    def _filter_messages(
-        self,
-        messages: List[Dict[str, Any]],
-        start_date: date,
-        end_date: date,
-    ) -> List[Dict[str, Any]]:
-        filtered = []
-        for msg in messages:
-            dt_str = msg.get("datetime")
-            if not dt_str:
-                continue
-            try:
-                msg_date = datetime.fromisoformat(dt_str).date()
-                if start_date <= msg_date <= end_date and msg.get("issue_type"):
-                    filtered.append(msg)
-            except (ValueError, TypeError):
+    def _aggregate_issues(self, cube: RollupCube, start_date: date, end_date: date) -> Dict[str, Dict[str, Any]]:
+        labels = cube.columns.issue_type.labels
+        channel_labels = cube.columns.channel.labels
+
+        volumes = {}
+        channels = {}
+        first_seen = {}
+        for _, (_, channel, _, issue), cell in cube.cells(start_date, end_date):
+            if not labels[issue]:
                 continue
-        return filtered
+            volumes[issue] = volumes.get(issue, 0) + cell.count
+            first_seen[issue] = min(first_seen.get(issue, cell.first_row), cell.first_row)
+            if channel_labels[channel]:
+                pair = (issue, channel)
+                channels[pair] = channels.get(pair, 0) + cell.count
+                first_seen[pair] = min(first_seen.get(pair, cell.first_row), cell.first_row)
+
+        # Issues and their channels are keyed in order of first appearance,
+        # so ties on volume / primary channel resolve as they always have
+        issues = {}
+        for issue in sorted(volumes, key=first_seen.get):
+            issues[labels[issue]] = {
+                "volume": volumes[issue],
+                "channels": {}
+            }
+        for issue, channel in sorted(channels, key=first_seen.get):
+            issues[labels[issue]]["channels"][channel_labels[channel]] = channels[(issue, channel)]
+        return issues
+
+    def _aggregate_issues_sql(self, start_date: date, end_date: date) -> Dict[str, Dict[str, Any]]:
+        """_aggregate_issues computed by the database: one GROUP BY issue_type, channel"""
+        volumes = {}
+        channels = {}
+        first_seen = {}
+        for issue, channel, count, first in self.aggregates.issue_channel_volume(start_date, end_date):
+            volumes[issue] = volumes.get(issue, 0) + count
+            first_seen[issue] = min(first_seen.get(issue, first), first)
+            if channel:
+                channels[(issue, channel)] = count
+                first_seen[(issue, channel)] = first
 
-    def _aggregate_issues(self, messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         issues = {}
-        for msg in messages:
-            issue_type = msg["issue_type"]
-            if issue_type not in issues:
-                issues[issue_type] = {
-                    "volume": 0,
-                    "channels": Counter()
-                }
-            issues[issue_type]["volume"] += 1
-            ch = msg.get("channel")
-            if ch:
-                issues[issue_type]["channels"][ch] += 1
+        for issue in sorted(volumes, key=first_seen.get):
+            issues[issue] = {
+                "volume": volumes[issue],
+                "channels": {}
+            }
+        for issue, channel in sorted(channels, key=first_seen.get):
+            issues[issue]["channels"][channel] = channels[(issue, channel)]
         return issues
 
     def get_top_issues(self) -> List[Dict[str, Any]]:
@@ -77,20 +84,22 @@ class TopIssuesService:
         Includes: issue_type, volume, primary_channel, percent_change vs previous 7 days.
         """
         try:
-            all_msgs = self._load_messages()
-            if not all_msgs:
-                return []
+            if self.aggregates is not None:
+                aggregate = self._aggregate_issues_sql
+            else:
+                cube = self._get_cube()
+                if not cube.size:
+                    return []
+                aggregate = lambda start, end: self._aggregate_issues(cube, start, end)
 
             # Current period: last 7 days
             curr_start, curr_end = self._get_date_range(7)
-            curr_filtered = self._filter_messages(all_msgs, curr_start, curr_end)
-            curr_issues = self._aggregate_issues(curr_filtered)
+            curr_issues = aggregate(curr_start, curr_end)
 
             # Previous period: days 8-14 before today
             prev_start = curr_start - timedelta(days=7)
             prev_end = curr_start - timedelta(days=1)
-            prev_filtered = self._filter_messages(all_msgs, prev_start, prev_end)
-            prev_issues = self._aggregate_issues(prev_filtered)
+            prev_issues = aggregate(prev_start, prev_end)
 
             # Build result
             result = []
@@ -3,7 +3,21 @@ from datetime import timedelta , datetime
 from jose import jwt , JWTError
 from ..utils.exceptions import DatabaseError , EmployeeNotFoundError , InvalidCredentialsError ,TokenError , AuthenticationError
 from ..utils.logger import logger
-from typing import Dict , Any
+from ..Database.config import get_async_session_factory
+from ..Database.model.db_model import RevokedToken
+from typing import Dict , Any , Optional , Tuple
+from collections import OrderedDict
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+import hashlib
+import threading
+import time
+
+
+def _token_digest(token: str) -> bytes:
+    """SHA-256 of a token: what the cache and the revoked_tokens table store instead of the token"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
 
 # ==================== Token Service ====================
 class TokenService:
@@ -44,6 +58,11 @@ class TokenService:
         """
         Decode and validate JWT token
         """
+        return TokenService._decode(token)[0]
+
+    @staticmethod
+    def _decode(token: str) -> Tuple[Dict[str, Any], Optional[float]]:
+        """(employee dict, exp as a unix timestamp or None) of a valid token"""
         try:
             payload = jwt.decode(
                 token,
@@ -57,7 +76,8 @@ class TokenService:
             if username is None or emp_id is None:
                 raise TokenError("Invalid token payload")
 
-            return {'Emp_email': username, 'Emp_id': emp_id}
+            exp = payload.get('exp')
+            return {'Emp_email': username, 'Emp_id': emp_id}, float(exp) if exp is not None else None
 
         except JWTError as e:
             logger.warning(f"JWT validation failed: {str(e)}")
@@ -66,3 +86,164 @@ class TokenService:
             logger.error(f"Token decoding error: {str(e)}")
             raise TokenError(f"Token decoding failed: {str(e)}")
 
+    @staticmethod
+    async def verify_token(token: str) -> Dict[str, Any]:
+        """
+        decode_token through the verified-token cache: a token seen before is
+        not verified again until its cache entry expires. On a miss the token
+        is also looked up in revoked_tokens, so a logout on any worker is
+        honoured here within Setting.TOKEN_CACHE_TTL_SECONDS.
+        """
+        cached = token_cache.get(token)
+        if cached is not None:
+            return cached
+        employee, exp = TokenService._decode(token)
+        if await TokenService._is_revoked(token):
+            token_cache.reject(token, exp)
+            raise TokenError("Token has been revoked")
+        token_cache.put(token, employee, exp)
+        return dict(employee)
+
+    @staticmethod
+    async def _is_revoked(token: str) -> bool:
+        """Whether token is in revoked_tokens. Fails closed: TokenError if the table can't be read."""
+        try:
+            async with get_async_session_factory()() as db:
+                result = await db.execute(
+                    select(RevokedToken.token_digest)
+                    .where(RevokedToken.token_digest == _token_digest(token).hex())
+                    .limit(1)
+                )
+                return result.first() is not None
+        except SQLAlchemyError as e:
+            logger.error(f"Token revocation check failed: {str(e)}")
+            raise TokenError(f"Cannot check token revocation: {str(e)}")
+
+    @staticmethod
+    async def revoke_token(token: str) -> None:
+        """
+        Reject token on every worker from now until it expires (logout):
+        recorded in revoked_tokens, and dropped from this worker's cache.
+        Rows of tokens that have expired since are deleted on the way.
+        """
+        try:
+            exp = jwt.get_unverified_claims(token).get('exp')
+        except JWTError:
+            exp = None
+        exp = float(exp) if exp is not None else None
+        now = datetime.utcnow()
+
+        try:
+            async with get_async_session_factory()() as db:
+                await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+                db.add(RevokedToken(
+                    token_digest=_token_digest(token).hex(),
+                    expires_at=datetime.utcfromtimestamp(exp) if exp is not None else None,
+                ))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # Already revoked (e.g. a concurrent logout on another worker)
+                    await db.rollback()
+        except SQLAlchemyError as e:
+            logger.error(f"Failed to record revoked token: {str(e)}")
+            raise DatabaseError(f"Failed to revoke token: {str(e)}")
+        token_cache.revoke(token, exp)
+
+
+# ==================== Verified Token Cache ====================
+class TokenCache:
+    """
+    Employees of verified tokens, keyed by the token's SHA-256 digest (the
+    raw token is never stored), so a token presented on every request of
+    its lifetime is verified once instead of per request.
+
+    An entry lives until the token's exp or for ttl_seconds, whichever
+    comes first; at most max_entries are kept (least recently used dropped).
+    Digests this process knows to be revoked are remembered until their
+    token's exp and win over the cache. The shared list of revoked tokens is
+    the revoked_tokens table (TokenService.verify_token checks it on every
+    miss), so ttl_seconds bounds how long another worker's logout takes to
+    reach this one.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._revoked: Dict[bytes, float] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+
+    def _purge_revoked(self, now: float) -> None:
+        for digest in [digest for digest, until in self._revoked.items() if until <= now]:
+            del self._revoked[digest]
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Employee of a cached, unexpired token, None if it must be verified; TokenError if revoked"""
+        digest = _token_digest(token)
+        now = time.time()
+        with self._lock:
+            if digest in self._revoked:
+                if self._revoked[digest] > now:
+                    self._rejected += 1
+                    raise TokenError("Token has been revoked")
+                del self._revoked[digest]
+            entry = self._entries.get(digest)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[digest]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self._hits += 1
+            return dict(entry[0])
+
+    def put(self, token: str, employee: Dict[str, Any], exp: Optional[float]) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds if exp is None else min(exp, now + self.ttl_seconds)
+        if expires_at <= now:
+            return
+        digest = _token_digest(token)
+        with self._lock:
+            if digest in self._revoked:
+                return
+            self._entries[digest] = (dict(employee), expires_at)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def reject(self, token: str, exp: Optional[float]) -> None:
+        """Remember a token found revoked elsewhere (see revoke) and count the rejection"""
+        self.revoke(token, exp)
+        with self._lock:
+            self._rejected += 1
+
+    def revoke(self, token: str, exp: Optional[float]) -> None:
+        """Drop token from the cache and reject it until exp (for ttl_seconds if exp is unknown)"""
+        digest = _token_digest(token)
+        now = time.time()
+        until = exp if exp is not None else now + self.ttl_seconds
+        with self._lock:
+            self._entries.pop(digest, None)
+            self._purge_revoked(now)
+            if until > now:
+                self._revoked[digest] = until
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "revoked": len(self._revoked),
+                "rejected_revoked": self._rejected,
+            }
+
+
+token_cache = TokenCache(Setting.TOKEN_CACHE_SIZE, Setting.TOKEN_CACHE_TTL_SECONDS)
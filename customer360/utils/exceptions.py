@@ -40,3 +40,10 @@ class CalculationError(KPIError):
     """Raised when KPI calculation fails"""
     pass
 
+
+class ExecutorBusyError(Exception):
+    """Raised when an executor's queue is full; retry_after: suggested wait in seconds"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,104 @@
+"""
+Incremental reader for files holding one top-level JSON array.
+Yields the array's elements one at a time, so memory stays at one read
+chunk plus the element being decoded, whatever the file size.
+"""
+
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterator, List, Union
+
+from .exceptions import DataLoadError
+
+
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Text buffer over a file that refills in fixed-size chunks"""
+
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read another chunk, dropping what was consumed. False at end of file."""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def char_after(self, index: int) -> str:
+        """First non-whitespace character at or after index in the current buffer ("" if none)"""
+        while index < len(self.buffer) and self.buffer[index] in _WHITESPACE:
+            index += 1
+        return self.buffer[index] if index < len(self.buffer) else ""
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of file), without consuming it"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+
+def iter_json_array(path: Union[str, Path], chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield each element of the JSON array stored in path.
+    Raises DataLoadError if the top-level value is not an array and
+    json.JSONDecodeError if the file is malformed or truncated.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        reader = _Reader(f, chunk_size)
+
+        if reader.peek() != "[":
+            raise DataLoadError(f"Top-level JSON value in {path} is not an array")
+        reader.pos += 1
+
+        if reader.peek() == "]":
+            return
+
+        while True:
+            reader.peek()
+            try:
+                value, end = decoder.raw_decode(reader.buffer, reader.pos)
+            except json.JSONDecodeError:
+                # Element split across chunks: read more and retry
+                if reader.fill():
+                    continue
+                raise
+            if not reader.eof and reader.char_after(end) not in (",", "]"):
+                # No delimiter after it yet, so the element (e.g. a number cut
+                # mid-way) may continue in the next chunk
+                reader.fill()
+                continue
+            reader.pos = end
+            yield value
+
+            separator = reader.peek()
+            if separator == "]":
+                return
+            if separator != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", reader.buffer, reader.pos)
+            reader.pos += 1
+
+
+def iter_json_batches(path: Union[str, Path], batch_size: int) -> Iterator[List[Any]]:
+    """iter_json_array grouped into lists of up to batch_size elements"""
+    elements = iter_json_array(path)
+    while True:
+        batch = list(islice(elements, batch_size))
+        if not batch:
+            return
+        yield batch
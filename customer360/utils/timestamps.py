@@ -0,0 +1,47 @@
+"""
+Timestamp parsing shared by every data loader.
+Records are normalized once at ingest, so request handlers compare
+pre-parsed values instead of calling fromisoformat per access.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """
+    ISO date / datetime string as a naive datetime (wall-clock time kept for
+    offset-aware values). None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    return parsed.replace(tzinfo=None)
+
+
+def epoch_us(value: datetime) -> int:
+    """Microseconds since 1970-01-01 for a naive datetime (same scale as datetime64[us])"""
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def timestamp_fields(prefix: str, value: Any) -> Dict[str, Any]:
+    """
+    Pre-parsed fields for a raw timestamp value:
+    {prefix}_at (datetime), {prefix}_epoch_us (int), {prefix}_day (date),
+    {prefix}_hour (int) - all None if the value is missing or invalid.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        return {f"{prefix}_at": None, f"{prefix}_epoch_us": None, f"{prefix}_day": None, f"{prefix}_hour": None}
+    return {
+        f"{prefix}_at": parsed,
+        f"{prefix}_epoch_us": epoch_us(parsed),
+        f"{prefix}_day": parsed.date(),
+        f"{prefix}_hour": parsed.hour,
+    }
@@ -0,0 +1,27 @@
+import os
+import tempfile
+
+# Setting reads the environment on import: point it at a throwaway SQLite database first
+_DB_DIR = tempfile.mkdtemp(prefix="customer360-tests-")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_DIR}/customer360.db")
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from customer360 import api
+from customer360.Database.config import Base, engine
+from customer360.services import token_service
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(token_service, "token_cache", token_service.TokenCache(100, 300))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    app = FastAPI()
+    app.include_router(api.router)
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from customer360.core.executors import password_executor
+from customer360.core.security import Hashing, hash_rounds
+from customer360.Database.config import session
+from customer360.Database.model.db_model import EmployeeCreate
+from customer360.utils.exceptions import ExecutorBusyError
+
+
+EMAIL = "agent@example.com"
+PASSWORD = "pw123456"
+
+
+@pytest.fixture
+def stale_hash(client, monkeypatch):
+    """An employee whose password was hashed at cost 4, while the current cost is 5"""
+    monkeypatch.setattr(Hashing, "_rounds", 4)
+    assert client.post("/api/v1/auth/", json={"Emp_email": EMAIL, "password": PASSWORD}).status_code == 201
+    monkeypatch.setattr(Hashing, "_rounds", 5)
+
+
+def _stored_rounds() -> int:
+    with session() as db:
+        return hash_rounds(db.query(EmployeeCreate).filter_by(Emp_email=EMAIL).one().hashed_pass)
+
+
+def _login(client):
+    return client.post("/api/v1/auth/token", data={"username": EMAIL, "password": PASSWORD})
+
+
+def test_login_rehashes_at_current_cost(client, stale_hash):
+    response = _login(client)
+
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert _stored_rounds() == 5
+
+
+def test_login_succeeds_when_rehash_commit_fails(client, stale_hash, monkeypatch):
+    async def failing_commit(self):
+        raise OperationalError("UPDATE new_emp", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    response = _login(client)
+
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert _stored_rounds() == 4
+
+
+def test_login_succeeds_when_rehash_is_refused(client, stale_hash, monkeypatch):
+    run = password_executor.run
+
+    async def refuse_hashing(fn, *args, **kwargs):
+        if fn is Hashing.hash_password:
+            raise ExecutorBusyError("password executor is busy", 1)
+        return await run(fn, *args, **kwargs)
+
+    monkeypatch.setattr(password_executor, "run", refuse_hashing)
+    response = _login(client)
+
+    assert response.status_code == 200
+    assert response.json()["access_token"]
+    assert _stored_rounds() == 4
@@ -0,0 +1,52 @@
+import pytest
+
+from customer360.services import token_service
+from customer360.services.token_service import TokenCache
+
+
+EMAIL = "agent@example.com"
+PASSWORD = "pw123456"
+
+
+def _login(client, email):
+    assert client.post("/api/v1/auth/", json={"Emp_email": email, "password": PASSWORD}).status_code == 201
+    response = client.post("/api/v1/auth/token", data={"username": email, "password": PASSWORD})
+    assert response.status_code == 200
+    return response.json()["access_token"]
+
+
+@pytest.fixture
+def token(client):
+    return _login(client, EMAIL)
+
+
+def _me(client, token):
+    return client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+def _fresh_worker(monkeypatch):
+    """Token cache of a worker that didn't handle the logout (or of a restarted one)"""
+    monkeypatch.setattr(token_service, "token_cache", TokenCache(100, 300))
+
+
+def test_logout_rejects_token_on_this_worker(client, token):
+    assert _me(client, token).status_code == 200
+    assert client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    assert _me(client, token).status_code == 401
+
+
+def test_logout_rejects_token_on_other_workers(client, token, monkeypatch):
+    assert client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    _fresh_worker(monkeypatch)
+
+    assert _me(client, token).status_code == 401
+    assert token_service.token_cache.stats()["rejected_revoked"] == 1
+
+
+def test_other_tokens_still_accepted_after_logout(client, token, monkeypatch):
+    assert client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    other = _login(client, "other@example.com")
+    _fresh_worker(monkeypatch)
+
+    assert _me(client, other).status_code == 200